@@ -1 +0,0 @@
-from . import crud, database, models, schemas
@@ -0,0 +1,145 @@
+"""Benchmark application and synthetic population.
+
+``create_app`` wires the routers exactly like ``_build_test_context`` in the API tests,
+against the database named by ``BENCH_DATABASE_URL``, so uvicorn can start it as a
+factory in its own process. ``seed`` fills that database with a population large
+enough to make list and dashboard queries representative.
+"""
+
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from fastapi import FastAPI
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from .. import crud, migrations, security
+from ..database import build_engine, get_db
+from ..hashing import hashing_executor
+from ..metrics import MetricsMiddleware, instrument_engine, sample_rate_from_env
+from ..models import MentorMenteeMap, Role, SessionRecord, Todo, User
+from ..routes import admin, auth, events, mentee, mentor, metrics, uploads
+
+BENCH_PASSWORD = "bench-password"
+
+
+@dataclass(frozen=True)
+class PopulationSize:
+    mentors: int = 20
+    mentees_per_mentor: int = 10
+    sessions_per_mentee: int = 20
+    todos_per_mentee: int = 10
+
+
+@dataclass
+class Population:
+    admin_id: int
+    mentors: list[tuple[int, str]] = field(default_factory=list)
+    mentees: list[tuple[int, str, int]] = field(default_factory=list)
+    todos_by_mentee: dict[int, list[int]] = field(default_factory=dict)
+
+
+def create_app() -> FastAPI:
+    engine = build_engine(os.environ["BENCH_DATABASE_URL"])
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    instrument_engine(engine)
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, sample_rate=sample_rate_from_env())
+    app.include_router(auth.router)
+    app.include_router(admin.router)
+    app.include_router(mentor.router)
+    app.include_router(mentee.router)
+    app.include_router(uploads.router)
+    app.include_router(events.router)
+    app.include_router(metrics.router)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    @app.on_event("shutdown")
+    def on_shutdown():
+        # Otherwise the hashing pool outlives uvicorn, which exits by re-raising SIGTERM.
+        hashing_executor.shutdown()
+
+    return app
+
+
+def _insert_users(db: Session, names: list[str], role: Role, password_hash: str) -> dict[str, int]:
+    rows = db.execute(
+        insert(User).returning(User.id, User.name),
+        [{"name": name, "role": role, "password": password_hash} for name in names],
+    ).all()
+    return {row.name: row.id for row in rows}
+
+
+def seed(database_url: str, size: PopulationSize, rng: random.Random | None = None) -> Population:
+    """Create the schema and a synthetic population; every user's password is ``BENCH_PASSWORD``."""
+    rng = rng or random.Random(0)
+    engine = build_engine(database_url)
+    migrations.upgrade(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        # One hash shared by every user keeps seeding fast; logins still pay a full verify.
+        password_hash = security.hash_password(BENCH_PASSWORD)
+        admin_id = _insert_users(db, ["Admin"], Role.ADMIN, password_hash)["Admin"]
+        mentor_ids = _insert_users(db, [f"Mentor {i}" for i in range(size.mentors)], Role.MENTOR, password_hash)
+        population = Population(admin_id=admin_id, mentors=sorted((id_, name) for name, id_ in mentor_ids.items()))
+
+        mentee_names = [f"Mentee {i}" for i in range(size.mentors * size.mentees_per_mentor)]
+        mentee_ids = _insert_users(db, mentee_names, Role.MENTEE, password_hash)
+        for index, name in enumerate(mentee_names):
+            mentor_id = population.mentors[index // size.mentees_per_mentor][0]
+            population.mentees.append((mentee_ids[name], name, mentor_id))
+        if population.mentees:
+            db.execute(
+                insert(MentorMenteeMap),
+                [{"mentor_id": mentor_id, "mentee_id": mentee_id} for mentee_id, _, mentor_id in population.mentees],
+            )
+
+        today = date.today()
+        sessions = [
+            {
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "date": today - timedelta(days=rng.randrange(365)),
+                "fluency_score": rng.randint(1, 10),
+                "confidence_score": rng.randint(1, 10),
+                "notes": "Worked on pacing, filler words and eye contact.",
+                "next_steps": "Record a two minute summary before the next session.",
+            }
+            for mentee_id, _, mentor_id in population.mentees
+            for _ in range(size.sessions_per_mentee)
+        ]
+        if sessions:
+            db.execute(insert(SessionRecord), sessions)
+
+        todos = [
+            {
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "title": f"Exercise {i}",
+                "description": "Practice the assigned passage aloud.",
+                "due_date": today + timedelta(days=rng.randrange(-30, 30)),
+                "completed": rng.random() < 0.5,
+            }
+            for mentee_id, _, mentor_id in population.mentees
+            for i in range(size.todos_per_mentee)
+        ]
+        if todos:
+            for row in db.execute(insert(Todo).returning(Todo.id, Todo.mentee_id), todos):
+                population.todos_by_mentee.setdefault(row.mentee_id, []).append(row.id)
+        db.commit()
+        crud.rebuild_session_analytics(db)
+        return population
+    finally:
+        db.close()
+        engine.dispose()
@@ -0,0 +1,313 @@
+"""Load-test the API with a mixed workload against a local uvicorn.
+
+Seeds a fresh SQLite database (see ``backend.bench.app``), starts uvicorn on it in a
+child process, then drives ``--concurrency`` async clients for ``--duration`` seconds.
+Each client repeatedly picks a scenario according to the workload weights. Latency
+percentiles and throughput are reported per endpoint as JSON so runs can be diffed.
+
+    python -m backend.bench.load --workload mixed --duration 30 --concurrency 32
+    python -m backend.bench.load --workload login-storm --output login.json
+    python -m backend.bench.load --mix dashboard=5,todo_toggle=1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+from .. import security
+from ..models import Role
+from ..principals import Principal
+from .app import BENCH_PASSWORD, Population, PopulationSize, seed
+
+WORKLOADS: dict[str, dict[str, int]] = {
+    "mixed": {
+        "login": 1,
+        "mentor_dashboard": 4,
+        "mentee_todos": 4,
+        "todo_toggle": 2,
+        "session_write": 1,
+        "admin_sessions": 1,
+    },
+    "login-storm": {"login": 1},
+    "read-heavy": {"mentor_dashboard": 3, "mentee_todos": 3, "admin_sessions": 2, "mentor_mentees": 2},
+    "write-heavy": {"todo_toggle": 3, "session_write": 2, "mentee_todos": 1},
+}
+
+
+@dataclass(frozen=True)
+class Sample:
+    endpoint: str
+    seconds: float
+    ok: bool
+
+
+class VirtualUsers:
+    """Scenario implementations; each returns ``(endpoint label, response)``."""
+
+    def __init__(self, client: httpx.AsyncClient, population: Population, rng: random.Random) -> None:
+        self.client = client
+        self.population = population
+        self.rng = rng
+        self._tokens: dict[int, dict[str, str]] = {}
+        self.admin_headers = self._headers(population.admin_id, Role.ADMIN)
+
+    def _headers(self, user_id: int, role: Role) -> dict[str, str]:
+        # Tokens are minted locally so only the login scenario pays for password hashing.
+        if user_id not in self._tokens:
+            token = security.create_access_token(Principal(id=user_id, name="", role=role))
+            self._tokens[user_id] = {"Authorization": f"Bearer {token}"}
+        return self._tokens[user_id]
+
+    def _mentor(self) -> tuple[int, str]:
+        return self.rng.choice(self.population.mentors)
+
+    def _mentee(self) -> tuple[int, str, int]:
+        return self.rng.choice(self.population.mentees)
+
+    async def login(self):
+        _, name, _ = self._mentee()
+        payload = {"name": name, "role": Role.MENTEE.value, "password": BENCH_PASSWORD}
+        return "POST /auth/login", await self.client.post("/auth/login", json=payload)
+
+    async def mentor_dashboard(self):
+        mentor_id, _ = self._mentor()
+        response = await self.client.get(f"/mentor/{mentor_id}/dashboard", headers=self._headers(mentor_id, Role.MENTOR))
+        return "GET /mentor/{mentor_id}/dashboard", response
+
+    async def mentor_mentees(self):
+        mentor_id, _ = self._mentor()
+        response = await self.client.get(f"/mentor/{mentor_id}/mentees", headers=self._headers(mentor_id, Role.MENTOR))
+        return "GET /mentor/{mentor_id}/mentees", response
+
+    async def mentee_todos(self):
+        mentee_id, _, _ = self._mentee()
+        response = await self.client.get(
+            f"/mentee/{mentee_id}/todos", params={"limit": 50}, headers=self._headers(mentee_id, Role.MENTEE)
+        )
+        return "GET /mentee/{mentee_id}/todos", response
+
+    async def todo_toggle(self):
+        mentee_id, _, _ = self._mentee()
+        todo_id = self.rng.choice(self.population.todos_by_mentee[mentee_id])
+        response = await self.client.patch(f"/mentee/todos/{todo_id}/toggle", headers=self._headers(mentee_id, Role.MENTEE))
+        return "PATCH /mentee/todos/{todo_id}/toggle", response
+
+    async def session_write(self):
+        mentee_id, _, mentor_id = self._mentee()
+        payload = {
+            "mentee_id": mentee_id,
+            "date": date.today().isoformat(),
+            "fluency_score": self.rng.randint(1, 10),
+            "confidence_score": self.rng.randint(1, 10),
+            "notes": "Benchmark session",
+            "next_steps": "Keep practising",
+        }
+        response = await self.client.post("/mentor/sessions", json=payload, headers=self._headers(mentor_id, Role.MENTOR))
+        return "POST /mentor/sessions", response
+
+    async def admin_sessions(self):
+        response = await self.client.get("/admin/sessions", params={"limit": 50}, headers=self.admin_headers)
+        return "GET /admin/sessions", response
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    def stats(group: list[Sample]) -> dict:
+        latencies = sorted(sample.seconds * 1000 for sample in group)
+        return {
+            "requests": len(group),
+            "errors": sum(not sample.ok for sample in group),
+            "rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    by_endpoint: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample)
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": stats(samples),
+        "endpoints": {endpoint: stats(group) for endpoint, group in sorted(by_endpoint.items())},
+    }
+
+
+async def drive(
+    base_url: str,
+    population: Population,
+    mix: dict[str, int],
+    duration: float,
+    concurrency: int,
+    warmup: float = 0.0,
+    seed_value: int = 0,
+) -> dict:
+    samples: list[Sample] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        names = list(mix)
+        weights = [mix[name] for name in names]
+
+        async def worker(index: int, until: float, record: bool) -> None:
+            users = VirtualUsers(client, population, random.Random(seed_value * 1_000_003 + index))
+            scenarios: list[Callable[[], Awaitable]] = [getattr(users, name) for name in names]
+            while time.perf_counter() < until:
+                scenario = users.rng.choices(scenarios, weights)[0]
+                started = time.perf_counter()
+                try:
+                    endpoint, response = await scenario()
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    endpoint, ok = scenario.__name__, False
+                if record:
+                    samples.append(Sample(endpoint, time.perf_counter() - started, ok))
+
+        if warmup > 0:
+            until = time.perf_counter() + warmup
+            await asyncio.gather(*(worker(i, until, False) for i in range(concurrency)))
+        started = time.perf_counter()
+        until = started + duration
+        await asyncio.gather(*(worker(i, until, True) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, upload_dir: Path, port: int, workers: int = 1) -> subprocess.Popen:
+    env = dict(os.environ, BENCH_DATABASE_URL=database_url, UPLOAD_DIR=str(upload_dir))
+    command = [
+        sys.executable, "-m", "uvicorn", "backend.bench.app:create_app", "--factory",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--workers", str(workers),
+    ]  # fmt: skip
+    return subprocess.Popen(command, env=env, cwd=Path(__file__).resolve().parents[2])
+
+
+def wait_until_ready(process: subprocess.Popen, base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/openapi.json", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if not hasattr(VirtualUsers, name) or name.startswith("_"):
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def run(
+    size: PopulationSize,
+    mix: dict[str, int],
+    duration: float,
+    concurrency: int,
+    warmup: float = 0.0,
+    workers: int = 1,
+    seed_value: int = 0,
+) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        population = seed(database_url, size, random.Random(seed_value))
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        process = start_server(database_url, Path(tmp) / "uploads", port, workers)
+        try:
+            wait_until_ready(process, base_url)
+            report = asyncio.run(drive(base_url, population, mix, duration, concurrency, warmup, seed_value))
+        finally:
+            stop_server(process)
+    report["config"] = {
+        "population": asdict(size),
+        "mix": mix,
+        "duration_seconds": duration,
+        "warmup_seconds": warmup,
+        "concurrency": concurrency,
+        "workers": workers,
+        "seed": seed_value,
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the API with a mixed workload.")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--mix", type=parse_mix, help="Scenario weights, e.g. login=1,mentor_dashboard=4")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--mentors", type=int, default=PopulationSize.mentors)
+    parser.add_argument("--mentees-per-mentor", type=int, default=PopulationSize.mentees_per_mentor)
+    parser.add_argument("--sessions-per-mentee", type=int, default=PopulationSize.sessions_per_mentee)
+    parser.add_argument("--todos-per-mentee", type=int, default=PopulationSize.todos_per_mentee)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    size = PopulationSize(args.mentors, args.mentees_per_mentor, args.sessions_per_mentee, args.todos_per_mentee)
+    report = run(
+        size,
+        args.mix or WORKLOADS[args.workload],
+        args.duration,
+        args.concurrency,
+        args.warmup,
+        args.workers,
+        args.seed,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
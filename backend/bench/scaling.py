@@ -0,0 +1,155 @@
+"""Measure how throughput scales with the number of ``backend.serve`` workers.
+
+Seeds one synthetic population (see ``backend.bench.app``), then for each worker
+count starts ``python -m backend.serve --workers N`` on it and drives the same
+workload from ``--clients`` load-generator processes, so the client is not the
+bottleneck. Reports total RPS per worker count and the scaling efficiency
+``rps(N) / (N * rps(1))`` as JSON.
+
+    python -m backend.bench.scaling --workers 1,2,4,8 --duration 20
+    python -m backend.bench.scaling --workload mixed --clients 8
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+from .app import Population, PopulationSize, seed
+from .load import WORKLOADS, _free_port, drive, parse_mix, stop_server, wait_until_ready
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def start_serve(database_url: str, upload_dir: Path, port: int, workers: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        UPLOAD_DIR=str(upload_dir),
+        # The bench population has no default users; nothing else needs initializing.
+        APP_INIT="skip",
+        SLOW_QUERY_LOG_PATH="",
+    )
+    command = [
+        sys.executable, "-m", "backend.serve",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]  # fmt: skip
+    return subprocess.Popen(command, env=env, cwd=ROOT)
+
+
+def _client(args: tuple) -> dict:
+    base_url, population, mix, duration, concurrency, warmup, seed_value = args
+    return asyncio.run(drive(base_url, population, mix, duration, concurrency, warmup, seed_value))
+
+
+def measure(
+    base_url: str,
+    population: Population,
+    mix: dict[str, int],
+    duration: float,
+    concurrency: int,
+    clients: int,
+    warmup: float,
+) -> dict:
+    per_client = max(1, concurrency // clients)
+    jobs = [(base_url, population, mix, duration, per_client, warmup, index) for index in range(clients)]
+    with multiprocessing.get_context("spawn").Pool(clients) as pool:
+        reports = pool.map(_client, jobs)
+    totals = [report["total"] for report in reports]
+    return {
+        "rps": round(sum(total["rps"] for total in totals), 2),
+        "requests": sum(total["requests"] for total in totals),
+        "errors": sum(total["errors"] for total in totals),
+        # Percentiles cannot be merged across clients; report the worst client's.
+        "p50_ms": max(total["p50_ms"] for total in totals),
+        "p99_ms": max(total["p99_ms"] for total in totals),
+    }
+
+
+def run(
+    size: PopulationSize,
+    mix: dict[str, int],
+    worker_counts: list[int],
+    duration: float,
+    concurrency: int,
+    clients: int,
+    warmup: float = 1.0,
+    seed_value: int = 0,
+) -> dict:
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        population = seed(database_url, size, random.Random(seed_value))
+        for workers in worker_counts:
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            process = start_serve(database_url, Path(tmp) / "uploads", port, workers)
+            try:
+                wait_until_ready(process, base_url)
+                results[str(workers)] = measure(base_url, population, mix, duration, concurrency, clients, warmup)
+            finally:
+                stop_server(process)
+
+    baseline = results[str(worker_counts[0])]["rps"] / worker_counts[0] if worker_counts else 0.0
+    for workers, result in results.items():
+        result["efficiency"] = round(result["rps"] / (int(workers) * baseline), 3) if baseline else 0.0
+    return {
+        "workers": results,
+        "config": {
+            "population": asdict(size),
+            "mix": mix,
+            "duration_seconds": duration,
+            "warmup_seconds": warmup,
+            "concurrency": concurrency,
+            "clients": clients,
+            "cpu_count": os.cpu_count(),
+            "seed": seed_value,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure RPS as the number of API workers grows.")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts, e.g. 1,2,4,8")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="read-heavy")
+    parser.add_argument("--mix", type=parse_mix, help="Scenario weights, e.g. mentor_dashboard=1,mentee_todos=1")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=64, help="connections across all clients")
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1, help="load-generator processes")
+    parser.add_argument("--mentors", type=int, default=PopulationSize.mentors)
+    parser.add_argument("--mentees-per-mentor", type=int, default=PopulationSize.mentees_per_mentor)
+    parser.add_argument("--sessions-per-mentee", type=int, default=PopulationSize.sessions_per_mentee)
+    parser.add_argument("--todos-per-mentee", type=int, default=PopulationSize.todos_per_mentee)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    size = PopulationSize(args.mentors, args.mentees_per_mentor, args.sessions_per_mentee, args.todos_per_mentee)
+    worker_counts = [int(value) for value in args.workers.split(",")]
+    report = run(
+        size,
+        args.mix or WORKLOADS[args.workload],
+        worker_counts,
+        args.duration,
+        args.concurrency,
+        args.clients,
+        args.warmup,
+        args.seed,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Micro-benchmark: per-row cost of serializing a session listing.
+
+Seeds a throwaway SQLite database with ``--rows`` session records, loads them once
+through ``crud.list_session_records`` and then times turning those rows into a JSON
+body two ways:
+
+* ``pydantic``: build a ``SessionRecordResponse`` per row and let a list
+  ``response_model`` validate and dump them again (the old route code path).
+* ``orjson``: project the rows onto the schema fields and hand them to orjson.
+
+Run with ``python -m backend.bench.serialization [--rows 10000] [--repeat 5]``.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from .. import crud, migrations
+from ..database import build_engine
+from ..models import Role, SessionRecord, User
+from ..responses import dump_rows
+from ..schemas import SessionRecordResponse
+
+
+def _seed(db, rows: int) -> None:
+    mentor = User(name="Bench Mentor", role=Role.MENTOR, password="x")
+    mentee = User(name="Bench Mentee", role=Role.MENTEE, password="x")
+    db.add_all([mentor, mentee])
+    db.flush()
+    start = date(2020, 1, 1)
+    db.execute(
+        insert(SessionRecord),
+        [
+            {
+                "mentor_id": mentor.id,
+                "mentee_id": mentee.id,
+                "date": start + timedelta(days=i % 2000),
+                "fluency_score": i % 10 + 1,
+                "confidence_score": (i * 7) % 10 + 1,
+                "notes": f"Session {i}: worked on pronunciation and pacing.",
+                "next_steps": "Record a two minute summary before next session.",
+            }
+            for i in range(rows)
+        ],
+    )
+    db.commit()
+
+
+def _pydantic_body(rows) -> bytes:
+    adapter = _pydantic_body.adapter
+    models = [
+        SessionRecordResponse(
+            id=row.id,
+            mentor_name=row.mentor_name,
+            mentee_name=row.mentee_name,
+            date=row.date,
+            fluency_score=row.fluency_score,
+            confidence_score=row.confidence_score,
+            notes=row.notes,
+            next_steps=row.next_steps,
+        )
+        for row in rows
+    ]
+    return adapter.dump_json(adapter.validate_python(models))
+
+
+_pydantic_body.adapter = TypeAdapter(list[SessionRecordResponse])
+
+
+def _orjson_body(rows) -> bytes:
+    return dump_rows(rows, SessionRecordResponse)
+
+
+def _best_of(fn, rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(rows: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        migrations.upgrade(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            _seed(db, rows)
+            items = crud.list_session_records(db, limit=rows, cursor=None).items
+        finally:
+            db.close()
+            engine.dispose()
+
+    assert json.loads(_pydantic_body(items)) == json.loads(_orjson_body(items))
+    results = {"rows": len(items)}
+    for name, fn in (("pydantic", _pydantic_body), ("orjson", _orjson_body)):
+        seconds = _best_of(fn, items, repeat)
+        results[name] = {"total_ms": round(seconds * 1000, 2), "per_row_us": round(seconds / len(items) * 1e6, 3)}
+    results["speedup"] = round(results["pydantic"]["total_ms"] / results["orjson"]["total_ms"], 2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
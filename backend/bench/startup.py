@@ -0,0 +1,172 @@
+"""Measure how long a fresh API process takes to import, boot and serve its first requests.
+
+Every run starts ``uvicorn backend.main:app`` in a new process and reports:
+
+* ``import_ms``: importing ``backend.main`` in a bare interpreter (median of runs),
+* ``ready_ms``: from spawning uvicorn until it answers ``/metrics``,
+* ``first_login_ms`` / ``first_request_ms`` / ``second_request_ms``: the first login,
+  then the first and second authenticated listing, which pay for lazy imports and
+  pool start-up.
+
+Scenarios: ``cold`` boots on an empty database with ``APP_INIT=auto`` (migrations and
+seeding on startup), ``warm-auto`` boots on an initialized database with
+``APP_INIT=auto`` and ``warm-skip`` with ``APP_INIT=skip``.
+
+    python -m backend.bench.startup --repeat 5
+    python -m backend.bench.startup --scenario warm-skip --import-profile 15
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from .load import _free_port, stop_server
+
+ROOT = Path(__file__).resolve().parents[2]
+SCENARIOS = {
+    "cold": {"initialized": False, "app_init": "auto"},
+    "warm-auto": {"initialized": True, "app_init": "auto"},
+    "warm-skip": {"initialized": True, "app_init": "skip"},
+}
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$")
+
+
+def _environment(database_url: str, upload_dir: Path, app_init: str) -> dict[str, str]:
+    return dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        UPLOAD_DIR=str(upload_dir),
+        APP_INIT=app_init,
+        SLOW_QUERY_LOG_PATH="",
+    )
+
+
+def _initialize(env: dict[str, str]) -> None:
+    subprocess.run([sys.executable, "-m", "backend.manage", "init"], env=env, cwd=ROOT, check=True, capture_output=True)
+
+
+def measure_import(env: dict[str, str]) -> float:
+    code = "import time; started = time.perf_counter(); import backend.main; print(time.perf_counter() - started)"
+    result = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT, check=True, capture_output=True, text=True)
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def import_profile(env: dict[str, str], limit: int) -> list[dict]:
+    """The slowest top-level packages and ``backend`` modules by cumulative import time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        env=env, cwd=ROOT, check=True, capture_output=True, text=True,
+    )  # fmt: skip
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, module = match.groups()
+        if "." not in module or module.startswith("backend."):
+            rows.append({"module": module, "cumulative_ms": int(cumulative) / 1000, "depth": (len(indent) - 1) // 2})
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:limit]
+
+
+def _timed(method: str, url: str, **kwargs) -> tuple[httpx.Response, float]:
+    started = time.perf_counter()
+    response = httpx.request(method, url, timeout=30, **kwargs)
+    response.raise_for_status()
+    return response, (time.perf_counter() - started) * 1000
+
+
+def measure_boot(env: dict[str, str], timeout: float = 60.0) -> dict[str, float]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "uvicorn", "backend.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ]  # fmt: skip
+    started = time.perf_counter()
+    process = subprocess.Popen(command, env=env, cwd=ROOT)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not become ready in time")
+            try:
+                # Any answer (401 without a scrape token) means the server is up.
+                httpx.get(f"{base_url}/metrics", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.01)
+        ready_ms = (time.perf_counter() - started) * 1000
+
+        credentials = {"name": "Admin", "role": "admin", "password": "admin123"}
+        login, first_login_ms = _timed("POST", f"{base_url}/auth/login", json=credentials)
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        _, first_request_ms = _timed("GET", f"{base_url}/admin/mentors", headers=headers)
+        _, second_request_ms = _timed("GET", f"{base_url}/admin/mentors", headers=headers)
+    finally:
+        stop_server(process)
+    return {
+        "ready_ms": ready_ms,
+        "first_login_ms": first_login_ms,
+        "first_request_ms": first_request_ms,
+        "second_request_ms": second_request_ms,
+    }
+
+
+def run_scenario(name: str, repeat: int) -> dict:
+    scenario = SCENARIOS[name]
+    samples: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for index in range(repeat):
+            database_url = f"sqlite:///{Path(tmp) / f'startup-{index}.db'}"
+            env = _environment(database_url, Path(tmp) / "uploads", scenario["app_init"])
+            if scenario["initialized"]:
+                _initialize(env)
+            measurements = {"import_ms": measure_import(env), **measure_boot(env)}
+            for key, value in measurements.items():
+                samples.setdefault(key, []).append(value)
+    return {
+        key: {"median": round(statistics.median(values), 1), "max": round(max(values), 1)}
+        for key, values in samples.items()
+    }
+
+
+def run(scenarios: list[str], repeat: int, profile_limit: int = 0) -> dict:
+    report: dict = {"scenarios": {name: run_scenario(name, repeat) for name in scenarios}}
+    if profile_limit:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = _environment(f"sqlite:///{Path(tmp) / 'profile.db'}", Path(tmp) / "uploads", "skip")
+            report["import_profile"] = import_profile(env, profile_limit)
+    report["config"] = {"repeat": repeat, "python": sys.version.split()[0]}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure API import, boot and first-request latency.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="default: all")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--import-profile", type=int, default=0, metavar="N", help="include the N slowest imports")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args.scenario or list(SCENARIOS), args.repeat, args.import_profile)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
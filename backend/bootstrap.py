@@ -0,0 +1,93 @@
+"""One-time database initialisation: schema migrations and the default accounts.
+
+``python -m backend.manage init`` runs it explicitly. With ``APP_INIT=auto`` (the
+default) every app process also calls ``initialize`` on startup: two cheap queries
+skip it when there is nothing to do, and otherwise a file lock lets exactly one
+process migrate and seed while the others wait and then find the work done.
+``APP_INIT=skip`` leaves startup to assume ``init`` has already been run.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from . import crud, migrations
+from .models import Role, User
+
+DEFAULT_USERS: list[tuple[str, Role, str]] = [
+    ("Admin", Role.ADMIN, "admin123"),
+    ("Mentor", Role.MENTOR, "mentor123"),
+    ("Mentee", Role.MENTEE, "mentee123"),
+]
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive, cross-process lock on ``path`` (created if missing)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after ~10 s of retrying; keep waiting.
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def init_lock_path(bind: Engine) -> Path:
+    configured = os.getenv("INIT_LOCK_PATH")
+    if configured:
+        return Path(configured)
+    database = bind.url.database
+    if bind.dialect.name == "sqlite" and database and database != ":memory:":
+        return Path(f"{database}.init.lock")
+    return Path(tempfile.gettempdir()) / "mentor-connect-init.lock"
+
+
+def _default_users_missing(db: Session) -> bool:
+    pairs = {(name, role) for name, role, _ in DEFAULT_USERS}
+    found = db.query(User.name, User.role).filter(tuple_(User.name, User.role).in_(pairs)).all()
+    return len(found) < len(pairs)
+
+
+def needs_initialization(bind: Engine) -> bool:
+    if migrations.pending_migrations(bind):
+        return True
+    with Session(bind=bind) as db:
+        return _default_users_missing(db)
+
+
+def initialize(bind: Engine) -> bool:
+    """Migrate and seed the database unless that is already done; True if this call did work."""
+    if not needs_initialization(bind):
+        return False
+    with file_lock(init_lock_path(bind)):
+        # Whoever held the lock before us has probably done everything already.
+        applied = migrations.upgrade(bind)
+        with Session(bind=bind) as db:
+            seeded = [user_id for user_id in crud.create_users_batch(db, DEFAULT_USERS) if user_id is not None]
+    return bool(applied or seeded)
@@ -1,31 +1,84 @@
-from datetime import date
+import os
+import re
+from datetime import date, timedelta
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-
-from .models import MentorMenteeMap, Resource, Role, SessionRecord, Todo, User
-from .security import hash_password, is_hashed_password, verify_password
-
-
-def authenticate_user(db: Session, name: str, role: Role, password: str) -> User | None:
-    user = (
+from sqlalchemy import Float, Integer, Row, case, column, func, insert, literal_column, table, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session, aliased
+from starlette.concurrency import run_in_threadpool
+
+from .events import event_hub
+from .hashing import hashing_executor
+from .http_cache import collection_versions
+from .jobs import enqueue, job_handler
+from .models import MentorMenteeMap, Resource, Role, SessionRecord, SessionScoreBucket, Todo, User
+from .pagination import Page, paginate
+from .principals import principal_cache
+from .security import is_hashed_password
+
+UPSERT_DIALECTS = {"sqlite": sqlite, "postgresql": postgresql}
+INDEX_RESOURCE_JOB = "index_resource"
+REBUILD_ANALYTICS_JOB = "rebuild_session_analytics"
+
+SESSION_SEARCH_WINDOW = int(os.getenv("SESSION_SEARCH_WINDOW", "10000"))
+_SEARCH_TERM = re.compile(r"\w+\*?")
+_session_search_index = table(
+    "session_records_fts",
+    column("rowid", Integer),
+    column("rank", Float),
+    column("session_records_fts"),
+)
+_resource_search_index = table(
+    "resources_fts",
+    column("rowid", Integer),
+    column("rank", Float),
+    column("body"),
+    column("resources_fts"),
+)
+
+
+def _fts_match_expression(text: str) -> str:
+    # Quoting every term keeps user input out of the FTS5 query syntax; a trailing
+    # "*" is kept as a prefix search. Terms are implicitly ANDed.
+    terms = [
+        f'"{term[:-1]}"*' if term.endswith("*") else f'"{term}"'
+        for term in _SEARCH_TERM.findall(text)
+    ]
+    if not terms:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search query has no searchable terms")
+    return " ".join(terms)
+
+
+def _find_login_user(db: Session, name: str, role: Role) -> User | None:
+    return (
         db.query(User)
         .filter(User.name == name, User.role == role)
         .first()
     )
+
+
+def _store_password_hash(db: Session, user: User, password_hash: str) -> None:
+    user.password = password_hash
+    db.commit()
+    db.refresh(user)
+    principal_cache.invalidate(user.id)
+
+
+async def authenticate_user(db: Session, name: str, role: Role, password: str) -> User | None:
+    user = await run_in_threadpool(_find_login_user, db, name, role)
     if not user:
         return None
 
     stored_password = user.password
     if is_hashed_password(stored_password):
-        if verify_password(password, stored_password):
+        if await hashing_executor.verify_password(password, stored_password):
             return user
         return None
 
     if stored_password == password:
-        user.password = hash_password(password)
-        db.commit()
-        db.refresh(user)
+        password_hash = await hashing_executor.hash_password(password)
+        await run_in_threadpool(_store_password_hash, db, user, password_hash)
         return user
 
     return None
@@ -35,8 +88,14 @@ def get_user_by_id(db: Session, user_id: int) -> User | None:
     return db.query(User).filter(User.id == user_id).first()
 
 
-def get_users_by_role(db: Session, role: Role) -> list[User]:
-    return db.query(User).filter(User.role == role).order_by(User.name.asc()).all()
+def get_users_by_role(
+    db: Session,
+    role: Role,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Page:
+    query = db.query(User).filter(User.role == role)
+    return paginate(query, [(User.name, False), (User.id, False)], limit, cursor)
 
 
 def create_user(db: Session, name: str, role: Role, password: str) -> User:
@@ -59,13 +118,90 @@ def create_user(db: Session, name: str, role: Role, password: str) -> User:
             detail=f"{role.value} with this name already exists",
         )
 
-    user = User(name=clean_name, role=role, password=hash_password(clean_password))
+    user = User(name=clean_name, role=role, password=hashing_executor.hash_password_blocking(clean_password))
     db.add(user)
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.id)
+    collection_versions.bump(f"users:{role.value}")
     return user
 
 
+def create_users_batch(db: Session, users: list[tuple[str, Role, str]]) -> list[int | None]:
+    """Insert ``(name, role, password)`` triples in one transaction.
+
+    Returns the new user id for each input, or ``None`` where a user with the same
+    name and role already exists (in the database or earlier in the batch).
+    """
+    pairs = {(name, role) for name, role, _ in users}
+    existing = set()
+    if pairs:
+        existing = set(db.query(User.name, User.role).filter(tuple_(User.name, User.role).in_(pairs)).all())
+
+    new_users: list[tuple[int, str, Role, str]] = []
+    for position, (name, role, password) in enumerate(users):
+        if (name, role) in existing:
+            continue
+        existing.add((name, role))
+        new_users.append((position, name, role, password))
+
+    ids: list[int | None] = [None] * len(users)
+    if not new_users:
+        return ids
+
+    hashes = hashing_executor.hash_passwords_blocking([password for *_, password in new_users])
+    # RETURNING order is not guaranteed for batched inserts; match rows on the
+    # (name, role) pair, which is unique within this batch.
+    rows = db.execute(
+        insert(User).returning(User.id, User.name, User.role),
+        [
+            {"name": name, "role": role, "password": password_hash}
+            for (_, name, role, _), password_hash in zip(new_users, hashes)
+        ],
+    ).all()
+    db.commit()
+    collection_versions.bump(*{f"users:{row.role.value}" for row in rows})
+    created = {(row.name, row.role): row.id for row in rows}
+    for position, name, role, _ in new_users:
+        ids[position] = created[(name, role)]
+    return ids
+
+
+def _upsert_insert(db: Session, model):
+    dialect = db.get_bind().dialect.name
+    if dialect not in UPSERT_DIALECTS:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"This operation requires SQLite or PostgreSQL, not {dialect}",
+        )
+    return UPSERT_DIALECTS[dialect].insert(model)
+
+
+def _mapping_upsert(db: Session, pairs: list[dict[str, int]]):
+    statement = _upsert_insert(db, MentorMenteeMap).values(pairs)
+    return statement.on_conflict_do_update(
+        index_elements=[MentorMenteeMap.mentee_id],
+        set_={"mentor_id": statement.excluded.mentor_id},
+        where=MentorMenteeMap.mentor_id != statement.excluded.mentor_id,
+    )
+
+
+def _check_mapping_roles(db: Session, mentor_ids: set[int], mentee_ids: set[int]) -> None:
+    roles = dict(db.query(User.id, User.role).filter(User.id.in_(mentor_ids | mentee_ids)).all())
+    missing_mentors = sorted(user_id for user_id in mentor_ids if roles.get(user_id) != Role.MENTOR)
+    missing_mentees = sorted(user_id for user_id in mentee_ids if roles.get(user_id) != Role.MENTEE)
+    if missing_mentors:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Mentor not found: {', '.join(map(str, missing_mentors))}",
+        )
+    if missing_mentees:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Mentee not found: {', '.join(map(str, missing_mentees))}",
+        )
+
+
 def map_mentor_to_mentee(db: Session, mentor_id: int, mentee_id: int) -> MentorMenteeMap:
     mentor = get_user_by_id(db, mentor_id)
     mentee = get_user_by_id(db, mentee_id)
@@ -75,22 +211,85 @@ def map_mentor_to_mentee(db: Session, mentor_id: int, mentee_id: int) -> MentorM
     if not mentee or mentee.role != Role.MENTEE:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentee not found")
 
-    existing = db.query(MentorMenteeMap).filter(MentorMenteeMap.mentee_id == mentee_id).first()
-    if existing:
-        existing.mentor_id = mentor_id
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    mapping = MentorMenteeMap(mentor_id=mentor_id, mentee_id=mentee_id)
-    db.add(mapping)
+    previous_mentor_id = db.query(MentorMenteeMap.mentor_id).filter(MentorMenteeMap.mentee_id == mentee_id).scalar()
+    # Upsert so two concurrent requests for the same mentee cannot both try to insert.
+    db.execute(_mapping_upsert(db, [{"mentor_id": mentor_id, "mentee_id": mentee_id}]))
     db.commit()
-    db.refresh(mapping)
-    return mapping
+    collection_versions.bump("mappings")
+    if previous_mentor_id != mentor_id:
+        _publish_mapping(mentor_id, mentee_id, previous_mentor_id)
+    return db.query(MentorMenteeMap).filter(MentorMenteeMap.mentee_id == mentee_id).one()
+
+
+def _publish_mapping(mentor_id: int, mentee_id: int, previous_mentor_id: int | None) -> None:
+    event_hub.publish(
+        {mentor_id, mentee_id} | ({previous_mentor_id} if previous_mentor_id else set()),
+        ("mapping", mentee_id),
+        {
+            "type": "mapping.updated",
+            "mentor_id": mentor_id,
+            "mentee_id": mentee_id,
+            "previous_mentor_id": previous_mentor_id,
+        },
+    )
+
+
+MAPPING_UPSERT_CHUNK = 5000
 
 
-def list_mappings(db: Session) -> list[MentorMenteeMap]:
-    return db.query(MentorMenteeMap).all()
+def map_mentors_to_mentees(db: Session, pairs: list[tuple[int, int]]) -> dict[str, int]:
+    """Apply ``(mentor_id, mentee_id)`` assignments in one transaction.
+
+    A mentee listed more than once takes its last mentor. Returns how many mappings
+    were created, moved to a different mentor, or already in place.
+    """
+    assignments = {mentee_id: mentor_id for mentor_id, mentee_id in pairs}
+    if not assignments:
+        return {"created": 0, "moved": 0, "unchanged": 0}
+    _check_mapping_roles(db, set(assignments.values()), set(assignments))
+
+    current = dict(
+        db.query(MentorMenteeMap.mentee_id, MentorMenteeMap.mentor_id)
+        .filter(MentorMenteeMap.mentee_id.in_(assignments))
+        .all()
+    )
+    counts = {"created": 0, "moved": 0, "unchanged": 0}
+    changed = []
+    for mentee_id, mentor_id in assignments.items():
+        if mentee_id not in current:
+            counts["created"] += 1
+        elif current[mentee_id] != mentor_id:
+            counts["moved"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        changed.append((mentor_id, mentee_id, current.get(mentee_id)))
+
+    values = [{"mentor_id": mentor_id, "mentee_id": mentee_id} for mentee_id, mentor_id in assignments.items()]
+    for start in range(0, len(values), MAPPING_UPSERT_CHUNK):
+        db.execute(_mapping_upsert(db, values[start : start + MAPPING_UPSERT_CHUNK]))
+    db.commit()
+    collection_versions.bump("mappings")
+    for mentor_id, mentee_id, previous_mentor_id in changed:
+        _publish_mapping(mentor_id, mentee_id, previous_mentor_id)
+    return counts
+
+
+def list_mappings(db: Session, limit: int | None = None, cursor: str | None = None) -> Page:
+    mentor = aliased(User)
+    mentee = aliased(User)
+    query = (
+        db.query(
+            MentorMenteeMap.id,
+            MentorMenteeMap.mentor_id,
+            func.coalesce(mentor.name, "Unknown").label("mentor_name"),
+            MentorMenteeMap.mentee_id,
+            func.coalesce(mentee.name, "Unknown").label("mentee_name"),
+        )
+        .outerjoin(mentor, mentor.id == MentorMenteeMap.mentor_id)
+        .outerjoin(mentee, mentee.id == MentorMenteeMap.mentee_id)
+    )
+    return paginate(query, [(MentorMenteeMap.id, False)], limit, cursor)
 
 
 def create_resource(db: Session, title: str, url: str) -> Resource:
@@ -103,13 +302,72 @@ def create_resource(db: Session, title: str, url: str) -> Resource:
 
     resource = Resource(title=clean_title, url=url.strip())
     db.add(resource)
+    db.flush()
+    enqueue(db, INDEX_RESOURCE_JOB, {"resource_id": resource.id})
     db.commit()
     db.refresh(resource)
+    collection_versions.bump("resources")
     return resource
 
 
-def list_resources(db: Session) -> list[Resource]:
-    return db.query(Resource).order_by(Resource.uploaded_at.desc(), Resource.id.desc()).all()
+def list_resources(db: Session, limit: int | None = None, cursor: str | None = None) -> Page:
+    return paginate(
+        db.query(Resource),
+        [(Resource.uploaded_at, True), (Resource.id, True)],
+        limit,
+        cursor,
+    )
+
+
+def search_resources(db: Session, text: str, limit: int | None = None, cursor: str | None = None) -> Page:
+    """Rank resources whose title or extracted text matches ``text``, best match first."""
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Resource search requires SQLite")
+    index = _resource_search_index
+    query = (
+        db.query(
+            Resource.id,
+            Resource.title,
+            Resource.url,
+            Resource.uploaded_at,
+            Resource.page_count,
+            Resource.text_status,
+            index.c.rank,
+        )
+        .join(index, index.c.rowid == Resource.id)
+        .filter(index.c.resources_fts.match(_fts_match_expression(text)))
+    )
+    return paginate(query, [(index.c.rank, False), (Resource.id, False)], limit, cursor)
+
+
+def resources_to_index(db: Session, include_indexed: bool = False) -> list[Row]:
+    query = db.query(Resource.id, Resource.url)
+    if not include_indexed:
+        query = query.filter(Resource.text_status != "indexed")
+    return query.order_by(Resource.id).all()
+
+
+def enqueue_resource_indexing(db: Session, include_indexed: bool = False) -> int:
+    resources = resources_to_index(db, include_indexed)
+    for resource in resources:
+        enqueue(db, INDEX_RESOURCE_JOB, {"resource_id": resource.id})
+    db.commit()
+    return len(resources)
+
+
+def store_resource_text(db: Session, resource_id: int, text: str | None, page_count: int | None) -> None:
+    """Record an extraction result; ``text=None`` marks the resource as failed."""
+    resource = db.get(Resource, resource_id)
+    if resource is None:
+        return
+    if text is not None and db.get_bind().dialect.name == "sqlite":
+        db.execute(
+            update(_resource_search_index).where(_resource_search_index.c.rowid == resource_id).values(body=text)
+        )
+    resource.page_count = page_count
+    resource.text_status = "failed" if text is None else "indexed"
+    db.commit()
+    collection_versions.bump("resources")
 
 
 def set_mentor_meet_link(db: Session, mentor_id: int, meet_link: str) -> User:
@@ -120,6 +378,7 @@ def set_mentor_meet_link(db: Session, mentor_id: int, meet_link: str) -> User:
     mentor.meet_link = meet_link.strip()
     db.commit()
     db.refresh(mentor)
+    principal_cache.invalidate(mentor.id)
     return mentor
 
 
@@ -130,20 +389,83 @@ def get_mentor_meet_link(db: Session, mentor_id: int) -> str:
     return mentor.meet_link or ""
 
 
-def get_assigned_mentees(db: Session, mentor_id: int) -> list[User]:
+def get_assigned_mentees(
+    db: Session,
+    mentor_id: int,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Page:
     mentor = get_user_by_id(db, mentor_id)
     if not mentor or mentor.role != Role.MENTOR:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentor not found")
 
-    mappings = (
-        db.query(MentorMenteeMap)
+    query = (
+        db.query(User)
+        .join(MentorMenteeMap, MentorMenteeMap.mentee_id == User.id)
         .filter(MentorMenteeMap.mentor_id == mentor_id)
+    )
+    return paginate(query, [(User.name, False), (User.id, False)], limit, cursor)
+
+
+def get_mentor_dashboard(db: Session, mentor_id: int, today: date) -> tuple[User, list[Row]]:
+    """Mentor plus one row per assigned mentee with todo counts and latest session scores.
+
+    Two queries regardless of how many mentees are assigned.
+    """
+    mentor = get_user_by_id(db, mentor_id)
+    if not mentor or mentor.role != Role.MENTOR:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentor not found")
+
+    mentee_ids = db.query(MentorMenteeMap.mentee_id).filter(MentorMenteeMap.mentor_id == mentor_id)
+    todo_stats = (
+        db.query(
+            Todo.mentee_id.label("mentee_id"),
+            func.sum(case((Todo.completed.is_(False), 1), else_=0)).label("open_todos"),
+            func.sum(case(((Todo.completed.is_(False)) & (Todo.due_date < today), 1), else_=0)).label(
+                "overdue_todos"
+            ),
+        )
+        .filter(Todo.mentee_id.in_(mentee_ids))
+        .group_by(Todo.mentee_id)
+        .subquery()
+    )
+    ranked_sessions = (
+        db.query(
+            SessionRecord.mentee_id.label("mentee_id"),
+            SessionRecord.date.label("date"),
+            SessionRecord.fluency_score.label("fluency_score"),
+            SessionRecord.confidence_score.label("confidence_score"),
+            func.row_number()
+            .over(
+                partition_by=SessionRecord.mentee_id,
+                order_by=(SessionRecord.date.desc(), SessionRecord.id.desc()),
+            )
+            .label("position"),
+        )
+        .filter(SessionRecord.mentee_id.in_(mentee_ids))
+        .subquery()
+    )
+    rows = (
+        db.query(
+            User.id,
+            User.name,
+            func.coalesce(todo_stats.c.open_todos, 0).label("open_todos"),
+            func.coalesce(todo_stats.c.overdue_todos, 0).label("overdue_todos"),
+            ranked_sessions.c.date.label("last_session_date"),
+            ranked_sessions.c.fluency_score.label("latest_fluency_score"),
+            ranked_sessions.c.confidence_score.label("latest_confidence_score"),
+        )
+        .join(MentorMenteeMap, MentorMenteeMap.mentee_id == User.id)
+        .outerjoin(todo_stats, todo_stats.c.mentee_id == User.id)
+        .outerjoin(
+            ranked_sessions,
+            (ranked_sessions.c.mentee_id == User.id) & (ranked_sessions.c.position == 1),
+        )
+        .filter(MentorMenteeMap.mentor_id == mentor_id)
+        .order_by(User.name.asc(), User.id.asc())
         .all()
     )
-    mentee_ids = [mapping.mentee_id for mapping in mappings]
-    if not mentee_ids:
-        return []
-    return db.query(User).filter(User.id.in_(mentee_ids)).order_by(User.name.asc()).all()
+    return mentor, rows
 
 
 def create_session_record(
@@ -180,13 +502,241 @@ def create_session_record(
         next_steps=next_steps.strip(),
     )
     db.add(record)
+    _add_session_scores(db, [record])
     db.commit()
     db.refresh(record)
+    # Notes stay out of the push payload; clients fetch them with the session listing.
+    event_hub.publish(
+        (mentor_id, mentee_id),
+        ("session", record.id),
+        {
+            "type": "session.created",
+            "session": {
+                "id": record.id,
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "date": record.date,
+                "fluency_score": record.fluency_score,
+                "confidence_score": record.confidence_score,
+            },
+        },
+    )
     return record
 
 
-def list_session_records(db: Session) -> list[SessionRecord]:
-    return db.query(SessionRecord).order_by(SessionRecord.date.desc(), SessionRecord.id.desc()).all()
+def _session_rows_query(db: Session) -> Query:
+    mentor = aliased(User)
+    mentee = aliased(User)
+    return (
+        db.query(
+            SessionRecord.id,
+            func.coalesce(mentor.name, "Unknown").label("mentor_name"),
+            func.coalesce(mentee.name, "Unknown").label("mentee_name"),
+            SessionRecord.date,
+            SessionRecord.fluency_score,
+            SessionRecord.confidence_score,
+            SessionRecord.notes,
+            SessionRecord.next_steps,
+        )
+        .outerjoin(mentor, mentor.id == SessionRecord.mentor_id)
+        .outerjoin(mentee, mentee.id == SessionRecord.mentee_id)
+    )
+
+
+def get_session_row(db: Session, session_id: int) -> Row | None:
+    return _session_rows_query(db).filter(SessionRecord.id == session_id).first()
+
+
+ANALYTICS_SCOPES = ("mentee", "mentor")
+ANALYTICS_PERIODS = ("week", "month")
+
+
+def _period_start(period: str, day: date) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _score_bucket_rows(records: list[SessionRecord]) -> list[dict]:
+    buckets: dict[tuple, dict] = {}
+    for record in records:
+        for scope, subject_id in (("mentee", record.mentee_id), ("mentor", record.mentor_id)):
+            for period in ANALYTICS_PERIODS:
+                key = (scope, subject_id, period, _period_start(period, record.date))
+                bucket = buckets.setdefault(
+                    key,
+                    dict(zip(("scope", "subject_id", "period", "period_start"), key))
+                    | {"session_count": 0, "fluency_sum": 0, "confidence_sum": 0},
+                )
+                bucket["session_count"] += 1
+                bucket["fluency_sum"] += record.fluency_score
+                bucket["confidence_sum"] += record.confidence_score
+    return list(buckets.values())
+
+
+def _add_session_scores(db: Session, records: list[SessionRecord]) -> None:
+    """Fold sessions into their week/month buckets within the caller's transaction."""
+    rows = _score_bucket_rows(records)
+    if not rows:
+        return
+    statement = _upsert_insert(db, SessionScoreBucket).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[
+                SessionScoreBucket.scope,
+                SessionScoreBucket.subject_id,
+                SessionScoreBucket.period,
+                SessionScoreBucket.period_start,
+            ],
+            set_={
+                "session_count": SessionScoreBucket.session_count + statement.excluded.session_count,
+                "fluency_sum": SessionScoreBucket.fluency_sum + statement.excluded.fluency_sum,
+                "confidence_sum": SessionScoreBucket.confidence_sum + statement.excluded.confidence_sum,
+            },
+        )
+    )
+
+
+def rebuild_session_analytics(db: Session, batch_size: int = 1000) -> int:
+    """Recompute every score bucket from session_records; returns the number of buckets."""
+    db.query(SessionScoreBucket).delete(synchronize_session=False)
+    totals: dict[tuple, dict] = {}
+    records = db.query(SessionRecord).order_by(SessionRecord.id.asc()).yield_per(batch_size)
+    for record in records:
+        for row in _score_bucket_rows([record]):
+            key = (row["scope"], row["subject_id"], row["period"], row["period_start"])
+            if key in totals:
+                for field in ("session_count", "fluency_sum", "confidence_sum"):
+                    totals[key][field] += row[field]
+            else:
+                totals[key] = row
+    rows = list(totals.values())
+    if rows:
+        db.execute(insert(SessionScoreBucket), rows)
+    db.commit()
+    return len(rows)
+
+
+@job_handler(REBUILD_ANALYTICS_JOB)
+def _rebuild_session_analytics_job(db: Session, payload: dict) -> None:
+    rebuild_session_analytics(db)
+
+
+def _average(total: int, count: int) -> float | None:
+    return round(total / count, 2) if count else None
+
+
+def get_score_analytics(db: Session, scope: str, subject_id: int, period: str, limit: int) -> dict:
+    recent = (
+        db.query(SessionScoreBucket)
+        .filter(
+            SessionScoreBucket.scope == scope,
+            SessionScoreBucket.subject_id == subject_id,
+            SessionScoreBucket.period == period,
+        )
+        .order_by(SessionScoreBucket.period_start.desc())
+        .limit(limit)
+        .all()
+    )
+    recent.reverse()
+    overall = (
+        db.query(
+            func.coalesce(func.sum(SessionScoreBucket.session_count), 0),
+            func.coalesce(func.sum(SessionScoreBucket.fluency_sum), 0),
+            func.coalesce(func.sum(SessionScoreBucket.confidence_sum), 0),
+        )
+        .filter(
+            SessionScoreBucket.scope == scope,
+            SessionScoreBucket.subject_id == subject_id,
+            SessionScoreBucket.period == "month",
+        )
+        .one()
+    )
+
+    buckets = [
+        {
+            "period_start": bucket.period_start,
+            "session_count": bucket.session_count,
+            "average_fluency": _average(bucket.fluency_sum, bucket.session_count),
+            "average_confidence": _average(bucket.confidence_sum, bucket.session_count),
+        }
+        for bucket in recent
+    ]
+    window_count = sum(bucket.session_count for bucket in recent)
+
+    def delta(field: str) -> float | None:
+        if len(buckets) < 2:
+            return None
+        return round(buckets[-1][field] - buckets[-2][field], 2)
+
+    return {
+        "scope": scope,
+        "subject_id": subject_id,
+        "period": period,
+        "session_count": overall[0],
+        "average_fluency": _average(overall[1], overall[0]),
+        "average_confidence": _average(overall[2], overall[0]),
+        "rolling_average_fluency": _average(sum(b.fluency_sum for b in recent), window_count),
+        "rolling_average_confidence": _average(sum(b.confidence_sum for b in recent), window_count),
+        "fluency_delta": delta("average_fluency"),
+        "confidence_delta": delta("average_confidence"),
+        "buckets": buckets,
+    }
+
+
+def list_session_records(db: Session, limit: int | None = None, cursor: str | None = None) -> Page:
+    return paginate(
+        _session_rows_query(db),
+        [(SessionRecord.date, True), (SessionRecord.id, True)],
+        limit,
+        cursor,
+    )
+
+
+def search_session_records(
+    db: Session,
+    text: str,
+    mentor_id: int | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Page:
+    """Rank sessions whose notes or next steps match ``text``, best match first.
+
+    bm25 has to score every match before the best can be picked, which is slow for
+    terms found in most of millions of notes. Only the newest
+    ``SESSION_SEARCH_WINDOW`` matches are therefore ranked; the window comes from a
+    rowid-ordered walk of the index, which FTS5 can stop early. Older matches cannot
+    be reached, so the page is marked ``truncated`` when there are any.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Session search requires SQLite")
+    index = _session_search_index
+    scope = [index.c.session_records_fts.match(_fts_match_expression(text))]
+    if mentor_id is not None:
+        scope.append(SessionRecord.mentor_id == mentor_id)
+    newest_first = (
+        db.query(index.c.rowid)
+        .select_from(index)
+        .join(SessionRecord, SessionRecord.id == index.c.rowid)
+        .filter(*scope)
+        .order_by(index.c.rowid.desc())
+    )
+    oldest_ranked = newest_first.offset(SESSION_SEARCH_WINDOW - 1).limit(1).scalar_subquery()
+    # Uncorrelated, so SQLite evaluates it once for the statement, not once per row.
+    first_unranked = newest_first.offset(SESSION_SEARCH_WINDOW).limit(1).scalar_subquery()
+    query = (
+        _session_rows_query(db)
+        .add_columns(
+            func.snippet(literal_column("session_records_fts"), -1, "<mark>", "</mark>", "…", 12).label("snippet"),
+            index.c.rank,
+            first_unranked.label("first_unranked"),
+        )
+        .join(index, index.c.rowid == SessionRecord.id)
+        .filter(*scope, index.c.rowid >= func.coalesce(oldest_ranked, 0))
+    )
+    page = paginate(query, [(index.c.rank, False), (SessionRecord.id, False)], limit, cursor)
+    page.truncated = bool(page.items) and page.items[0].first_unranked is not None
+    return page
 
 
 def create_todo(
@@ -222,14 +772,84 @@ def create_todo(
     db.add(todo)
     db.commit()
     db.refresh(todo)
+    _publish_todo(todo, "todo.created")
     return todo
 
 
-def get_todos_for_mentee(db: Session, mentee_id: int) -> list[Todo]:
+def _publish_todo(todo: Todo, event_type: str) -> None:
+    event_hub.publish(
+        (todo.mentor_id, todo.mentee_id),
+        ("todo", todo.id),
+        {
+            "type": event_type,
+            "todo": {
+                "id": todo.id,
+                "title": todo.title,
+                "description": todo.description,
+                "due_date": todo.due_date,
+                "completed": todo.completed,
+                "mentee_id": todo.mentee_id,
+            },
+        },
+    )
+
+
+def create_todos_for_mentees(
+    db: Session,
+    mentor_id: int,
+    mentee_ids: list[int] | None,
+    title: str,
+    description: str,
+    due_date: date,
+) -> list[Todo]:
+    """Assign the same todo to several of a mentor's mentees, or all of them when ``mentee_ids`` is None."""
+    assigned = db.query(MentorMenteeMap.mentee_id).filter(MentorMenteeMap.mentor_id == mentor_id)
+    if mentee_ids is None:
+        targets = [row.mentee_id for row in assigned.order_by(MentorMenteeMap.mentee_id.asc())]
+    else:
+        targets = list(dict.fromkeys(mentee_ids))
+        found = {row.mentee_id for row in assigned.filter(MentorMenteeMap.mentee_id.in_(targets))}
+        unassigned = [mentee_id for mentee_id in targets if mentee_id not in found]
+        if unassigned:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Mentee is not assigned to this mentor: {', '.join(map(str, unassigned))}",
+            )
+    if not targets:
+        return []
+
+    values = {
+        "mentor_id": mentor_id,
+        "title": title.strip(),
+        "description": description.strip(),
+        "due_date": due_date,
+        "completed": False,
+    }
+    # RETURNING order is not guaranteed for batched inserts; match rows on mentee_id,
+    # which is unique within this statement.
+    rows = db.execute(
+        insert(Todo).returning(Todo.id, Todo.mentee_id),
+        [{**values, "mentee_id": mentee_id} for mentee_id in targets],
+    ).all()
+    db.commit()
+    ids = {row.mentee_id: row.id for row in rows}
+    todos = [Todo(id=ids[mentee_id], mentee_id=mentee_id, **values) for mentee_id in targets]
+    for todo in todos:
+        _publish_todo(todo, "todo.created")
+    return todos
+
+
+def get_todos_for_mentee(
+    db: Session,
+    mentee_id: int,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Page:
     mentee = get_user_by_id(db, mentee_id)
     if not mentee or mentee.role != Role.MENTEE:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentee not found")
-    return db.query(Todo).filter(Todo.mentee_id == mentee_id).order_by(Todo.due_date.asc()).all()
+    query = db.query(Todo).filter(Todo.mentee_id == mentee_id)
+    return paginate(query, [(Todo.due_date, False), (Todo.id, False)], limit, cursor)
 
 
 def get_todo_by_id(db: Session, todo_id: int) -> Todo | None:
@@ -243,12 +863,26 @@ def toggle_todo_for_mentee(db: Session, todo_id: int, mentee_id: int) -> Todo:
     if todo.mentee_id != mentee_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Todo does not belong to this mentee")
 
-    todo.completed = not todo.completed
+    # Flip in SQL so concurrent toggles serialize on the row instead of losing updates.
+    db.query(Todo).filter(Todo.id == todo_id).update(
+        {Todo.completed: ~Todo.completed},
+        synchronize_session=False,
+    )
     db.commit()
     db.refresh(todo)
+    _publish_todo(todo, "todo.updated")
     return todo
 
 
+def is_mentee_assigned(db: Session, mentor_id: int, mentee_id: int) -> bool:
+    return (
+        db.query(MentorMenteeMap.id)
+        .filter(MentorMenteeMap.mentor_id == mentor_id, MentorMenteeMap.mentee_id == mentee_id)
+        .first()
+        is not None
+    )
+
+
 def get_mentor_for_mentee(db: Session, mentee_id: int) -> User | None:
     mapping = db.query(MentorMenteeMap).filter(MentorMenteeMap.mentee_id == mentee_id).first()
     if not mapping:
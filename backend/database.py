@@ -1,13 +1,118 @@
+import logging
 import os
+import threading
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from . import slow_queries
+from .metrics import TimedQueuePool
+
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./mentor_connect.db")
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "production")
+# Statements slower than this are fingerprinted, explained and logged; 0 disables.
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "250"))
+
+# PRAGMAs applied to every new SQLite connection, per profile. "production" trades
+# a little durability on power loss (synchronous=NORMAL under WAL) for concurrent
+# readers alongside a writer and far fewer fsyncs.
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "development": {
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+
+
+def _apply_sqlite_pragmas(pragmas: dict[str, str | int]):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def _create_engine(url: str, profile: str) -> Engine:
+    if not url.startswith("sqlite"):
+        return create_engine(
+            url,
+            poolclass=TimedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            pool_pre_ping=True,
+        )
+
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown database profile {profile!r}; expected one of {sorted(SQLITE_PROFILES)}")
+
+    options: dict = {"connect_args": {"check_same_thread": False}}
+    if ":memory:" not in url and "mode=memory" not in url:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        )
+    sqlite_engine = create_engine(url, **options)
+    event.listen(sqlite_engine, "connect", _apply_sqlite_pragmas(SQLITE_PROFILES[profile]))
+    return sqlite_engine
+
+
+def build_engine(
+    url: str,
+    profile: str = DATABASE_PROFILE,
+    slow_query_threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+) -> Engine:
+    new_engine = _create_engine(url, profile)
+    if slow_query_threshold_ms > 0:
+        slow_queries.install(new_engine, slow_query_threshold_ms)
+    return new_engine
+
+
+def run_maintenance(target: Engine) -> None:
+    """Refresh planner statistics and fold the WAL back into the main database file."""
+    if target.dialect.name != "sqlite":
+        return
+    with target.connect() as connection:
+        connection.execute(text("PRAGMA optimize"))
+        connection.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
+
+
+class MaintenanceThread(threading.Thread):
+    def __init__(self, target: Engine, interval_seconds: float) -> None:
+        super().__init__(name="db-maintenance", daemon=True)
+        self.target = target
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                run_maintenance(self.target)
+            except Exception:
+                logger.exception("Database maintenance failed")
+
+    def stop(self) -> None:
+        self._stopped.set()
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+engine = build_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
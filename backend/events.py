@@ -0,0 +1,133 @@
+"""In-process pub/sub hub that pushes change events to connected users.
+
+crud functions call ``event_hub.publish`` after their commit, from whatever thread
+they run on; each subscriber lives on the event loop that serves its WebSocket and
+receives events through ``call_soon_threadsafe``. Every subscription keeps a bounded
+map of pending events keyed by the entity they describe, so a burst of changes to
+the same todo collapses into its latest state. A subscriber that falls more than
+``max_pending`` entities behind gets a single ``resync`` event instead and should
+re-fetch its listings.
+
+Under ``python -m backend.serve`` each worker process has its own hub; the launcher
+connects them with ``connect_peers`` so an event published in one worker also
+reaches the sockets held by the others.
+"""
+
+import asyncio
+import os
+import queue
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, max_pending: int) -> None:
+        self.user_id = user_id
+        self.loop = loop
+        self.max_pending = max_pending
+        self._pending: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self._overflowed = False
+        self._ready = asyncio.Event()
+
+    def _push(self, key: Hashable, event: dict[str, Any]) -> None:
+        # Runs on self.loop only.
+        if not self._overflowed:
+            if key in self._pending:
+                self._pending.pop(key)
+            self._pending[key] = event
+            if len(self._pending) > self.max_pending:
+                self._pending.clear()
+                self._overflowed = True
+        self._ready.set()
+
+    async def next_batch(self, coalesce_seconds: float = 0.0) -> list[dict[str, Any]]:
+        """Wait for events, give a burst ``coalesce_seconds`` to settle, then drain."""
+        await self._ready.wait()
+        if coalesce_seconds > 0:
+            await asyncio.sleep(coalesce_seconds)
+        self._ready.clear()
+        if self._overflowed:
+            self._overflowed = False
+            return [RESYNC_EVENT]
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+
+class EventHub:
+    def __init__(self, max_pending: int) -> None:
+        self.max_pending = max_pending
+        self._subscriptions: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._outboxes: list[Any] = []
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Must be called from the event loop that will consume the subscription."""
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def connect_peers(self, inbox: Any, outboxes: list[Any]) -> None:
+        """Exchange events with sibling worker processes over multiprocessing queues.
+
+        Published events are also put on each sibling's queue in ``outboxes``; a
+        daemon thread delivers what the siblings put on ``inbox`` to local sockets.
+        A full outbox (a sibling that stopped reading) drops the event rather than
+        blocking the request that published it.
+        """
+        for outbox in outboxes:
+            # Never hold up process exit flushing events to a sibling that is gone.
+            outbox.cancel_join_thread()
+        self._outboxes = outboxes
+        threading.Thread(target=self._relay, args=(inbox,), name="event-relay", daemon=True).start()
+
+    def _relay(self, inbox: Any) -> None:
+        while True:
+            try:
+                user_ids, key, event = inbox.get()
+            except (EOFError, OSError):
+                return  # The queue was closed because this process is exiting.
+            self._deliver(user_ids, key, event)
+
+    def publish(self, user_ids: Iterable[int], key: Hashable, event: dict[str, Any]) -> None:
+        """Queue ``event`` for every connection of ``user_ids``; safe from any thread."""
+        user_ids = set(user_ids)
+        self._deliver(user_ids, key, event)
+        for outbox in self._outboxes:
+            try:
+                outbox.put_nowait((user_ids, key, event))
+            except queue.Full:
+                pass
+
+    def _deliver(self, user_ids: set[int], key: Hashable, event: dict[str, Any]) -> None:
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in user_ids
+                for subscription in self._subscriptions.get(user_id, ())
+            ]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._push, key, event)
+            except RuntimeError:
+                # The loop has shut down; its connection is going away anyway.
+                self.unsubscribe(subscription)
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+event_hub = EventHub(max_pending=int(os.getenv("EVENTS_MAX_PENDING", "256")))
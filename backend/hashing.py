@@ -0,0 +1,121 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+
+from .metrics import Counter, Gauge, registry
+from .passwords import hash_password, load_password_context, verify_password
+from .worker_pool import LazyProcessPool
+
+
+class HashingExecutor:
+    """Runs password hashing on a dedicated process pool with bounded admission.
+
+    At most ``max_pending`` hash/verify calls may be queued or running at once;
+    further calls fail fast with 503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = LazyProcessPool(workers, thread_name_prefix="hashing")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self._admit()
+        started = time.perf_counter()
+        try:
+            future = self._pool.executor.submit(fn, *args)
+        except BaseException:
+            self._finish(started)
+            raise
+        future.add_done_callback(lambda _: self._finish(started))
+        return future
+
+    def _finish(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+
+    async def hash_password(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    def hash_password_blocking(self, password: str) -> str:
+        """For synchronous callers that already run on a worker thread."""
+        return self._submit(hash_password, password).result()
+
+    def hash_passwords_blocking(self, passwords: list[str]) -> list[str]:
+        """Hash a batch across all workers; the batch occupies a single admission slot."""
+        if not passwords:
+            return []
+        self._admit()
+        started = time.perf_counter()
+        try:
+            chunksize = max(1, len(passwords) // (max(self.workers, 1) * 4))
+            return list(self._pool.executor.map(hash_password, passwords, chunksize=chunksize))
+        finally:
+            self._finish(started)
+
+    def warm_up(self) -> None:
+        """Start the workers in the background so the first login does not pay for spawning them."""
+        executor = self._pool.executor
+        for _ in range(max(self.workers, 1)):
+            executor.submit(load_password_context)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "queue_depth": self._pending,
+                "max_queue_depth": self.max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "latency_seconds_total": self._total_seconds,
+                "latency_seconds_max": self._max_seconds,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+
+hashing_executor = HashingExecutor(
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64")),
+)
+
+
+registry.register_stats(
+    hashing_executor.stats,
+    {
+        "queue_depth": (Gauge, "password_hash_queue_depth", "Hash/verify calls queued or running."),
+        "max_queue_depth": (Gauge, "password_hash_queue_limit", "Hash/verify calls admitted before returning 503."),
+        "completed": (Counter, "password_hash_completed_total", "Hash/verify calls completed."),
+        "rejected": (Counter, "password_hash_rejected_total", "Hash/verify calls rejected with 503."),
+        "latency_seconds_total": (Counter, "password_hash_seconds_total", "Total time spent in hash/verify calls."),
+    },
+)
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable
+from uuid import uuid4
+
+from fastapi import Request, Response, status
+
+from .shared_counters import SharedCounters
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag`` (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == opaque for candidate in candidates)
+
+
+def not_modified_since(if_modified_since: str | None, last_modified: float) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return int(last_modified) <= since.timestamp()
+
+
+def is_not_modified(
+    if_none_match: str | None,
+    if_modified_since: str | None,
+    etag: str,
+    last_modified: float | None = None,
+) -> bool:
+    # If-None-Match takes precedence; If-Modified-Since is only consulted without it.
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if last_modified is None:
+        return False
+    return not_modified_since(if_modified_since, last_modified)
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+class CollectionVersions:
+    """Per-collection change counters, bumped by crud after each committed write.
+
+    They live in shared memory, so a write handled by one ``backend.serve`` worker
+    invalidates the cached responses of all of them.
+    """
+
+    def __init__(self) -> None:
+        self._counters = SharedCounters()
+
+    def get(self, collection: str) -> int:
+        return self._counters.get(collection)
+
+    def bump(self, *collections: str) -> None:
+        self._counters.bump(*collections)
+
+
+@dataclass
+class CachedResponse:
+    version: int
+    etag: str
+    body: bytes
+    headers: dict[str, str]
+    expires_at: float
+
+
+class ResponseCache:
+    """Bounded LRU of serialized JSON bodies keyed by collection and request variant.
+
+    ETags are derived from the collection version alone, so a matching
+    ``If-None-Match`` is answered with 304 before the handler touches the database.
+    They embed an id drawn at import: workers forked from one preloaded parent share
+    it along with the versions, while independently started processes never match.
+    """
+
+    def __init__(self, versions: CollectionVersions, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        self.versions = versions
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._process_id = uuid4().hex
+        self._entries: OrderedDict[tuple[str, str], CachedResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def etag(self, collection: str, version: int, variant: str) -> str:
+        digest = hashlib.sha1(f"{self._process_id}:{collection}:{version}:{variant}".encode()).hexdigest()
+        return f'W/"{digest[:20]}"'
+
+    def respond(
+        self,
+        request: Request,
+        collection: str,
+        build: Callable[[], tuple[bytes, dict[str, str]]],
+    ) -> Response:
+        """Serve ``collection`` for this request, calling ``build`` only on a cache miss.
+
+        ``build`` returns the serialized JSON body and any extra headers to cache with it.
+        """
+        variant = request.url.query
+        version = self.versions.get(collection)
+        etag = self.etag(collection, version, variant)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        key = (collection, variant)
+        entry = self._get(key, version)
+        if entry is None:
+            body, headers = build()
+            entry = CachedResponse(version, etag, body, headers, time.monotonic() + self.ttl_seconds)
+            self._put(key, entry)
+        return Response(
+            content=entry.body,
+            media_type="application/json",
+            headers={**entry.headers, **cache_headers},
+        )
+
+    def _get(self, key: tuple[str, str], version: int) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or entry.expires_at < time.monotonic():
+                self._size -= len(entry.body)
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: tuple[str, str], entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body)
+            self._entries[key] = entry
+            self._size += len(entry.body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+collection_versions = CollectionVersions()
+response_cache = ResponseCache(
+    collection_versions,
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")),
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300")),
+)
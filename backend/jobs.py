@@ -0,0 +1,318 @@
+"""Durable background jobs stored in the ``jobs`` table.
+
+crud functions call ``enqueue`` inside their own transaction, so a job exists exactly
+when the change that needs it was committed. ``JobWorkers`` threads claim due jobs
+with one conditional UPDATE, which is atomic on SQLite (and re-checked under row
+locks elsewhere), so several threads or processes can share the table without a
+broker. A claim hides the job for ``visibility_timeout`` seconds; if the worker dies
+the job becomes claimable again after that, so handlers must be idempotent. Failed
+attempts are retried with exponential backoff until ``max_attempts`` is reached.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import and_, delete, event, func, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .database import engine
+from .metrics import Counter, Gauge, Histogram, registry
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+Handler = Callable[[Session, dict[str, Any]], None]
+_handlers: dict[str, Handler] = {}
+_wakeups: set[threading.Event] = set()
+_wakeups_lock = threading.Lock()
+
+job_wait = registry.register(
+    Histogram("job_wait_seconds", "Time jobs spent due but unclaimed.", ("kind",))
+)
+job_duration = registry.register(
+    Histogram("job_duration_seconds", "Time spent running job attempts.", ("kind",))
+)
+job_attempts = registry.register(
+    Counter("job_attempts_total", "Job attempts by outcome (done, retried, failed).", ("kind", "outcome"))
+)
+
+
+def job_handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register the function that runs jobs of ``kind``."""
+
+    def register(handler: Handler) -> Handler:
+        _handlers[kind] = handler
+        return handler
+
+    return register
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _wake_workers(session: Session) -> None:
+    with _wakeups_lock:
+        for wakeup in _wakeups:
+            wakeup.set()
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    delay_seconds: float = 0.0,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> Job:
+    """Add a job to ``db``'s transaction; it becomes visible to workers on commit."""
+    now = utcnow()
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload or {}),
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=now + timedelta(seconds=delay_seconds),
+        created_at=now,
+    )
+    db.add(job)
+    # Workers in this process poll; waking them on commit starts the job right away.
+    event.listen(db, "after_commit", _wake_workers, once=True)
+    return job
+
+
+def queue_stats(bind: Engine) -> dict[str, float]:
+    now = utcnow()
+    with Session(bind=bind) as db:
+        counts = dict(
+            db.execute(
+                select(Job.status, func.count())
+                .where(Job.status.in_(("queued", "running", "failed")))
+                .group_by(Job.status)
+            ).all()
+        )
+        oldest_due = db.execute(
+            select(func.min(Job.run_after)).where(Job.status == "queued", Job.run_after <= now)
+        ).scalar()
+    return {
+        "queued": counts.get("queued", 0),
+        "running": counts.get("running", 0),
+        "failed": counts.get("failed", 0),
+        "oldest_due_seconds": (now - oldest_due).total_seconds() if oldest_due is not None else 0.0,
+    }
+
+
+@dataclass
+class _Claim:
+    id: int
+    kind: str
+    payload: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+
+
+class JobWorkers:
+    """A pool of threads that claim and run due jobs from the ``jobs`` table."""
+
+    def __init__(
+        self,
+        bind: Engine,
+        concurrency: int,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 300.0,
+        backoff_base: float = 5.0,
+        backoff_max: float = 3600.0,
+        retention_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        self.bind = bind
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retention_seconds = retention_seconds
+        self._threads: list[threading.Thread] = []
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+        self._last_sweep = 0.0
+
+    def start(self) -> None:
+        if self._threads or self.concurrency <= 0:
+            return
+        self._stopped.clear()
+        with _wakeups_lock:
+            _wakeups.add(self._wakeup)
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop claiming new jobs and wait for the running ones to finish."""
+        self._stopped.set()
+        self._wakeup.set()
+        with _wakeups_lock:
+            _wakeups.discard(self._wakeup)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            # Cleared before polling, so a commit that lands mid-poll still wakes us.
+            self._wakeup.clear()
+            try:
+                if time.monotonic() - self._last_sweep > self.poll_interval * 10:
+                    self._last_sweep = time.monotonic()
+                    self.sweep()
+                if self.run_once():
+                    continue
+            except Exception:
+                logger.exception("Job worker loop failed")
+            self._wakeup.wait(self.poll_interval)
+
+    def drain(self) -> int:
+        """Run due jobs on ``concurrency`` threads until none are left; returns how many ran."""
+        ran = [0] * max(self.concurrency, 1)
+
+        def work(slot: int) -> None:
+            while self.run_once():
+                ran[slot] += 1
+
+        threads = [threading.Thread(target=work, args=(slot,)) for slot in range(len(ran))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sum(ran)
+
+    def _claim(self) -> _Claim | None:
+        now = utcnow()
+        claimable = or_(
+            and_(Job.status == "queued", Job.run_after <= now),
+            and_(Job.status == "running", Job.locked_until <= now, Job.attempts < Job.max_attempts),
+        )
+        candidate = select(Job.id).where(claimable).order_by(Job.run_after, Job.id).limit(1).scalar_subquery()
+        statement = (
+            update(Job)
+            .where(Job.id == candidate, claimable)
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                started_at=now,
+                locked_until=now + timedelta(seconds=self.visibility_timeout),
+            )
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.run_after)
+        )
+        with self.bind.begin() as connection:
+            row = connection.execute(statement).first()
+        return _Claim(*row) if row is not None else None
+
+    def run_once(self) -> bool:
+        """Claim and run one due job; False when there was nothing to do."""
+        claim = self._claim()
+        if claim is None:
+            return False
+        job_wait.observe(max(0.0, (utcnow() - claim.run_after).total_seconds()), (claim.kind,))
+        started = time.perf_counter()
+        error: str | None = None
+        handler = _handlers.get(claim.kind)
+        if handler is None:
+            error = f"No handler registered for job kind {claim.kind!r}"
+        else:
+            try:
+                with Session(bind=self.bind) as db:
+                    handler(db, json.loads(claim.payload))
+            except Exception as exc:
+                logger.warning("Job %s (%s) attempt %s failed", claim.id, claim.kind, claim.attempts, exc_info=True)
+                error = repr(exc)
+        job_duration.observe(time.perf_counter() - started, (claim.kind,))
+        self._finish(claim, error, retry=handler is not None)
+        return True
+
+    def _retry_delay(self, attempts: int) -> float:
+        # Exponential backoff with jitter so a failing dependency is not hit in lockstep.
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _finish(self, claim: _Claim, error: str | None, retry: bool) -> None:
+        now = utcnow()
+        if error is None:
+            values = {"status": "done", "finished_at": now, "locked_until": None, "last_error": None}
+            outcome = "done"
+        elif retry and claim.attempts < claim.max_attempts:
+            run_after = now + timedelta(seconds=self._retry_delay(claim.attempts))
+            values = {"status": "queued", "run_after": run_after, "locked_until": None, "last_error": error}
+            outcome = "retried"
+        else:
+            values = {"status": "failed", "finished_at": now, "locked_until": None, "last_error": error}
+            outcome = "failed"
+        # Only the holder of the current attempt may settle the job; if the claim
+        # expired and another worker took it over, that worker's result wins.
+        statement = (
+            update(Job)
+            .where(Job.id == claim.id, Job.status == "running", Job.attempts == claim.attempts)
+            .values(**values)
+        )
+        with self.bind.begin() as connection:
+            settled = connection.execute(statement).rowcount
+        if settled:
+            job_attempts.inc((claim.kind, outcome))
+
+    def sweep(self) -> None:
+        """Fail expired claims with no attempts left and delete old finished jobs."""
+        now = utcnow()
+        with self.bind.begin() as connection:
+            connection.execute(
+                update(Job)
+                .where(Job.status == "running", Job.locked_until <= now, Job.attempts >= Job.max_attempts)
+                .values(status="failed", finished_at=now, locked_until=None, last_error="Visibility timeout expired")
+            )
+            connection.execute(
+                delete(Job).where(
+                    Job.status.in_(("done", "failed")),
+                    Job.finished_at < now - timedelta(seconds=self.retention_seconds),
+                )
+            )
+
+    def stats(self) -> dict[str, float]:
+        return queue_stats(self.bind)
+
+
+job_workers = JobWorkers(
+    engine,
+    concurrency=int(os.getenv("JOB_WORKERS", "2")),
+    poll_interval=float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1")),
+    visibility_timeout=float(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300")),
+    backoff_base=float(os.getenv("JOB_BACKOFF_BASE_SECONDS", "5")),
+    backoff_max=float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "3600")),
+    retention_seconds=float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600))),
+)
+
+
+def _job_queue_metrics():
+    if not job_workers._threads:
+        return []
+    stats = job_workers.stats()
+    depth = Gauge("job_queue_depth", "Jobs by state.", ("status",))
+    for status in ("queued", "running", "failed"):
+        depth.inc((status,), stats[status])
+    oldest = Gauge("job_oldest_due_seconds", "Age of the oldest due job that has not been claimed.")
+    oldest.inc(amount=stats["oldest_due_seconds"])
+    return [depth, oldest]
+
+
+registry.register_collector(_job_queue_metrics)
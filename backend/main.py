@@ -1,20 +1,23 @@
 import os
-from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
 
-from . import crud
-from .database import Base, SessionLocal, engine
-from .models import Role, User
-from .routes import admin, auth, mentee, mentor
+from . import bootstrap
+from .database import MaintenanceThread, engine
+from .hashing import hashing_executor
+from .jobs import job_workers
+from .metrics import MetricsMiddleware, instrument_engine, sample_rate_from_env
+from .pagination import NEXT_CURSOR_HEADER, TRUNCATED_HEADER
+from .resource_index import resource_indexer
+from .routes import admin, auth, events, mentee, mentor, metrics, uploads
 
 app = FastAPI(title="Mentor Connect API")
-default_upload_dir = Path(__file__).resolve().parent / "uploads"
-upload_dir = Path(os.getenv("UPLOAD_DIR", str(default_upload_dir)))
-upload_dir.mkdir(parents=True, exist_ok=True)
+# "auto": migrate and seed on startup if needed (lock-guarded); "skip": rely on
+# `python -m backend.manage init` having been run before the app starts.
+APP_INIT = os.getenv("APP_INIT", "auto")
+maintenance_interval = float(os.getenv("DB_MAINTENANCE_INTERVAL_SECONDS", "3600"))
+maintenance_thread: MaintenanceThread | None = None
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,33 +25,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TRUNCATED_HEADER, "Accept-Ranges", "Content-Range", "ETag"],
 )
-app.mount("/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
+app.add_middleware(MetricsMiddleware, sample_rate=sample_rate_from_env())
+instrument_engine(engine)
 
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
-    seed_default_users()
-
-
-def seed_default_users():
-    db: Session = SessionLocal()
-    try:
-        defaults = [
-            ("Admin", Role.ADMIN, "admin123"),
-            ("Mentor", Role.MENTOR, "mentor123"),
-            ("Mentee", Role.MENTEE, "mentee123"),
-        ]
-        for name, role, password in defaults:
-            existing = db.query(User).filter(User.name == name, User.role == role).first()
-            if not existing:
-                crud.create_user(db, name=name, role=role, password=password)
-    finally:
-        db.close()
+    global maintenance_thread
+    if APP_INIT == "auto":
+        bootstrap.initialize(engine)
+    hashing_executor.warm_up()
+    if maintenance_interval > 0:
+        maintenance_thread = MaintenanceThread(engine, maintenance_interval)
+        maintenance_thread.start()
+    job_workers.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if maintenance_thread is not None:
+        maintenance_thread.stop()
+    job_workers.stop()
+    hashing_executor.shutdown()
+    resource_indexer.shutdown()
 
 
 app.include_router(auth.router)
 app.include_router(admin.router)
 app.include_router(mentor.router)
 app.include_router(mentee.router)
+app.include_router(uploads.router)
+app.include_router(events.router)
+app.include_router(metrics.router)
@@ -0,0 +1,101 @@
+"""Operational commands: ``python -m backend.manage <command>``."""
+
+import argparse
+
+from . import bootstrap, crud, migrations
+from .database import SessionLocal, engine
+from .jobs import JobWorkers, enqueue, queue_stats
+from .resource_index import resource_indexer
+
+
+def _migrate(args: argparse.Namespace) -> None:
+    if args.status:
+        applied = migrations.applied_versions(engine)
+        for migration in migrations.MIGRATIONS:
+            marker = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:04d} {migration.name}: {marker}")
+        return
+
+    applied = migrations.upgrade(engine, target=args.target)
+    if not applied:
+        print("Database schema is up to date")
+    for migration in applied:
+        print(f"Applied {migration.version:04d} {migration.name}")
+
+
+def _init(args: argparse.Namespace) -> None:
+    if bootstrap.initialize(engine):
+        print("Database migrated and default users seeded")
+    else:
+        print("Database is already initialized")
+
+
+def _rebuild_analytics(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        if args.enqueue:
+            enqueue(db, crud.REBUILD_ANALYTICS_JOB)
+            db.commit()
+            print("Queued a session analytics rebuild")
+            return
+        buckets = crud.rebuild_session_analytics(db)
+    finally:
+        db.close()
+    print(f"Rebuilt {buckets} session score buckets")
+
+
+def _reindex_resources(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        queued = crud.enqueue_resource_indexing(db, include_indexed=args.all)
+    finally:
+        db.close()
+    print(f"Queued {queued} resources for indexing")
+    if args.enqueue:
+        return
+    try:
+        JobWorkers(engine, concurrency=max(resource_indexer.workers, 1)).drain()
+    finally:
+        resource_indexer.shutdown()
+    stats = resource_indexer.stats()
+    print(f"Indexed {stats['indexed']} resources, {stats['failed']} failed")
+
+
+def _jobs(args: argparse.Namespace) -> None:
+    stats = queue_stats(engine)
+    print(
+        f"queued={stats['queued']} running={stats['running']} failed={stats['failed']} "
+        f"oldest_due={stats['oldest_due_seconds']:.1f}s"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init", help="migrate and seed once, so app workers can start with APP_INIT=skip")
+    init.set_defaults(handler=_init)
+
+    migrate = commands.add_parser("migrate", help="apply pending schema migrations")
+    migrate.add_argument("--status", action="store_true", help="list migrations without applying them")
+    migrate.add_argument("--target", type=int, default=None, help="stop after this migration version")
+    migrate.set_defaults(handler=_migrate)
+
+    rebuild = commands.add_parser("rebuild-analytics", help="recompute session score buckets from session records")
+    rebuild.add_argument("--enqueue", action="store_true", help="leave the rebuild to the server's job workers")
+    rebuild.set_defaults(handler=_rebuild_analytics)
+
+    reindex = commands.add_parser("reindex-resources", help="extract and index the text of uploaded PDF resources")
+    reindex.add_argument("--all", action="store_true", help="also re-extract resources that are already indexed")
+    reindex.add_argument("--enqueue", action="store_true", help="leave the work to the server's job workers")
+    reindex.set_defaults(handler=_reindex_resources)
+
+    jobs = commands.add_parser("jobs", help="show background job queue depth")
+    jobs.set_defaults(handler=_jobs)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+``MetricsMiddleware`` times every HTTP request and, for a sampled fraction of them,
+also records how many SQL statements the request issued and how long they took.
+Statements are attributed to requests through a context variable that is set by the
+middleware and read by the SQLAlchemy hooks installed with ``instrument_engine``;
+FastAPI copies the context into the worker threads that run sync endpoints.
+"""
+
+import math
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}" for labels, v in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        with self._lock:
+            # Per series: one count per bucket (non-cumulative), then the running sum.
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 1)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-1] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        names = self.labelnames + ("le",)
+        lines = []
+        for labels, series in snapshot:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {_format_value(cumulative)}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {_format_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """Add a callable that builds fresh metrics at scrape time (e.g. from ``stats()``)."""
+        self._collectors.append(collector)
+
+    def register_stats(
+        self,
+        stats: Callable[[], dict[str, float]],
+        metrics: dict[str, tuple[type[Counter], str, str]],
+    ) -> None:
+        """Expose ``stats()`` fields as unlabelled metrics: ``{field: (Counter or Gauge, name, help)}``."""
+
+        def collect() -> list[_Metric]:
+            values = stats()
+            collected = []
+            for field_name, (kind, name, documentation) in metrics.items():
+                metric = kind(name, documentation)
+                metric.inc(amount=values[field_name])
+                collected.append(metric)
+            return collected
+
+        self.register_collector(collect)
+
+    def render(self) -> str:
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+requests_total = registry.register(
+    Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+)
+requests_in_flight = registry.register(Gauge("http_requests_in_flight", "HTTP requests currently being served."))
+request_duration = registry.register(
+    Histogram("http_request_duration_seconds", "Sampled HTTP request latency.", ("method", "route"))
+)
+request_sql_statements = registry.register(
+    Histogram(
+        "http_request_sql_statements",
+        "SQL statements issued per sampled HTTP request.",
+        ("method", "route"),
+        STATEMENT_BUCKETS,
+    )
+)
+request_sql_duration = registry.register(
+    Histogram("http_request_sql_duration_seconds", "Total SQL time per sampled HTTP request.", ("method", "route"))
+)
+pool_checkout_wait = registry.register(
+    Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection.")
+)
+
+
+@dataclass
+class RequestStats:
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+
+
+_current_request: ContextVar[RequestStats | None] = ContextVar("metrics_current_request", default=None)
+_current_scope: ContextVar[dict | None] = ContextVar("metrics_current_scope", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_request.get() is not None:
+        context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    if stats is None:
+        return
+    started = getattr(context, "metrics_started", None)
+    if started is not None:
+        stats.sql_seconds += time.perf_counter() - started
+    stats.sql_statements += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute statement counts and SQL time on ``engine`` to the sampled request."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - started)
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label so scanners cannot blow up the series count.
+    return getattr(route, "path", None) or "unmatched"
+
+
+def current_route() -> str | None:
+    """``"METHOD /route/{template}"`` of the request being served, if any."""
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    return f"{scope['method']} {_route_label(scope)}"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; ``sample_rate`` is the fraction of requests timed in detail."""
+
+    def __init__(self, app, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        stats = RequestStats() if sampled else None
+        token = _current_request.set(stats)
+        scope_token = _current_scope.set(scope)
+        requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            requests_in_flight.dec()
+            _current_request.reset(token)
+            _current_scope.reset(scope_token)
+            labels = (scope["method"], _route_label(scope))
+            requests_total.inc(labels + (str(status_code),))
+            if stats is not None:
+                request_duration.observe(elapsed, labels)
+                request_sql_statements.observe(stats.sql_statements, labels)
+                request_sql_duration.observe(stats.sql_seconds, labels)
+
+
+def sample_rate_from_env() -> float:
+    return min(1.0, max(0.0, float(os.getenv("METRICS_SAMPLE_RATE", "1.0"))))
@@ -0,0 +1,293 @@
+"""Versioned, forward-only schema migrations.
+
+Each migration runs once, in order, inside its own transaction, and is recorded in
+``schema_migrations``. Migrations describe the schema as it was at the time they were
+written (never via the live models), so a fresh database and an upgraded one always
+end up identical. Append new migrations to ``MIGRATIONS``; never edit applied ones.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _initial_schema(connection: Connection) -> None:
+    metadata = MetaData()
+    Table(
+        "users",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("name", String, nullable=False),
+        Column("email", String, unique=True, index=True, nullable=True),
+        Column("password", String, nullable=False),
+        Column("role", Enum("ADMIN", "MENTOR", "MENTEE", name="role"), nullable=False),
+        Column("meet_link", String, nullable=True),
+    )
+    Table(
+        "mentor_mentee_map",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("mentor_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("mentee_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        UniqueConstraint("mentee_id", name="uq_mentee_single_mentor"),
+    )
+    Table(
+        "resources",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("title", String, nullable=False),
+        Column("url", String, nullable=False),
+        Column("uploaded_at", Date, nullable=False),
+    )
+    Table(
+        "session_records",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("mentor_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("mentee_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("date", Date, nullable=False),
+        Column("fluency_score", Integer, nullable=False),
+        Column("confidence_score", Integer, nullable=False),
+        Column("notes", String, nullable=False),
+        Column("next_steps", String, nullable=False),
+    )
+    Table(
+        "todos",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("mentor_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("mentee_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("title", String, nullable=False),
+        Column("description", String, nullable=False),
+        Column("due_date", Date, nullable=False),
+        Column("completed", Boolean, nullable=False),
+    )
+    # checkfirst keeps this a no-op on databases created by the old create_all startup.
+    metadata.create_all(connection, checkfirst=True)
+
+
+def _hot_path_indexes(connection: Connection) -> None:
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_users_role_name ON users (role, name)",
+        "CREATE INDEX IF NOT EXISTS ix_mentor_mentee_map_mentor_id ON mentor_mentee_map (mentor_id)",
+        "CREATE INDEX IF NOT EXISTS ix_resources_uploaded_at_id ON resources (uploaded_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_session_records_date_id ON session_records (date, id)",
+        "CREATE INDEX IF NOT EXISTS ix_session_records_mentor_id ON session_records (mentor_id)",
+        "CREATE INDEX IF NOT EXISTS ix_session_records_mentee_id ON session_records (mentee_id)",
+        "CREATE INDEX IF NOT EXISTS ix_todos_mentee_id_due_date ON todos (mentee_id, due_date)",
+        "CREATE INDEX IF NOT EXISTS ix_todos_mentor_id ON todos (mentor_id)",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _session_score_buckets(connection: Connection) -> None:
+    metadata = MetaData()
+    Table("users", metadata, Column("id", Integer, primary_key=True))
+    Table(
+        "session_score_buckets",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("scope", String, nullable=False),
+        Column("subject_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("period", String, nullable=False),
+        Column("period_start", Date, nullable=False),
+        Column("session_count", Integer, nullable=False),
+        Column("fluency_sum", Integer, nullable=False),
+        Column("confidence_sum", Integer, nullable=False),
+        UniqueConstraint("scope", "subject_id", "period", "period_start", name="uq_session_score_bucket"),
+    )
+    metadata.tables["session_score_buckets"].create(connection, checkfirst=True)
+
+
+def _session_notes_search(connection: Connection) -> None:
+    # FTS5 is SQLite-only; other dialects get no index and search reports 501.
+    if connection.dialect.name != "sqlite":
+        return
+    # An external-content table stores only the index; the text stays in
+    # session_records and the triggers keep the two in step.
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS session_records_fts USING fts5("
+        "notes, next_steps, content='session_records', content_rowid='id', "
+        "tokenize='porter unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS session_records_fts_insert AFTER INSERT ON session_records BEGIN "
+        "INSERT INTO session_records_fts (rowid, notes, next_steps) VALUES (new.id, new.notes, new.next_steps); "
+        "END",
+        "CREATE TRIGGER IF NOT EXISTS session_records_fts_delete AFTER DELETE ON session_records BEGIN "
+        "INSERT INTO session_records_fts (session_records_fts, rowid, notes, next_steps) "
+        "VALUES ('delete', old.id, old.notes, old.next_steps); "
+        "END",
+        "CREATE TRIGGER IF NOT EXISTS session_records_fts_update AFTER UPDATE OF notes, next_steps ON session_records "
+        "BEGIN "
+        "INSERT INTO session_records_fts (session_records_fts, rowid, notes, next_steps) "
+        "VALUES ('delete', old.id, old.notes, old.next_steps); "
+        "INSERT INTO session_records_fts (rowid, notes, next_steps) VALUES (new.id, new.notes, new.next_steps); "
+        "END",
+        "INSERT INTO session_records_fts (session_records_fts) VALUES ('rebuild')",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _resource_text_search(connection: Connection) -> None:
+    existing = {column["name"] for column in inspect(connection).get_columns("resources")}
+    if "page_count" not in existing:
+        connection.execute(text("ALTER TABLE resources ADD COLUMN page_count INTEGER"))
+    if "text_status" not in existing:
+        connection.execute(text("ALTER TABLE resources ADD COLUMN text_status VARCHAR NOT NULL DEFAULT 'pending'"))
+    if connection.dialect.name != "sqlite":
+        return
+    # Unlike sessions, the extracted text lives only in the index, so this is a
+    # regular FTS5 table keyed by resource id. Titles weigh ten times the body.
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5("
+        "title, body, tokenize='porter unicode61 remove_diacritics 2')",
+        "INSERT INTO resources_fts (resources_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+        "CREATE TRIGGER IF NOT EXISTS resources_fts_insert AFTER INSERT ON resources BEGIN "
+        "INSERT INTO resources_fts (rowid, title, body) VALUES (new.id, new.title, ''); "
+        "END",
+        "CREATE TRIGGER IF NOT EXISTS resources_fts_delete AFTER DELETE ON resources BEGIN "
+        "DELETE FROM resources_fts WHERE rowid = old.id; "
+        "END",
+        "CREATE TRIGGER IF NOT EXISTS resources_fts_update AFTER UPDATE OF title ON resources BEGIN "
+        "UPDATE resources_fts SET title = new.title WHERE rowid = new.id; "
+        "END",
+        "INSERT INTO resources_fts (rowid, title, body) SELECT id, title, '' FROM resources",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _jobs(connection: Connection) -> None:
+    metadata = MetaData()
+    Table(
+        "jobs",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("kind", String, nullable=False),
+        Column("payload", String, nullable=False),
+        Column("status", String, nullable=False),
+        Column("attempts", Integer, nullable=False),
+        Column("max_attempts", Integer, nullable=False),
+        Column("run_after", DateTime, nullable=False),
+        Column("locked_until", DateTime, nullable=True),
+        Column("created_at", DateTime, nullable=False),
+        Column("started_at", DateTime, nullable=True),
+        Column("finished_at", DateTime, nullable=True),
+        Column("last_error", String, nullable=True),
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        Index("ix_jobs_status_locked_until", "status", "locked_until"),
+    )
+    metadata.tables["jobs"].create(connection, checkfirst=True)
+
+
+def _backfill_session_score_buckets(connection: Connection) -> None:
+    # Migration 3 created the buckets empty, so sessions logged before it (or on a
+    # database adopted from create_all) were missing from analytics. Buckets are
+    # derived data: recompute them all, which also repairs any drift.
+    if connection.dialect.name == "sqlite":
+        period_starts = {
+            "week": "date(date, '-' || ((CAST(strftime('%w', date) AS INTEGER) + 6) % 7) || ' days')",
+            "month": "date(date, 'start of month')",
+        }
+    elif connection.dialect.name == "postgresql":
+        period_starts = {
+            "week": "CAST(date_trunc('week', date) AS DATE)",
+            "month": "CAST(date_trunc('month', date) AS DATE)",
+        }
+    else:
+        # Sessions cannot be logged on other databases (their upsert answers 501).
+        return
+    connection.execute(text("DELETE FROM session_score_buckets"))
+    for scope in ("mentee", "mentor"):
+        for period, period_start in period_starts.items():
+            connection.execute(
+                text(
+                    "INSERT INTO session_score_buckets "
+                    "(scope, subject_id, period, period_start, session_count, fluency_sum, confidence_sum) "
+                    f"SELECT '{scope}', {scope}_id, '{period}', {period_start}, "
+                    "COUNT(*), SUM(fluency_score), SUM(confidence_score) "
+                    f"FROM session_records GROUP BY {scope}_id, {period_start}"
+                )
+            )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial_schema", _initial_schema),
+    Migration(2, "hot_path_indexes", _hot_path_indexes),
+    Migration(3, "session_score_buckets", _session_score_buckets),
+    Migration(4, "session_notes_search", _session_notes_search),
+    Migration(5, "resource_text_search", _resource_text_search),
+    Migration(6, "jobs", _jobs),
+    Migration(7, "backfill_session_score_buckets", _backfill_session_score_buckets),
+]
+
+
+def _ensure_version_table(engine: Engine) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version INTEGER PRIMARY KEY, "
+                "name VARCHAR NOT NULL, "
+                "applied_at VARCHAR NOT NULL)"
+            )
+        )
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    if not inspect(engine).has_table("schema_migrations"):
+        return set()
+    with engine.connect() as connection:
+        return {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def pending_migrations(engine: Engine) -> list[Migration]:
+    applied = applied_versions(engine)
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+def upgrade(engine: Engine, target: int | None = None) -> list[Migration]:
+    """Apply every pending migration up to ``target`` (default: latest) and return them."""
+    _ensure_version_table(engine)
+    applied: list[Migration] = []
+    for migration in pending_migrations(engine):
+        if target is not None and migration.version > target:
+            break
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                {
+                    "version": migration.version,
+                    "name": migration.name,
+                    "applied_at": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+        applied.append(migration)
+    return applied
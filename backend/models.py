@@ -1,7 +1,7 @@
 import enum
 from datetime import date
 
-from sqlalchemy import Boolean, Column, Date, Enum, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Boolean, Column, Date, DateTime, Enum, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -15,6 +15,9 @@ class Role(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_name", "role", "name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -66,6 +69,7 @@ class MentorMenteeMap(Base):
     __tablename__ = "mentor_mentee_map"
     __table_args__ = (
         UniqueConstraint("mentee_id", name="uq_mentee_single_mentor"),
+        Index("ix_mentor_mentee_map_mentor_id", "mentor_id"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -78,15 +82,26 @@ class MentorMenteeMap(Base):
 
 class Resource(Base):
     __tablename__ = "resources"
+    __table_args__ = (
+        Index("ix_resources_uploaded_at_id", "uploaded_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     url = Column(String, nullable=False, default="")
     uploaded_at = Column(Date, nullable=False, default=date.today)
+    page_count = Column(Integer, nullable=True)
+    # "pending" until the resource indexer has run, then "indexed" or "failed".
+    text_status = Column(String, nullable=False, default="pending", server_default="pending")
 
 
 class SessionRecord(Base):
     __tablename__ = "session_records"
+    __table_args__ = (
+        Index("ix_session_records_date_id", "date", "id"),
+        Index("ix_session_records_mentor_id", "mentor_id"),
+        Index("ix_session_records_mentee_id", "mentee_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mentor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -103,6 +118,10 @@ class SessionRecord(Base):
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_mentee_id_due_date", "mentee_id", "due_date"),
+        Index("ix_todos_mentor_id", "mentor_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mentor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -114,3 +133,54 @@ class Todo(Base):
 
     mentor = relationship("User", foreign_keys=[mentor_id], back_populates="mentor_todos")
     mentee = relationship("User", foreign_keys=[mentee_id], back_populates="mentee_todos")
+
+
+class SessionScoreBucket(Base):
+    """Running score totals for one mentee or mentor over one week or month.
+
+    Maintained incrementally by ``crud.create_session_record``; rebuild with
+    ``python -m backend.manage rebuild-analytics``.
+    """
+
+    __tablename__ = "session_score_buckets"
+    __table_args__ = (
+        UniqueConstraint("scope", "subject_id", "period", "period_start", name="uq_session_score_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    scope = Column(String, nullable=False)
+    subject_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    period = Column(String, nullable=False)
+    period_start = Column(Date, nullable=False)
+    session_count = Column(Integer, nullable=False, default=0)
+    fluency_sum = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Integer, nullable=False, default=0)
+
+
+class Job(Base):
+    """A unit of background work; see ``backend.jobs``.
+
+    ``status`` moves queued -> running -> done, back to queued with a later
+    ``run_after`` when an attempt fails and retries remain, or to failed. A running
+    job whose ``locked_until`` has passed is assumed lost and is claimed again.
+    Times are naive UTC.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        Index("ix_jobs_status_locked_until", "status", "locked_until"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    payload = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime, nullable=False)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    last_error = Column(String, nullable=True)
@@ -0,0 +1,117 @@
+import base64
+import binascii
+import json
+import os
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from fastapi import HTTPException, Query as QueryParam, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Query
+
+MAX_PAGE_SIZE = 500
+# Served when a request gives no ``limit``, so no listing ever returns a whole table.
+DEFAULT_PAGE_SIZE = min(int(os.getenv("DEFAULT_PAGE_SIZE", "100")), MAX_PAGE_SIZE)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Set when a listing only covers part of the matching rows (see search_session_records).
+TRUNCATED_HEADER = "X-Results-Truncated"
+
+
+@dataclass
+class Page:
+    items: list
+    next_cursor: str | None = None
+    truncated: bool = False
+
+
+@dataclass
+class PageParams:
+    limit: int
+    cursor: str | None
+
+
+def page_params(
+    limit: int = QueryParam(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = QueryParam(default=None),
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor)
+
+
+def next_cursor_headers(page: Page) -> dict[str, str]:
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if page.truncated:
+        headers[TRUNCATED_HEADER] = "true"
+    return headers
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _cursor_value(value: Any, column: Any) -> Any:
+    """Check one decoded cursor value against its key column's Python type."""
+    expected = column.type.python_type
+    if expected is date and isinstance(value, str):
+        return date.fromisoformat(value)
+    # bool is an int subclass, and JSON has no separate int/float for a rank.
+    if expected is float and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if expected in (int, str) and type(value) is expected:
+        return value
+    raise ValueError(f"cursor value does not match {column.key}")
+
+
+def decode_cursor(cursor: str, keys: list[tuple[Any, bool]]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match ordering")
+        return [_cursor_value(value, column) for value, (column, _) in zip(values, keys)]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after(keys: list[tuple[Any, bool]], values: list[Any]):
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        # A row-value comparison lets SQLite seek straight to the cursor in a
+        # composite index instead of walking it from the start.
+        columns = tuple_(*(column for column, _ in keys))
+        return columns < tuple(values) if directions.pop() else columns > tuple(values)
+
+    clauses = []
+    for position, (column, descending) in enumerate(keys):
+        equal_prefix = [keys[index][0] == values[index] for index in range(position)]
+        beyond = column < values[position] if descending else column > values[position]
+        clauses.append(and_(*equal_prefix, beyond) if equal_prefix else beyond)
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    keys: list[tuple[Any, bool]],
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Page:
+    """Apply keyset pagination over ``keys``, a list of ``(column, descending)`` pairs.
+
+    The last key must be unique (normally the primary key) so that every row has a
+    stable position; the cursor encodes the key values of the last row served.
+    """
+    query = query.order_by(*(column.desc() if descending else column.asc() for column, descending in keys))
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        query = query.filter(_after(keys, values))
+
+    if limit is None:
+        return Page(items=query.all())
+
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return Page(items=items)
+    items = items[:limit]
+    last = items[-1]
+    return Page(items=items, next_cursor=encode_cursor([getattr(last, column.key) for column, _ in keys]))
@@ -0,0 +1,37 @@
+"""Password hashing, run inside the hashing executor's worker processes.
+
+passlib is only imported on first use, which also keeps it out of API start-up.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    # Use pbkdf2_sha256 by default to avoid runtime issues with certain bcrypt builds.
+    # Keep bcrypt in the context for backward compatibility if old hashes already exist.
+    return CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+
+
+def load_password_context() -> None:
+    """Import passlib ahead of the first login (used to warm up hashing workers)."""
+    _pwd_context()
+
+
+def hash_password(password: str) -> str:
+    return _pwd_context().hash(password, scheme="pbkdf2_sha256")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _pwd_context().verify(plain_password, hashed_password)
+
+
+def is_hashed_password(password: str) -> bool:
+    return (
+        password.startswith("$2a$")
+        or password.startswith("$2b$")
+        or password.startswith("$2y$")
+        or password.startswith("$pbkdf2-sha256$")
+    )
@@ -0,0 +1,20 @@
+"""PDF text extraction, run inside the resource indexer's worker processes."""
+
+
+def extract_pdf_text(path: str, max_chars: int) -> tuple[str, int]:
+    """Return ``(text, page_count)`` for the PDF at ``path``; text is cut at ``max_chars``."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        # Many "protected" PDFs only restrict printing and open with an empty password.
+        reader.decrypt("")
+    parts: list[str] = []
+    remaining = max_chars
+    for page in reader.pages:
+        if remaining <= 0:
+            break
+        text = page.extract_text() or ""
+        parts.append(text[:remaining])
+        remaining -= len(parts[-1])
+    return "\n".join(parts), len(reader.pages)
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .models import Role, User
+from .shared_counters import SharedCounters
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, detached from any database session."""
+
+    id: int
+    name: str
+    role: Role
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, name=user.name, role=user.role)
+
+
+class PrincipalCache:
+    """Bounded LRU of principals by user id with a TTL and per-user versions.
+
+    ``invalidate`` bumps the user's version, and ``put`` drops any entry whose
+    version was read before that bump, so a lookup racing with a write can never
+    re-insert a stale principal. Versions live in shared memory and every hit is
+    checked against them, so an invalidation in one ``backend.serve`` worker also
+    evicts the user from the others.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, tuple[Principal, float, int]] = OrderedDict()
+        self._versions = SharedCounters()
+        self._lock = threading.Lock()
+
+    def version(self, user_id: int) -> int:
+        return self._versions.get(user_id)
+
+    def get(self, user_id: int) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at, version = entry
+            if expires_at < time.monotonic() or version != self._versions.get(user_id):
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, principal: Principal, version: int) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if self._versions.get(principal.id) != version:
+                return
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl_seconds, version)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._versions.bump(user_id)
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_size=int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60")),
+)
@@ -0,0 +1,93 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from . import crud, storage
+from .jobs import job_handler
+from .metrics import Counter, registry
+from .models import Resource
+from .pdf_text import extract_pdf_text
+from .worker_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceIndexer:
+    """Extracts text and page counts from uploaded PDFs for the ``index_resource`` job.
+
+    pypdf is pure Python and CPU bound, so extraction runs on a dedicated process
+    pool and the job worker thread only waits for it.
+    """
+
+    def __init__(self, workers: int, max_chars: int) -> None:
+        self.workers = workers
+        self.max_chars = max_chars
+        self._pool = LazyProcessPool(workers, thread_name_prefix="resource-index")
+        self._lock = threading.Lock()
+        self._indexed = 0
+        self._failed = 0
+        self._total_seconds = 0.0
+
+    def extract(self, path: Path) -> tuple[str, int]:
+        return self._pool.executor.submit(extract_pdf_text, str(path), self.max_chars).result()
+
+    def index(self, db: Session, resource_id: int) -> bool:
+        """Extract and store the text of ``resource_id``; False if the PDF could not be read."""
+        resource = db.get(Resource, resource_id)
+        if resource is None:
+            return False
+        started = time.perf_counter()
+        text: str | None = None
+        page_count: int | None = None
+        path = storage.path_for_url(resource.url)
+        if path is not None:
+            try:
+                text, page_count = self.extract(path)
+            except Exception as exc:
+                # An unreadable PDF will not improve on retry; record it as failed.
+                logger.warning("Could not extract text from resource %s (%s): %r", resource_id, path, exc)
+        crud.store_resource_text(db, resource_id, text, page_count)
+        with self._lock:
+            if text is None:
+                self._failed += 1
+            else:
+                self._indexed += 1
+            self._total_seconds += time.perf_counter() - started
+        return text is not None
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "indexed": self._indexed,
+                "failed": self._failed,
+                "seconds_total": self._total_seconds,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+
+resource_indexer = ResourceIndexer(
+    workers=int(os.getenv("RESOURCE_INDEX_WORKERS", str(min(2, os.cpu_count() or 1)))),
+    max_chars=int(os.getenv("RESOURCE_INDEX_MAX_CHARS", str(1_000_000))),
+)
+
+
+@job_handler(crud.INDEX_RESOURCE_JOB)
+def _index_resource_job(db: Session, payload: dict[str, Any]) -> None:
+    resource_indexer.index(db, payload["resource_id"])
+
+
+registry.register_stats(
+    resource_indexer.stats,
+    {
+        "indexed": (Counter, "resource_index_indexed_total", "PDFs whose text was extracted and indexed."),
+        "failed": (Counter, "resource_index_failed_total", "PDFs whose text could not be extracted."),
+        "seconds_total": (Counter, "resource_index_seconds_total", "Total time spent extracting and indexing PDFs."),
+    },
+)
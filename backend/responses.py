@@ -0,0 +1,43 @@
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (dates, enums and dataclasses are native)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _row_getter(sample: Any, fields: tuple[str, ...]) -> Callable[[Any], Sequence[Any]] | None:
+    if not isinstance(sample, Row):
+        return attrgetter(*fields)
+    # Named access on a Row goes through a key lookup per column; positions do not.
+    positions = [sample._fields.index(field) for field in fields]
+    if positions == list(range(len(sample))):
+        return None
+    return itemgetter(*positions)
+
+
+def serialize_rows(rows: Sequence[Any], schema: type[BaseModel]) -> list[dict[str, Any]]:
+    """Project ORM objects or result rows onto ``schema``'s fields without validating them.
+
+    Only for rows that come straight from the database and already have the declared
+    types; anything a client sent still goes through the schema itself.
+    """
+    if not rows:
+        return []
+    fields = tuple(schema.model_fields)
+    getter = _row_getter(rows[0], fields)
+    if getter is None:
+        return [dict(zip(fields, row)) for row in rows]
+    return [dict(zip(fields, getter(row))) for row in rows]
+
+
+def dump_rows(rows: Sequence[Any], schema: type[BaseModel]) -> bytes:
+    return orjson.dumps(serialize_rows(rows, schema), option=orjson.OPT_NON_STR_KEYS)
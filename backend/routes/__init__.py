@@ -1 +1 @@
-from . import admin, auth, mentee, mentor
+from . import admin, auth, events, mentee, mentor, metrics, uploads
@@ -1,23 +1,38 @@
-import os
-from pathlib import Path
-from uuid import uuid4
+import codecs
+import csv
+import json
+from typing import Any, Iterator
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from .. import crud
+from .. import crud, storage
 from ..database import get_db
+from ..http_cache import response_cache
 from ..models import Role
+from ..pagination import PageParams, next_cursor_headers, page_params
+from ..responses import ORJSONResponse, dump_rows, serialize_rows
 from ..schemas import (
+    AnalyticsPeriod,
+    BulkMapMentorRequest,
+    BulkMapMentorResponse,
+    BulkUserImportResponse,
+    BulkUserResult,
     CreateUserRequest,
     MapMentorRequest,
     MapMentorResponse,
     MentorMenteeMappingResponse,
     ResourceResponse,
+    ScoreAnalyticsResponse,
     SessionRecordResponse,
+    SessionSearchResult,
+    SlowQueryOrder,
+    SlowQueryResponse,
     UserResponse,
 )
 from ..security import require_roles
+from ..slow_queries import slow_query_log
 
 router = APIRouter(
     prefix="/admin",
@@ -26,37 +41,93 @@ router = APIRouter(
 )
 
 
-def _upload_dir() -> Path:
-    default_dir = Path(__file__).resolve().parent.parent / "uploads"
-    path = Path(os.getenv("UPLOAD_DIR", str(default_dir)))
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+BULK_BATCH_SIZE = 500
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
 
 
-def _mapping_response(db: Session, mapping) -> MentorMenteeMappingResponse:
-    mentor = crud.get_user_by_id(db, mapping.mentor_id)
-    mentee = crud.get_user_by_id(db, mapping.mentee_id)
-    return MentorMenteeMappingResponse(
-        mentor_id=mapping.mentor_id,
-        mentee_id=mapping.mentee_id,
-        mentor_name=mentor.name if mentor else "Unknown",
-        mentee_name=mentee.name if mentee else "Unknown",
-    )
+def _decoded_lines(file: UploadFile) -> Iterator[str]:
+    # Decoded line by line (not through a buffered TextIOWrapper) so that a bad byte
+    # surfaces at its own row, after every earlier row has been yielded.
+    for number, raw in enumerate(file.file):
+        yield (raw.removeprefix(codecs.BOM_UTF8) if number == 0 else raw).decode("utf-8")
+
+
+def _iter_csv_rows(file: UploadFile) -> Iterator[dict[str, Any] | str]:
+    try:
+        yield from csv.DictReader(_decoded_lines(file))
+    except UnicodeDecodeError:
+        # The reader cannot resynchronize after a bad byte, so the rest of the file is skipped.
+        yield "File is not valid UTF-8; this and the following rows were not imported"
+    except csv.Error as exc:
+        yield f"Malformed CSV ({exc}); this and the following rows were not imported"
+
+
+def _iter_ndjson_rows(file: UploadFile) -> Iterator[dict[str, Any] | str]:
+    for number, raw in enumerate(file.file):
+        if number == 0:
+            raw = raw.removeprefix(codecs.BOM_UTF8)
+        try:
+            line = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            yield "Invalid UTF-8"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield "Invalid JSON"
+            continue
+        yield record if isinstance(record, dict) else "Expected a JSON object"
 
 
-def _session_response(db: Session, session) -> SessionRecordResponse:
-    mentor = crud.get_user_by_id(db, session.mentor_id)
-    mentee = crud.get_user_by_id(db, session.mentee_id)
-    return SessionRecordResponse(
-        id=session.id,
-        mentor_name=mentor.name if mentor else "Unknown",
-        mentee_name=mentee.name if mentee else "Unknown",
-        date=session.date,
-        fluency_score=session.fluency_score,
-        confidence_score=session.confidence_score,
-        notes=session.notes,
-        next_steps=session.next_steps,
+def _iter_bulk_rows(file: UploadFile) -> Iterator[dict[str, Any] | str]:
+    """Yield one dict per record, or an error message for records that cannot be parsed."""
+    filename = (file.filename or "").lower()
+    if filename.endswith(".csv") or file.content_type in CSV_CONTENT_TYPES:
+        return _iter_csv_rows(file)
+    if filename.endswith((".ndjson", ".jsonl")) or file.content_type in NDJSON_CONTENT_TYPES:
+        return _iter_ndjson_rows(file)
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload must be CSV or NDJSON")
+
+
+def _parse_bulk_user(record: dict[str, Any] | str) -> CreateUserRequest | str:
+    if isinstance(record, str):
+        return record
+    try:
+        payload = CreateUserRequest.model_validate(record)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        field = ".".join(str(part) for part in error["loc"])
+        return f"{field}: {error['msg']}" if field else error["msg"]
+    if payload.role not in (Role.MENTOR, Role.MENTEE):
+        return "Only mentor or mentee can be created from admin panel"
+    if not payload.name.strip() or not payload.password.strip():
+        return "Name and password are required"
+    return payload
+
+
+def _flush_bulk_batch(
+    db: Session,
+    batch: list[tuple[int, CreateUserRequest]],
+    results: list[BulkUserResult],
+) -> None:
+    ids = crud.create_users_batch(
+        db,
+        [(payload.name.strip(), payload.role, payload.password.strip()) for _, payload in batch],
     )
+    for (row, payload), user_id in zip(batch, ids):
+        results.append(
+            BulkUserResult(
+                row=row,
+                name=payload.name.strip(),
+                role=payload.role,
+                status="created" if user_id is not None else "duplicate",
+                id=user_id,
+                detail=None if user_id is not None else f"{payload.role.value} with this name already exists",
+            )
+        )
 
 
 @router.post("/users", response_model=UserResponse)
@@ -70,16 +141,56 @@ def create_user(payload: CreateUserRequest, db: Session = Depends(get_db)):
     return UserResponse(id=user.id, name=user.name, role=user.role)
 
 
+@router.post("/users/bulk", response_model=BulkUserImportResponse)
+def bulk_create_users(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    results: list[BulkUserResult] = []
+    batch: list[tuple[int, CreateUserRequest]] = []
+    for row, record in enumerate(_iter_bulk_rows(file), start=1):
+        parsed = _parse_bulk_user(record)
+        if isinstance(parsed, str):
+            results.append(BulkUserResult(row=row, status="invalid", detail=parsed))
+            continue
+        batch.append((row, parsed))
+        if len(batch) >= BULK_BATCH_SIZE:
+            _flush_bulk_batch(db, batch, results)
+            batch = []
+    if batch:
+        _flush_bulk_batch(db, batch, results)
+
+    results.sort(key=lambda result: result.row)
+    return BulkUserImportResponse(
+        created=sum(result.status == "created" for result in results),
+        duplicates=sum(result.status == "duplicate" for result in results),
+        invalid=sum(result.status == "invalid" for result in results),
+        results=results,
+    )
+
+
+def _cached_users(request: Request, role: Role, page: PageParams, db: Session) -> Response:
+    def build():
+        users = crud.get_users_by_role(db, role, limit=page.limit, cursor=page.cursor)
+        body = dump_rows(users.items, UserResponse)
+        return body, next_cursor_headers(users)
+
+    return response_cache.respond(request, f"users:{role.value}", build)
+
+
 @router.get("/mentors", response_model=list[UserResponse])
-def list_mentors(db: Session = Depends(get_db)):
-    users = crud.get_users_by_role(db, Role.MENTOR)
-    return [UserResponse(id=u.id, name=u.name, role=u.role) for u in users]
+def list_mentors(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    return _cached_users(request, Role.MENTOR, page, db)
 
 
 @router.get("/mentees", response_model=list[UserResponse])
-def list_mentees(db: Session = Depends(get_db)):
-    users = crud.get_users_by_role(db, Role.MENTEE)
-    return [UserResponse(id=u.id, name=u.name, role=u.role) for u in users]
+def list_mentees(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    return _cached_users(request, Role.MENTEE, page, db)
 
 
 @router.post("/map-mentor", response_model=MapMentorResponse)
@@ -92,38 +203,124 @@ def map_mentor(payload: MapMentorRequest, db: Session = Depends(get_db)):
     )
 
 
+@router.post("/map-mentor/bulk", response_model=BulkMapMentorResponse)
+def map_mentors_bulk(payload: BulkMapMentorRequest, db: Session = Depends(get_db)):
+    counts = crud.map_mentors_to_mentees(
+        db,
+        [(mapping.mentor_id, mapping.mentee_id) for mapping in payload.mappings],
+    )
+    return BulkMapMentorResponse(**counts)
+
+
 @router.get("/mappings", response_model=list[MentorMenteeMappingResponse])
-def get_mappings(db: Session = Depends(get_db)):
-    mappings = crud.list_mappings(db)
-    return [_mapping_response(db, mapping) for mapping in mappings]
+def get_mappings(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    def build():
+        mappings = crud.list_mappings(db, limit=page.limit, cursor=page.cursor)
+        body = dump_rows(mappings.items, MentorMenteeMappingResponse)
+        return body, next_cursor_headers(mappings)
 
+    return response_cache.respond(request, "mappings", build)
 
-@router.post("/resources", response_model=ResourceResponse)
-async def create_resource(
+
+def create_resource(
     title: str = Form(...),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
+    # Sync on purpose: the file copy and the insert/commit (which can wait on
+    # SQLite's write lock) both run on a worker thread, never on the event loop.
+    # Checked before anything is written, so a rejected request leaves no orphan file.
+    if not title.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Resource title is required")
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF files are allowed")
     if file.content_type not in ("application/pdf", "application/octet-stream"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file content type")
 
-    unique_name = f"{uuid4().hex}.pdf"
-    dest_path = _upload_dir() / unique_name
-    content = await file.read()
-    dest_path.write_bytes(content)
-
-    resource = crud.create_resource(db, title=title, url=f"/uploads/{unique_name}")
+    stored = storage.save_pdf(file.file)
+    resource = crud.create_resource(db, title=title, url=f"/uploads/{stored.name}")
     return resource
 
 
+router.add_api_route(
+    "/resources",
+    create_resource,
+    methods=["POST"],
+    response_model=ResourceResponse,
+    route_class_override=storage.UploadLimitRoute,
+)
+
+
 @router.get("/resources", response_model=list[ResourceResponse])
-def get_resources(db: Session = Depends(get_db)):
-    return crud.list_resources(db)
+def get_resources(
+    request: Request,
+    q: str | None = Query(default=None, min_length=1, max_length=200),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    def build():
+        if q is None:
+            resources = crud.list_resources(db, limit=page.limit, cursor=page.cursor)
+        else:
+            resources = crud.search_resources(db, q, limit=page.limit, cursor=page.cursor)
+        body = dump_rows(resources.items, ResourceResponse)
+        return body, next_cursor_headers(resources)
+
+    return response_cache.respond(request, "resources", build)
 
 
 @router.get("/sessions", response_model=list[SessionRecordResponse])
-def get_sessions(db: Session = Depends(get_db)):
-    sessions = crud.list_session_records(db)
-    return [_session_response(db, session) for session in sessions]
+def get_sessions(
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    sessions = crud.list_session_records(db, limit=page.limit, cursor=page.cursor)
+    return ORJSONResponse(serialize_rows(sessions.items, SessionRecordResponse), headers=next_cursor_headers(sessions))
+
+
+@router.get("/sessions/search", response_model=list[SessionSearchResult])
+def search_sessions(
+    q: str = Query(min_length=1, max_length=200),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    results = crud.search_session_records(db, q, limit=page.limit, cursor=page.cursor)
+    return ORJSONResponse(serialize_rows(results.items, SessionSearchResult), headers=next_cursor_headers(results))
+
+
+@router.get("/analytics/mentees/{mentee_id}", response_model=ScoreAnalyticsResponse)
+def get_mentee_analytics(
+    mentee_id: int,
+    period: AnalyticsPeriod = "week",
+    limit: int = Query(default=12, ge=1, le=104),
+    db: Session = Depends(get_db),
+):
+    mentee = crud.get_user_by_id(db, mentee_id)
+    if not mentee or mentee.role != Role.MENTEE:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentee not found")
+    return crud.get_score_analytics(db, "mentee", mentee_id, period, limit)
+
+
+@router.get("/analytics/mentors/{mentor_id}", response_model=ScoreAnalyticsResponse)
+def get_mentor_analytics(
+    mentor_id: int,
+    period: AnalyticsPeriod = "week",
+    limit: int = Query(default=12, ge=1, le=104),
+    db: Session = Depends(get_db),
+):
+    mentor = crud.get_user_by_id(db, mentor_id)
+    if not mentor or mentor.role != Role.MENTOR:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentor not found")
+    return crud.get_score_analytics(db, "mentor", mentor_id, period, limit)
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+def get_slow_queries(
+    limit: int = Query(default=20, ge=1, le=500),
+    order_by: SlowQueryOrder = "p95",
+):
+    return slow_query_log.top(limit, order_by)
@@ -10,8 +10,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = crud.authenticate_user(db, payload.name.strip(), payload.role, payload.password)
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await crud.authenticate_user(db, payload.name.strip(), payload.role, payload.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
@@ -0,0 +1,76 @@
+import os
+
+import anyio
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..database import get_db
+from ..events import event_hub
+from ..security import principal_from_token
+
+router = APIRouter(tags=["events"])
+
+COALESCE_SECONDS = float(os.getenv("EVENTS_COALESCE_MS", "50")) / 1000
+
+
+def _websocket_token(websocket: WebSocket, token: str | None) -> str | None:
+    # Browsers cannot set headers on a WebSocket handshake, so the query string is the
+    # usual carrier; an Authorization header works for other clients.
+    if token:
+        return token
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    return credentials if scheme.lower() == "bearer" and credentials else None
+
+
+async def _send_events(websocket: WebSocket, subscription) -> None:
+    while True:
+        batch = await subscription.next_batch(COALESCE_SECONDS)
+        await websocket.send_text(orjson.dumps({"events": batch}).decode())
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # Clients do not send anything meaningful; reading is only how a close is noticed.
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/ws/events")
+async def stream_events(
+    websocket: WebSocket,
+    token: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    credentials = _websocket_token(websocket, token)
+    try:
+        if not credentials:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+        principal = await run_in_threadpool(principal_from_token, credentials, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        # Release the pooled connection now rather than when the socket closes.
+        await run_in_threadpool(db.close)
+
+    await websocket.accept()
+    subscription = event_hub.subscribe(principal.id)
+    try:
+        async with anyio.create_task_group() as task_group:
+
+            async def pump() -> None:
+                try:
+                    await _send_events(websocket, subscription)
+                except WebSocketDisconnect:
+                    pass
+                finally:
+                    task_group.cancel_scope.cancel()
+
+            task_group.start_soon(pump)
+            await _wait_for_disconnect(websocket)
+            task_group.cancel_scope.cancel()
+    finally:
+        event_hub.unsubscribe(subscription)
@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
-from ..models import Role, User
+from ..http_cache import response_cache
+from ..models import Role
+from ..pagination import PageParams, next_cursor_headers, page_params
+from ..principals import Principal
+from ..responses import ORJSONResponse, dump_rows, serialize_rows
 from ..schemas import MentorForMenteeResponse, ResourceResponse, TodoResponse
 from ..security import require_roles
 
 router = APIRouter(prefix="/mentee", tags=["mentee"])
 
 
-def _mentee_user(current_user: User = Depends(require_roles(Role.MENTEE))) -> User:
+def _mentee_user(current_user: Principal = Depends(require_roles(Role.MENTEE))) -> Principal:
     return current_user
 
 
@@ -18,7 +22,7 @@ def _mentee_user(current_user: User = Depends(require_roles(Role.MENTEE))) -> Us
 def get_mentor(
     mentee_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentee_user),
+    current_user: Principal = Depends(_mentee_user),
 ):
     if current_user.id != mentee_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentee scope")
@@ -31,30 +35,21 @@ def get_mentor(
 @router.get("/{mentee_id}/todos", response_model=list[TodoResponse])
 def get_todos(
     mentee_id: int,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentee_user),
+    current_user: Principal = Depends(_mentee_user),
 ):
     if current_user.id != mentee_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentee scope")
-    todos = crud.get_todos_for_mentee(db, mentee_id)
-    return [
-        TodoResponse(
-            id=todo.id,
-            title=todo.title,
-            description=todo.description,
-            due_date=todo.due_date,
-            completed=todo.completed,
-            mentee_id=todo.mentee_id,
-        )
-        for todo in todos
-    ]
+    todos = crud.get_todos_for_mentee(db, mentee_id, limit=page.limit, cursor=page.cursor)
+    return ORJSONResponse(serialize_rows(todos.items, TodoResponse), headers=next_cursor_headers(todos))
 
 
 @router.patch("/todos/{todo_id}/toggle", response_model=TodoResponse)
 def toggle_todo(
     todo_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentee_user),
+    current_user: Principal = Depends(_mentee_user),
 ):
     todo = crud.toggle_todo_for_mentee(db, todo_id=todo_id, mentee_id=current_user.id)
     return TodoResponse(
@@ -68,5 +63,19 @@ def toggle_todo(
 
 
 @router.get("/resources", response_model=list[ResourceResponse])
-def get_resources(_: User = Depends(_mentee_user), db: Session = Depends(get_db)):
-    return crud.list_resources(db)
+def get_resources(
+    request: Request,
+    q: str | None = Query(default=None, min_length=1, max_length=200),
+    page: PageParams = Depends(page_params),
+    _: Principal = Depends(_mentee_user),
+    db: Session = Depends(get_db),
+):
+    def build():
+        if q is None:
+            resources = crud.list_resources(db, limit=page.limit, cursor=page.cursor)
+        else:
+            resources = crud.search_resources(db, q, limit=page.limit, cursor=page.cursor)
+        body = dump_rows(resources.items, ResourceResponse)
+        return body, next_cursor_headers(resources)
+
+    return response_cache.respond(request, "resources", build)
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from .. import crud
 from ..database import get_db
-from ..models import Role, User
+from ..models import Role
+from ..pagination import PageParams, next_cursor_headers, page_params
+from ..principals import Principal
+from ..responses import ORJSONResponse, serialize_rows
 from ..schemas import (
+    AnalyticsPeriod,
+    BulkTodoCreateRequest,
     MeetLinkResponse,
+    MentorDashboardMentee,
+    MentorDashboardResponse,
     MeetLinkUpdateRequest,
+    ScoreAnalyticsResponse,
     SessionRecordCreateRequest,
     SessionRecordResponse,
+    SessionSearchResult,
     TodoCreateRequest,
     TodoResponse,
     UserResponse,
@@ -18,35 +29,62 @@ from ..security import require_roles
 router = APIRouter(prefix="/mentor", tags=["mentor"])
 
 
-def _mentor_user(current_user: User = Depends(require_roles(Role.MENTOR))) -> User:
+def _mentor_user(current_user: Principal = Depends(require_roles(Role.MENTOR))) -> Principal:
     return current_user
 
 
-def _session_response(db: Session, session) -> SessionRecordResponse:
-    mentor = crud.get_user_by_id(db, session.mentor_id)
-    mentee = crud.get_user_by_id(db, session.mentee_id)
+def _session_response(row) -> SessionRecordResponse:
     return SessionRecordResponse(
-        id=session.id,
-        mentor_name=mentor.name if mentor else "Unknown",
-        mentee_name=mentee.name if mentee else "Unknown",
-        date=session.date,
-        fluency_score=session.fluency_score,
-        confidence_score=session.confidence_score,
-        notes=session.notes,
-        next_steps=session.next_steps,
+        id=row.id,
+        mentor_name=row.mentor_name,
+        mentee_name=row.mentee_name,
+        date=row.date,
+        fluency_score=row.fluency_score,
+        confidence_score=row.confidence_score,
+        notes=row.notes,
+        next_steps=row.next_steps,
     )
 
 
 @router.get("/{mentor_id}/mentees", response_model=list[UserResponse])
 def get_mentees(
+    mentor_id: int,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(_mentor_user),
+):
+    if current_user.id != mentor_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentor scope")
+    mentees = crud.get_assigned_mentees(db, mentor_id, limit=page.limit, cursor=page.cursor)
+    return ORJSONResponse(serialize_rows(mentees.items, UserResponse), headers=next_cursor_headers(mentees))
+
+
+@router.get("/{mentor_id}/dashboard", response_model=MentorDashboardResponse)
+def get_dashboard(
     mentor_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentor_user),
+    current_user: Principal = Depends(_mentor_user),
 ):
     if current_user.id != mentor_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentor scope")
-    mentees = crud.get_assigned_mentees(db, mentor_id)
-    return [UserResponse(id=mentee.id, name=mentee.name, role=mentee.role) for mentee in mentees]
+    mentor, rows = crud.get_mentor_dashboard(db, mentor_id, date.today())
+    return MentorDashboardResponse(
+        mentor_id=mentor.id,
+        mentor_name=mentor.name,
+        meet_link=mentor.meet_link or "",
+        mentees=[
+            MentorDashboardMentee(
+                id=row.id,
+                name=row.name,
+                open_todos=row.open_todos,
+                overdue_todos=row.overdue_todos,
+                last_session_date=row.last_session_date,
+                latest_fluency_score=row.latest_fluency_score,
+                latest_confidence_score=row.latest_confidence_score,
+            )
+            for row in rows
+        ],
+    )
 
 
 @router.put("/{mentor_id}/meet-link", response_model=MeetLinkResponse)
@@ -54,7 +92,7 @@ def set_meet_link(
     mentor_id: int,
     payload: MeetLinkUpdateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentor_user),
+    current_user: Principal = Depends(_mentor_user),
 ):
     if current_user.id != mentor_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentor scope")
@@ -66,7 +104,7 @@ def set_meet_link(
 def get_meet_link(
     mentor_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentor_user),
+    current_user: Principal = Depends(_mentor_user),
 ):
     if current_user.id != mentor_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentor scope")
@@ -77,7 +115,7 @@ def get_meet_link(
 def log_session(
     payload: SessionRecordCreateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentor_user),
+    current_user: Principal = Depends(_mentor_user),
 ):
     session = crud.create_session_record(
         db,
@@ -89,14 +127,28 @@ def log_session(
         notes=payload.notes,
         next_steps=payload.next_steps,
     )
-    return _session_response(db, session)
+    return _session_response(crud.get_session_row(db, session.id))
+
+
+@router.get("/{mentor_id}/sessions/search", response_model=list[SessionSearchResult])
+def search_sessions(
+    mentor_id: int,
+    q: str = Query(min_length=1, max_length=200),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(_mentor_user),
+):
+    if current_user.id != mentor_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentor scope")
+    results = crud.search_session_records(db, q, mentor_id=mentor_id, limit=page.limit, cursor=page.cursor)
+    return ORJSONResponse(serialize_rows(results.items, SessionSearchResult), headers=next_cursor_headers(results))
 
 
 @router.post("/todos", response_model=TodoResponse)
 def assign_todo(
     payload: TodoCreateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(_mentor_user),
+    current_user: Principal = Depends(_mentor_user),
 ):
     todo = crud.create_todo(
         db,
@@ -114,3 +166,49 @@ def assign_todo(
         completed=todo.completed,
         mentee_id=todo.mentee_id,
     )
+
+
+@router.post("/todos/bulk", response_model=list[TodoResponse])
+def assign_todos_bulk(
+    payload: BulkTodoCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(_mentor_user),
+):
+    todos = crud.create_todos_for_mentees(
+        db,
+        mentor_id=current_user.id,
+        mentee_ids=None if payload.all_mentees else payload.mentee_ids,
+        title=payload.title,
+        description=payload.description,
+        due_date=payload.due_date,
+    )
+    return ORJSONResponse(serialize_rows(todos, TodoResponse))
+
+
+@router.get("/{mentor_id}/analytics", response_model=ScoreAnalyticsResponse)
+def get_own_analytics(
+    mentor_id: int,
+    period: AnalyticsPeriod = "week",
+    limit: int = Query(default=12, ge=1, le=104),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(_mentor_user),
+):
+    if current_user.id != mentor_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentor scope")
+    return crud.get_score_analytics(db, "mentor", mentor_id, period, limit)
+
+
+@router.get("/{mentor_id}/mentees/{mentee_id}/analytics", response_model=ScoreAnalyticsResponse)
+def get_mentee_analytics(
+    mentor_id: int,
+    mentee_id: int,
+    period: AnalyticsPeriod = "week",
+    limit: int = Query(default=12, ge=1, le=104),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(_mentor_user),
+):
+    if current_user.id != mentor_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden mentor scope")
+    if not crud.is_mentee_assigned(db, mentor_id, mentee_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentee not found")
+    return crud.get_score_analytics(db, "mentee", mentee_id, period, limit)
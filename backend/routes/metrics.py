@@ -0,0 +1,35 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..metrics import CONTENT_TYPE, registry
+from ..models import Role
+from ..security import bearer_scheme, get_current_user, require_roles
+
+router = APIRouter(tags=["metrics"])
+
+# Scrapers send this as a bearer token; without it only admins can read /metrics.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+
+def require_metrics_access(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> None:
+    if (
+        credentials is not None
+        and METRICS_TOKEN is not None
+        and hmac.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode())
+    ):
+        return
+    require_roles(Role.ADMIN)(get_current_user(credentials, db))
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
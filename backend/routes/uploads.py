@@ -0,0 +1,84 @@
+import os
+import re
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from .. import storage
+from ..http_cache import http_date, is_not_modified
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*\.pdf$")
+_CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}\.pdf$")
+
+
+def _resolve(name: str) -> tuple[Path, os.stat_result]:
+    if not _SAFE_NAME.match(name):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    path = storage.upload_dir() / name
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    return path, stat_result
+
+
+def _cache_headers(name: str, stat_result: os.stat_result) -> dict[str, str]:
+    if _CONTENT_ADDRESSED_NAME.match(name):
+        # The name is the SHA-256 of the bytes, so it is a strong validator forever.
+        etag = f'"{name.removesuffix(".pdf")}"'
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+        cache_control = REVALIDATE_CACHE_CONTROL
+    return {
+        "ETag": etag,
+        "Last-Modified": http_date(stat_result.st_mtime),
+        "Cache-Control": cache_control,
+    }
+
+
+def _offload_response(path: Path, name: str, headers: dict[str, str]) -> Response | None:
+    """Hand the byte transfer to a fronting proxy when UPLOAD_SENDFILE_MODE is set."""
+    mode = os.getenv("UPLOAD_SENDFILE_MODE", "").lower()
+    if mode == "x-accel-redirect":
+        prefix = os.getenv("UPLOAD_ACCEL_PREFIX", "/protected-uploads/")
+        headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + name
+    elif mode == "x-sendfile":
+        headers["X-Sendfile"] = str(path.resolve())
+    else:
+        return None
+    return Response(headers=headers, media_type="application/pdf")
+
+
+@router.head("/{name}", include_in_schema=False)
+@router.get("/{name}")
+def download_upload(name: str, request: Request):
+    path, stat_result = _resolve(name)
+    headers = _cache_headers(name, stat_result)
+
+    if is_not_modified(
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+        headers["ETag"],
+        stat_result.st_mtime,
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    offloaded = _offload_response(path, name, headers)
+    if offloaded is not None:
+        return offloaded
+
+    # FileResponse serves single and multipart/byteranges Range requests and honours
+    # If-Range against the ETag set above.
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type="application/pdf",
+        stat_result=stat_result,
+        content_disposition_type="inline",
+    )
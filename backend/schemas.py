@@ -1,11 +1,14 @@
-from datetime import date
-from typing import Annotated
+from datetime import date, datetime
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from .models import Role
 
 Score = Annotated[int, Field(ge=1, le=10)]
+AnalyticsPeriod = Literal["week", "month"]
+SlowQueryOrder = Literal["p95", "max", "total", "count"]
+ResourceTextStatus = Literal["pending", "indexed", "failed"]
 
 
 class LoginRequest(BaseModel):
@@ -34,11 +37,37 @@ class CreateUserRequest(BaseModel):
     password: Annotated[str, Field(min_length=6, max_length=200)]
 
 
+class BulkUserResult(BaseModel):
+    row: int
+    name: str | None = None
+    role: Role | None = None
+    status: Literal["created", "duplicate", "invalid"]
+    id: int | None = None
+    detail: str | None = None
+
+
+class BulkUserImportResponse(BaseModel):
+    created: int
+    duplicates: int
+    invalid: int
+    results: list[BulkUserResult]
+
+
 class MapMentorRequest(BaseModel):
     mentor_id: int
     mentee_id: int
 
 
+class BulkMapMentorRequest(BaseModel):
+    mappings: Annotated[list[MapMentorRequest], Field(min_length=1, max_length=10000)]
+
+
+class BulkMapMentorResponse(BaseModel):
+    created: int
+    moved: int
+    unchanged: int
+
+
 class MapMentorResponse(BaseModel):
     message: str
     mentor_id: int
@@ -59,6 +88,8 @@ class ResourceResponse(BaseModel):
     title: str
     url: str
     uploaded_at: date
+    page_count: int | None = None
+    text_status: ResourceTextStatus = "pending"
 
 
 class SessionRecordCreateRequest(BaseModel):
@@ -81,6 +112,32 @@ class SessionRecordResponse(BaseModel):
     next_steps: str
 
 
+class SessionSearchResult(SessionRecordResponse):
+    # Matched terms are wrapped in <mark></mark>; the rest of the snippet is raw text.
+    snippet: str
+
+
+class ScoreBucketResponse(BaseModel):
+    period_start: date
+    session_count: int
+    average_fluency: float | None
+    average_confidence: float | None
+
+
+class ScoreAnalyticsResponse(BaseModel):
+    scope: Literal["mentee", "mentor"]
+    subject_id: int
+    period: AnalyticsPeriod
+    session_count: int
+    average_fluency: float | None
+    average_confidence: float | None
+    rolling_average_fluency: float | None
+    rolling_average_confidence: float | None
+    fluency_delta: float | None
+    confidence_delta: float | None
+    buckets: list[ScoreBucketResponse]
+
+
 class TodoCreateRequest(BaseModel):
     mentee_id: int
     title: Annotated[str, Field(min_length=1, max_length=200)]
@@ -88,6 +145,20 @@ class TodoCreateRequest(BaseModel):
     due_date: date
 
 
+class BulkTodoCreateRequest(BaseModel):
+    mentee_ids: Annotated[list[int], Field(max_length=5000)] | None = None
+    all_mentees: bool = False
+    title: Annotated[str, Field(min_length=1, max_length=200)]
+    description: Annotated[str, Field(min_length=1, max_length=2000)]
+    due_date: date
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "BulkTodoCreateRequest":
+        if self.all_mentees == bool(self.mentee_ids):
+            raise ValueError("Provide either a non-empty mentee_ids list or all_mentees=true")
+        return self
+
+
 class TodoResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -115,6 +186,37 @@ class MeetLinkResponse(BaseModel):
     meet_link: str
 
 
+class SlowQueryResponse(BaseModel):
+    fingerprint: str
+    statement: str
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    last_route: str | None
+    last_seen: datetime | None
+    plan: list[str]
+
+
+class MentorDashboardMentee(BaseModel):
+    id: int
+    name: str
+    open_todos: int
+    overdue_todos: int
+    last_session_date: date | None
+    latest_fluency_score: int | None
+    latest_confidence_score: int | None
+
+
+class MentorDashboardResponse(BaseModel):
+    mentor_id: int
+    mentor_name: str
+    meet_link: str
+    mentees: list[MentorDashboardMentee]
+
+
 class MentorForMenteeResponse(BaseModel):
     mentor_name: str
     meet_link: str
@@ -3,16 +3,13 @@ from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from .database import get_db
 from .models import Role, User
+from .passwords import hash_password, is_hashed_password, verify_password  # noqa: F401
+from .principals import Principal, principal_cache
 
-# Use pbkdf2_sha256 by default to avoid runtime issues with certain bcrypt builds.
-# Keep bcrypt in the context for backward compatibility if old hashes already exist.
-pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
 bearer_scheme = HTTPBearer(auto_error=False)
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-change-me")
@@ -20,24 +17,10 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password, scheme="pbkdf2_sha256")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def is_hashed_password(password: str) -> bool:
-    return (
-        password.startswith("$2a$")
-        or password.startswith("$2b$")
-        or password.startswith("$2y$")
-        or password.startswith("$pbkdf2-sha256$")
-    )
-
-
 def create_access_token(user: User) -> str:
+    # jose (with cryptography behind it) is imported on first use, not at startup.
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
         "sub": str(user.id),
@@ -47,14 +30,9 @@ def create_access_token(user: User) -> str:
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    if not credentials or credentials.scheme.lower() != "bearer":
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+def principal_from_token(token: str, db: Session) -> Principal:
+    from jose import JWTError, jwt
 
-    token = credentials.credentials
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         subject = payload.get("sub")
@@ -64,14 +42,30 @@ def get_current_user(
     except (JWTError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    version = principal_cache.version(user_id)
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(principal, version)
+    return principal
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    if not credentials or credentials.scheme.lower() != "bearer":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return principal_from_token(credentials.credentials, db)
 
 
 def require_roles(*allowed_roles: Role):
-    def role_dependency(current_user: User = Depends(get_current_user)) -> User:
+    def role_dependency(current_user: Principal = Depends(get_current_user)) -> Principal:
         if current_user.role not in allowed_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
         return current_user
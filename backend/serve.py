@@ -0,0 +1,214 @@
+"""Production entry point: a pre-forking supervisor for several uvicorn workers.
+
+    python -m backend.serve --workers 4 --host 0.0.0.0 --port 8000
+
+The parent process divides the server-wide budgets in ``SERVER_BUDGETS`` between the
+workers, imports the app once, migrates and seeds under the init lock (unless
+``APP_INIT=skip``), binds the listening socket and forks the workers, which inherit
+the loaded app and start with ``APP_INIT=skip``. Workers that die are replaced.
+
+SIGTERM or SIGINT drains the server: workers stop accepting connections, give
+in-flight requests up to ``--graceful-timeout`` seconds, run the app's shutdown
+handlers and exit; any still running after that are killed. Without ``os.fork``
+(Windows) it initializes in the parent and falls back to uvicorn's own workers,
+which import the app themselves and share no cache versions or push events.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+import uvicorn
+
+# uvicorn configures this logger, so supervisor messages show up next to its own.
+logger = logging.getLogger("uvicorn.error")
+
+# Settings that describe the whole server and are divided evenly between workers,
+# with the default total used when the variable is unset. 0 keeps its meaning.
+SERVER_BUDGETS: dict[str, int] = {
+    "DB_POOL_SIZE": 10,
+    "DB_MAX_OVERFLOW": 20,
+    "PASSWORD_HASH_WORKERS": os.cpu_count() or 1,
+    "RESOURCE_INDEX_WORKERS": min(2, os.cpu_count() or 1),
+}
+EVENT_RELAY_MAX_PENDING = int(os.getenv("EVENTS_RELAY_MAX_PENDING", "10000"))
+RESTART_DELAY_SECONDS = 1.0
+
+
+def worker_budgets(workers: int, environ: dict[str, str] | None = None) -> dict[str, str]:
+    """Per-worker values for ``SERVER_BUDGETS``: an even share of each total, at least 1."""
+    environ = os.environ if environ is None else environ
+    budgets = {}
+    for name, default in SERVER_BUDGETS.items():
+        total = int(environ.get(name, default))
+        budgets[name] = str(max(1, total // workers) if total > 0 else 0)
+    return budgets
+
+
+def prepare_environment(workers: int) -> str:
+    """Apply per-worker budgets before the app is imported; returns the requested APP_INIT."""
+    os.environ.update(worker_budgets(workers))
+    app_init = os.getenv("APP_INIT", "auto")
+    # The parent does the one-time work below; workers must not repeat it.
+    os.environ["APP_INIT"] = "skip"
+    return app_init
+
+
+def initialize(app_init: str) -> None:
+    from .bootstrap import initialize as initialize_database
+    from .database import engine
+    from .hashing import hashing_executor
+
+    if app_init == "auto" and initialize_database(engine):
+        logger.info("Database migrated and default users seeded")
+    # Forked workers must not share pooled connections or the hashing pool's threads.
+    hashing_executor.shutdown()
+    engine.dispose()
+
+
+class Supervisor:
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        self._children: dict[int, tuple[int, float]] = {}
+        self._stopping = threading.Event()
+        self._socket: socket.socket | None = None
+        self._inboxes: list = []
+
+    def run(self) -> None:
+        self.config.load()
+        self._socket = self.config.bind_socket()
+        context = multiprocessing.get_context("fork")
+        self._inboxes = [context.Queue(EVENT_RELAY_MAX_PENDING) for _ in range(self.workers)]
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self._handle_exit)
+        logger.info("Starting %d workers (supervisor pid %d)", self.workers, os.getpid())
+        for slot in range(self.workers):
+            self._spawn(slot)
+        while not self._stopping.is_set():
+            self._reap()
+            self._stopping.wait(0.5)
+        self._drain()
+
+    def _handle_exit(self, sig: int, frame) -> None:
+        self._stopping.set()
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker(slot)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        self._children[pid] = (slot, time.monotonic())
+
+    def _run_worker(self, slot: int) -> None:
+        from .events import event_hub
+        from .slow_queries import slow_query_log
+
+        slow_query_log.set_worker(str(slot))
+        server = uvicorn.Server(self.config)
+        # Until uvicorn installs its own handlers, a stop request still means "drain".
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, server.handle_exit)
+        event_hub.connect_peers(
+            self._inboxes[slot],
+            [inbox for index, inbox in enumerate(self._inboxes) if index != slot],
+        )
+        server.run(sockets=[self._socket])
+
+    def _reap(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid not in self._children:
+                continue
+            slot, started = self._children.pop(pid)
+            if self._stopping.is_set():
+                continue
+            logger.warning("Worker %d exited with status %d; starting a replacement", pid, status)
+            if time.monotonic() - started < RESTART_DELAY_SECONDS:
+                # Do not spin if workers die during startup (e.g. a bad config).
+                time.sleep(RESTART_DELAY_SECONDS)
+            self._spawn(slot)
+
+    def _drain(self) -> None:
+        logger.info("Draining %d workers", len(self._children))
+        for pid in list(self._children):
+            self._signal(pid, signal.SIGTERM)
+        # Past the request drain, leave time for shutdown handlers (job workers, pools).
+        deadline = time.monotonic() + self.config.timeout_graceful_shutdown + 10
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self._children):
+            logger.warning("Worker %d did not stop in time; killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._children.clear()
+        if self._socket is not None:
+            self._socket.close()
+
+    @staticmethod
+    def _signal(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.serve", description="Run the API with several workers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))),
+        help="worker processes (default: WEB_CONCURRENCY or the CPU count)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30")),
+        help="seconds in-flight requests get to finish on shutdown",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    app_init = prepare_environment(args.workers)
+    initialize(app_init)
+    options = dict(
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    if not hasattr(os, "fork"):
+        # Spawned workers cannot be told their slot; name their slow-query logs by pid.
+        os.environ.setdefault("SLOW_QUERY_LOG_WORKER", "pid")
+        uvicorn.run("backend.main:app", workers=args.workers, **options)
+        return
+
+    from .main import app
+
+    Supervisor(uvicorn.Config(app, **options), args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Version counters in anonymous shared memory, visible to every forked worker.
+
+``python -m backend.serve`` imports the app before forking its workers, so they all
+inherit the same counters: a bump in one worker is seen by the others on their next
+read, which is what keeps per-process caches coherent. Keys are hashed into a fixed
+number of slots; two keys sharing a slot only cost an occasional extra cache miss.
+Processes that do not share a parent (e.g. ``uvicorn --workers``, which spawns) each
+get private counters.
+"""
+
+import multiprocessing
+import zlib
+from typing import Hashable
+
+
+class SharedCounters:
+    def __init__(self, slots: int = 4096) -> None:
+        self.slots = slots
+        self._values = multiprocessing.RawArray("Q", slots)
+        self._lock = multiprocessing.Lock()
+
+    def _slot(self, key: Hashable) -> int:
+        # crc32 rather than hash(): str hashes are salted per interpreter.
+        return zlib.crc32(repr(key).encode()) % self.slots
+
+    def get(self, key: Hashable) -> int:
+        # Aligned 64-bit loads cannot tear, so readers skip the lock.
+        return self._values[self._slot(key)]
+
+    def bump(self, *keys: Hashable) -> None:
+        slots = {self._slot(key) for key in keys}
+        with self._lock:
+            for slot in slots:
+                self._values[slot] += 1
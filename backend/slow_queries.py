@@ -0,0 +1,280 @@
+"""Slow-query log.
+
+Statements slower than the engine's threshold are grouped by fingerprint (the SQL
+with literals and expanded ``IN``/``VALUES`` lists collapsed) and their query plan is
+captured. Each one is also written as a JSON line to a size-rotated log file. Parameter
+values never leave the process; only their types (and string lengths) are recorded.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))+")
+_REPEATED_GROUPS = re.compile(r"(\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def normalize_statement(statement: str) -> str:
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("?...", normalized)
+    return _REPEATED_GROUPS.sub(r"\1, ...", normalized)
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def redact_parameters(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    if parameters is None:
+        return None
+    if isinstance(parameters, (str, bytes)):
+        return f"<{type(parameters).__name__}:{len(parameters)}>"
+    return f"<{type(parameters).__name__}>"
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(1, math.ceil(fraction * len(sorted_values))) - 1]
+
+
+@dataclass
+class _Fingerprint:
+    statement: str
+    durations: deque = field(default_factory=lambda: deque(maxlen=1000))
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_route: str | None = None
+    last_seen: datetime | None = None
+    plan: list[str] = field(default_factory=list)
+    plan_captured_at: float = 0.0
+
+
+class SlowQueryLog:
+    """Bounded per-fingerprint statistics plus the rotating JSON-lines file."""
+
+    def __init__(
+        self,
+        max_fingerprints: int,
+        plan_ttl_seconds: float,
+        log_path: str | None,
+        log_max_bytes: int,
+        log_backups: int,
+        worker: str | None = None,
+    ) -> None:
+        self.max_fingerprints = max_fingerprints
+        self.plan_ttl_seconds = plan_ttl_seconds
+        self.log_path = log_path
+        self.log_max_bytes = log_max_bytes
+        self.log_backups = log_backups
+        self.worker = worker
+        self._entries: OrderedDict[str, _Fingerprint] = OrderedDict()
+        self._lock = threading.Lock()
+        self._file_logger: logging.Logger | None = None
+        self._writer_pid: int | None = None
+
+    def set_worker(self, worker: str | None) -> None:
+        """Write to this worker's own file from now on (see ``file_path``)."""
+        with self._lock:
+            self.worker = worker
+            self._file_logger = None
+
+    def file_path(self) -> str | None:
+        """``log_path``, or ``<stem>-<worker><suffix>`` when this process is one of several workers.
+
+        RotatingFileHandler renames the file when it rotates, which is only safe with a
+        single writer, so every worker process keeps its own file. ``worker="pid"``
+        names the file after the process id.
+        """
+        if not self.log_path or self.worker is None:
+            return self.log_path
+        worker = str(os.getpid()) if self.worker == "pid" else self.worker
+        path = Path(self.log_path)
+        return str(path.with_name(f"{path.stem}-{worker}{path.suffix}"))
+
+    def _writer(self) -> logging.Logger | None:
+        if not self.log_path:
+            return None
+        # A forked child must not keep writing through a handler opened by its parent.
+        if self._file_logger is None or self._writer_pid != os.getpid():
+            with self._lock:
+                if self._file_logger is None or self._writer_pid != os.getpid():
+                    writer = logging.getLogger(f"{__name__}.file")
+                    writer.propagate = False
+                    writer.setLevel(logging.INFO)
+                    handler = RotatingFileHandler(
+                        self.file_path(), maxBytes=self.log_max_bytes, backupCount=self.log_backups, encoding="utf-8"
+                    )
+                    handler.setFormatter(logging.Formatter("%(message)s"))
+                    for previous in writer.handlers:
+                        previous.close()
+                    writer.handlers = [handler]
+                    self._file_logger = writer
+                    self._writer_pid = os.getpid()
+        return self._file_logger
+
+    def needs_plan(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is None or time.monotonic() - entry.plan_captured_at > self.plan_ttl_seconds
+
+    def record(
+        self,
+        key: str,
+        normalized: str,
+        seconds: float,
+        statement: str,
+        parameters: Any,
+        route: str | None,
+        plan: list[str] | None,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Fingerprint(statement=normalized)
+                while len(self._entries) > self.max_fingerprints:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            entry.durations.append(seconds)
+            entry.count += 1
+            entry.total_seconds += seconds
+            entry.max_seconds = max(entry.max_seconds, seconds)
+            entry.last_route = route
+            entry.last_seen = now
+            if plan is not None:
+                entry.plan = plan
+                entry.plan_captured_at = time.monotonic()
+            plan = entry.plan
+
+        writer = self._writer()
+        if writer is not None:
+            writer.info(
+                json.dumps(
+                    {
+                        "ts": now.isoformat(),
+                        "fingerprint": key,
+                        "duration_ms": round(seconds * 1000, 3),
+                        "route": route,
+                        "statement": statement,
+                        "parameters": redact_parameters(parameters),
+                        "plan": plan,
+                    }
+                )
+            )
+
+    def top(self, limit: int, order_by: str = "p95") -> list[dict[str, Any]]:
+        with self._lock:
+            snapshot = [(key, entry, sorted(entry.durations)) for key, entry in self._entries.items()]
+        rows = []
+        for key, entry, durations in snapshot:
+            rows.append(
+                {
+                    "fingerprint": key,
+                    "statement": entry.statement,
+                    "count": entry.count,
+                    "total_ms": round(entry.total_seconds * 1000, 3),
+                    "p50_ms": round(_percentile(durations, 0.50) * 1000, 3),
+                    "p95_ms": round(_percentile(durations, 0.95) * 1000, 3),
+                    "p99_ms": round(_percentile(durations, 0.99) * 1000, 3),
+                    "max_ms": round(entry.max_seconds * 1000, 3),
+                    "last_route": entry.last_route,
+                    "last_seen": entry.last_seen,
+                    "plan": entry.plan,
+                }
+            )
+        sort_key = {"p95": "p95_ms", "max": "max_ms", "total": "total_ms", "count": "count"}[order_by]
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return rows[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _explain(connection, statement: str, parameters: Any, executemany: bool) -> list[str]:
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return []
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    dialect = connection.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    # A separate DBAPI cursor keeps the explain out of the engine events and leaves
+    # the statement's own result untouched.
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    except Exception:
+        logger.debug("Could not explain slow statement", exc_info=True)
+        return []
+    finally:
+        cursor.close()
+    if dialect == "sqlite":
+        return [row[-1] for row in rows]
+    return [str(row[0]) for row in rows]
+
+
+def install(engine: Engine, threshold_ms: float, log: "SlowQueryLog | None" = None) -> None:
+    """Record statements on ``engine`` slower than ``threshold_ms`` into ``log``."""
+    target = log or slow_query_log
+    threshold = threshold_ms / 1000
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < threshold:
+            return
+        normalized = normalize_statement(statement)
+        key = fingerprint(normalized)
+        plan = _explain(conn, statement, parameters, executemany) if target.needs_plan(key) else None
+        target.record(key, normalized, elapsed, statement, parameters, current_route(), plan)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+slow_query_log = SlowQueryLog(
+    max_fingerprints=int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "500")),
+    plan_ttl_seconds=float(os.getenv("SLOW_QUERY_PLAN_TTL_SECONDS", "300")),
+    log_path=os.getenv("SLOW_QUERY_LOG_PATH", "slow_queries.log") or None,
+    log_max_bytes=int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+    log_backups=int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5")),
+    worker=os.getenv("SLOW_QUERY_LOG_WORKER") or None,
+)
@@ -0,0 +1,126 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Coroutine
+from uuid import uuid4
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from starlette.types import Message
+
+PDF_MAGIC = b"%PDF"
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+DEFAULT_UPLOAD_DIR = Path(__file__).resolve().parent / "uploads"
+
+
+@dataclass
+class StoredUpload:
+    name: str
+    sha256: str
+    size: int
+
+
+@lru_cache(maxsize=8)
+def _ensure_dir(path: str) -> Path:
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def upload_dir() -> Path:
+    return _ensure_dir(os.getenv("UPLOAD_DIR", str(DEFAULT_UPLOAD_DIR)))
+
+
+def path_for_url(url: str) -> Path | None:
+    """Map a resource URL served by the uploads router back to its file, if it is one."""
+    name = url.removeprefix("/uploads/")
+    if name == url or not name or "/" in name or name.startswith("."):
+        return None
+    return upload_dir() / name
+
+
+def max_upload_bytes() -> int:
+    return int(os.getenv("MAX_UPLOAD_BYTES", str(DEFAULT_MAX_UPLOAD_BYTES)))
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"PDF exceeds the {limit} byte upload limit",
+    )
+
+
+class UploadLimitRoute(APIRoute):
+    """Route class that stops receiving a request body once it exceeds the upload cap.
+
+    Starlette spools the whole multipart body to disk before the endpoint runs, so the
+    check in ``save_pdf`` alone would only fire after an oversized upload was written.
+    A declared ``Content-Length`` over the cap is refused before anything is read.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            limit = max_upload_bytes()
+            # Room for the multipart boundaries and the form fields next to the file.
+            body_limit = limit + MULTIPART_OVERHEAD_BYTES
+            declared = request.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > body_limit:
+                raise _too_large(limit)
+
+            received = 0
+
+            async def receive() -> Message:
+                nonlocal received
+                message = await request.receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > body_limit:
+                        raise _too_large(limit)
+                return message
+
+            return await handler(Request(request.scope, receive))
+
+        return limited_handler
+
+
+def save_pdf(source: BinaryIO) -> StoredUpload:
+    """Stream ``source`` into the upload directory under its SHA-256 name.
+
+    Blocking; call it from a worker thread. The data goes to a temporary file in the
+    same directory and is renamed into place only once it is complete, so readers
+    never observe a partial blob. Identical content reuses the existing file.
+    """
+    directory = upload_dir()
+    limit = max_upload_bytes()
+    digest = hashlib.sha256()
+    size = 0
+    temp_path = directory / f".upload-{uuid4().hex}.tmp"
+    try:
+        with temp_path.open("wb") as target:
+            while chunk := source.read(CHUNK_SIZE):
+                if size == 0 and not chunk.startswith(PDF_MAGIC):
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is not a valid PDF")
+                size += len(chunk)
+                if size > limit:
+                    raise _too_large(limit)
+                digest.update(chunk)
+                target.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is not a valid PDF")
+
+        sha256 = digest.hexdigest()
+        name = f"{sha256}.pdf"
+        dest_path = directory / name
+        if dest_path.exists():
+            temp_path.unlink()
+        else:
+            os.replace(temp_path, dest_path)
+        return StoredUpload(name=name, sha256=sha256, size=size)
+    finally:
+        temp_path.unlink(missing_ok=True)
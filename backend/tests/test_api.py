@@ -1,15 +1,36 @@
+import asyncio
+import csv
+import json
 import os
+import threading
+from contextlib import contextmanager
+from datetime import date
 from pathlib import Path
+from types import SimpleNamespace
 
-from fastapi import FastAPI
+import pytest
+from fastapi import FastAPI, HTTPException, WebSocketDisconnect
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from pydantic import TypeAdapter
+from sqlalchemy import event, text
 from sqlalchemy.orm import sessionmaker
 
-from backend import crud
-from backend.database import Base, get_db
-from backend.models import Role, User
-from backend.routes import admin, auth, mentee, mentor
+from backend import crud, migrations, slow_queries
+from backend.database import build_engine, get_db, run_maintenance
+from backend.events import RESYNC_EVENT, EventHub
+from backend.hashing import hashing_executor
+from backend.jobs import JobWorkers
+from backend.metrics import MetricsMiddleware, instrument_engine
+from backend.http_cache import response_cache
+from backend.models import Role, SessionRecord, Todo, User
+from backend.pagination import DEFAULT_PAGE_SIZE, encode_cursor
+from backend.principals import principal_cache
+from backend.resource_index import resource_indexer
+from backend.routes import admin, auth, events, mentee, mentor, metrics, uploads
+from backend.schemas import MentorMenteeMappingResponse, SessionRecordResponse, SessionSearchResult, UserResponse
+
+
+METRICS_TOKEN = "scrape-token"
 
 
 def _auth_headers(client: TestClient, name: str, role: str, password: str) -> dict[str, str]:
@@ -22,24 +43,70 @@ def _auth_headers(client: TestClient, name: str, role: str, password: str) -> di
     return {"Authorization": f"Bearer {token}"}
 
 
+@contextmanager
+def _count_queries(engine):
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _pdf_with_text(*pages: str) -> bytes:
+    """A minimal valid PDF with one line of Helvetica text per page."""
+    count = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(count)) + b"] /Count %d >>" % count,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, line in enumerate(pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (" + line.encode() + b") Tj ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (5 + 2 * index)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, content in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n" % number + content + b"\nendobj\n"
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return body
+
+
 def _build_test_context(tmp_path: Path):
     db_path = tmp_path / "test.db"
     upload_dir = tmp_path / "uploads"
     upload_dir.mkdir(parents=True, exist_ok=True)
     os.environ["UPLOAD_DIR"] = str(upload_dir)
+    metrics.METRICS_TOKEN = METRICS_TOKEN
+    principal_cache.clear()
+    response_cache.clear()
 
-    engine = create_engine(
-        f"sqlite:///{db_path}",
-        connect_args={"check_same_thread": False},
-    )
+    engine = build_engine(f"sqlite:///{db_path}")
     testing_session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+    instrument_engine(engine)
 
     app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
     app.include_router(auth.router)
     app.include_router(admin.router)
     app.include_router(mentor.router)
     app.include_router(mentee.router)
+    app.include_router(uploads.router)
+    app.include_router(events.router)
+    app.include_router(metrics.router)
 
     def override_get_db():
         db = testing_session()
@@ -62,6 +129,7 @@ def _build_test_context(tmp_path: Path):
     return {
         "client": TestClient(app),
         "session": testing_session,
+        "engine": engine,
         "upload_dir": upload_dir,
     }
 
@@ -200,3 +268,912 @@ def test_upload_and_list_resources(tmp_path: Path):
     resources = client.get("/mentee/resources", headers=mentee_headers)
     assert resources.status_code == 200
     assert resources.json()[0]["title"] == "English Guide"
+
+
+def _seed_mapped_mentees(ctx, count: int) -> None:
+    db = ctx["session"]()
+    try:
+        mentor_user = db.query(User).filter(User.role == Role.MENTOR).first()
+        for index in range(count):
+            mentee_user = User(name=f"Seed Mentee {index}", role=Role.MENTEE, password="unused")
+            db.add(mentee_user)
+            db.flush()
+            crud.map_mentor_to_mentee(db, mentor_user.id, mentee_user.id)
+            db.add(
+                SessionRecord(
+                    mentor_id=mentor_user.id,
+                    mentee_id=mentee_user.id,
+                    date=date(2026, 1, 1 + index % 28),
+                    fluency_score=5,
+                    confidence_score=5,
+                    notes="Seeded",
+                    next_steps="Seeded",
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_admin_listings_use_constant_query_count(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    def listing_query_counts() -> dict[str, int]:
+        counts = {}
+        for path in ("/admin/mappings", "/admin/sessions"):
+            with _count_queries(ctx["engine"]) as statements:
+                response = client.get(path, headers=admin_headers)
+            assert response.status_code == 200
+            counts[path] = len(statements)
+        return counts
+
+    listing_query_counts()
+    _seed_mapped_mentees(ctx, 1)
+    small = listing_query_counts()
+    _seed_mapped_mentees(ctx, 25)
+    large = listing_query_counts()
+
+    assert large == small
+    sessions = client.get("/admin/sessions", headers=admin_headers).json()
+    assert len(sessions) == 26
+    assert all(item["mentor_name"] == "Mentor" for item in sessions)
+
+
+def test_fast_list_serialization_matches_response_models(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+    _seed_mapped_mentees(ctx, 3)
+    mentor_id = client.get("/admin/mentors", headers=admin_headers).json()[0]["id"]
+
+    listings = [
+        ("/admin/sessions", admin_headers, SessionRecordResponse),
+        ("/admin/mappings", admin_headers, MentorMenteeMappingResponse),
+        ("/admin/mentees", admin_headers, UserResponse),
+        (f"/mentor/{mentor_id}/mentees", mentor_headers, UserResponse),
+    ]
+    for path, headers, schema in listings:
+        response = client.get(path, params={"limit": 2}, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["X-Next-Cursor"]
+        body = response.json()
+        assert len(body) == 2
+        adapter = TypeAdapter(list[schema])
+        assert body == adapter.dump_python(adapter.validate_python(body), mode="json")
+        assert all(list(item) == list(schema.model_fields) for item in body)
+
+
+def test_session_listing_cursor_pagination(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    _seed_mapped_mentees(ctx, 30)
+
+    everything = client.get("/admin/sessions", headers=admin_headers).json()
+    collected = []
+    cursor = None
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/admin/sessions", params=params, headers=admin_headers)
+        assert response.status_code == 200
+        assert len(response.json()) <= 4
+        collected.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert [item["id"] for item in collected] == [item["id"] for item in everything]
+    assert len(collected) == 30
+
+    invalid = client.get("/admin/sessions", params={"limit": 3, "cursor": "not-a-cursor"}, headers=admin_headers)
+    assert invalid.status_code == 400
+
+
+def test_cursors_with_values_of_the_wrong_type_are_rejected(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    crafted = [
+        ("/admin/sessions", ["2026-01-01", [1]]),
+        ("/admin/sessions", ["2026-01-01", {"a": 1}]),
+        ("/admin/sessions", ["2026-01-01", True]),
+        ("/admin/sessions", [20260101, 1]),
+        ("/admin/mentees", [["x"], 1]),
+        ("/admin/mentees", ["x", "1"]),
+        ("/admin/mappings", [None]),
+        ("/admin/mappings", [1.5]),
+    ]
+    for path, values in crafted:
+        response = client.get(path, params={"cursor": encode_cursor(values)}, headers=admin_headers)
+        assert response.status_code == 400, (path, values)
+        assert response.json() == {"detail": "Invalid cursor"}
+
+    assert client.get("/admin/mappings", params={"cursor": encode_cursor([0])}, headers=admin_headers).status_code == 200
+
+
+def test_listings_without_a_limit_serve_a_bounded_first_page(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    _seed_mapped_mentees(ctx, DEFAULT_PAGE_SIZE + 5)
+
+    for path in ("/admin/sessions", "/admin/mentees", "/admin/mappings"):
+        first = client.get(path, headers=admin_headers)
+        assert len(first.json()) == DEFAULT_PAGE_SIZE
+        rest = client.get(path, params={"cursor": first.headers["X-Next-Cursor"]}, headers=admin_headers)
+        assert "X-Next-Cursor" not in rest.headers
+        assert len(first.json()) + len(rest.json()) >= DEFAULT_PAGE_SIZE + 5
+
+
+def test_uploaded_pdfs_are_indexed_in_the_background_and_searchable(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    mentee_headers = _auth_headers(client, "Mentee", "mentee", "mentee123")
+
+    def upload(title: str, content: bytes):
+        response = client.post(
+            "/admin/resources",
+            data={"title": title},
+            files={"file": ("guide.pdf", content, "application/pdf")},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["text_status"] == "pending"
+        return response.json()["id"]
+
+    body_match = upload("Speaking guide", _pdf_with_text("Minimal pairs for vowels", "Intonation drills"))
+    title_match = upload("Intonation basics", _pdf_with_text("Rising and falling tones"))
+    broken = upload("Broken", b"%PDF-1.4 truncated")
+    failed_before = resource_indexer.stats()["failed"]
+    assert JobWorkers(ctx["engine"], concurrency=2).drain() == 3
+    assert resource_indexer.stats()["failed"] == failed_before + 1
+
+    listing = {item["id"]: item for item in client.get("/admin/resources", headers=admin_headers).json()}
+    assert (listing[body_match]["text_status"], listing[body_match]["page_count"]) == ("indexed", 2)
+    assert (listing[title_match]["text_status"], listing[title_match]["page_count"]) == ("indexed", 1)
+    assert (listing[broken]["text_status"], listing[broken]["page_count"]) == ("failed", None)
+
+    found = client.get("/mentee/resources", params={"q": "intonation"}, headers=mentee_headers)
+    assert found.status_code == 200
+    assert [item["id"] for item in found.json()] == [title_match, body_match]
+    vowels = client.get("/admin/resources", params={"q": "vowel"}, headers=admin_headers).json()
+    assert [item["id"] for item in vowels] == [body_match]
+
+    db = ctx["session"]()
+    try:
+        assert [row.id for row in crud.resources_to_index(db)] == [broken]
+    finally:
+        db.close()
+
+
+def test_session_search_is_ranked_paginated_and_scoped_to_the_mentor(tmp_path: Path, monkeypatch):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    db = ctx["session"]()
+    try:
+        mentor_user = db.query(User).filter(User.name == "Mentor").one()
+        mentee_user = db.query(User).filter(User.name == "Mentee").one()
+        other_mentor = crud.create_user(db, "Other Mentor", Role.MENTOR, "other123")
+        other_mentee = crud.create_user(db, "Other Mentee", Role.MENTEE, "other123")
+        crud.map_mentor_to_mentee(db, other_mentor.id, other_mentee.id)
+        notes = [
+            ("Pronunciation drills, pronunciation of vowels", "Keep going"),
+            ("Grammar review", "Record pronunciations daily"),
+            ("Small talk", "Listening practice"),
+        ]
+        own_ids = [
+            crud.create_session_record(db, mentor_user.id, mentee_user.id, date(2026, 1, day), 5, 5, note, step).id
+            for day, (note, step) in enumerate(notes, start=1)
+        ]
+        other_id = crud.create_session_record(
+            db, other_mentor.id, other_mentee.id, date(2026, 1, 9), 5, 5, "Pronunciation basics", "Read"
+        ).id
+        mentor_id, other_mentor_id = mentor_user.id, other_mentor.id
+    finally:
+        db.close()
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+
+    found = client.get("/admin/sessions/search", params={"q": "pronunciation"}, headers=admin_headers)
+    assert found.status_code == 200
+    assert {item["id"] for item in found.json()} == {own_ids[0], own_ids[1], other_id}
+    assert found.json()[0]["id"] == own_ids[0]
+    assert "<mark>Pronunciation</mark>" in found.json()[0]["snippet"]
+    assert all(list(item) == list(SessionSearchResult.model_fields) for item in found.json())
+
+    collected, cursor = [], None
+    while True:
+        params = {"q": "pronunciation", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/admin/sessions/search", params=params, headers=admin_headers)
+        collected.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert collected == [item["id"] for item in found.json()]
+
+    own = client.get(f"/mentor/{mentor_id}/sessions/search", params={"q": "pronun*"}, headers=mentor_headers)
+    assert own.status_code == 200
+    assert {item["id"] for item in own.json()} == {own_ids[0], own_ids[1]}
+    forbidden = client.get(f"/mentor/{other_mentor_id}/sessions/search", params={"q": "x"}, headers=mentor_headers)
+    assert forbidden.status_code == 403
+    assert client.get("/admin/sessions/search", params={"q": '"*'}, headers=admin_headers).status_code == 400
+    assert "X-Results-Truncated" not in found.headers
+
+    # Only the newest matches are ranked; the response says when older ones were left out.
+    monkeypatch.setattr(crud, "SESSION_SEARCH_WINDOW", 2)
+    windowed = client.get("/admin/sessions/search", params={"q": "pronunciation"}, headers=admin_headers)
+    assert {item["id"] for item in windowed.json()} == {own_ids[1], other_id}
+    assert windowed.headers["X-Results-Truncated"] == "true"
+    scoped = client.get(f"/mentor/{mentor_id}/sessions/search", params={"q": "pronun*"}, headers=mentor_headers)
+    assert len(scoped.json()) == 2
+    assert "X-Results-Truncated" not in scoped.headers
+    monkeypatch.undo()
+
+    db = ctx["session"]()
+    try:
+        db.get(SessionRecord, own_ids[2]).notes = "Pronunciation of th"
+        db.delete(db.get(SessionRecord, own_ids[0]))
+        db.commit()
+    finally:
+        db.close()
+    updated = client.get(f"/mentor/{mentor_id}/sessions/search", params={"q": "pronunciation"}, headers=mentor_headers)
+    assert {item["id"] for item in updated.json()} == {own_ids[1], own_ids[2]}
+
+
+def test_resource_upload_is_content_addressed_and_validated(tmp_path: Path, monkeypatch):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    def upload(content: bytes):
+        return client.post(
+            "/admin/resources",
+            data={"title": "Guide"},
+            files={"file": ("guide.pdf", content, "application/pdf")},
+            headers=admin_headers,
+        )
+
+    first = upload(b"%PDF-1.4 same bytes")
+    second = upload(b"%PDF-1.4 same bytes")
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.json()["url"] == second.json()["url"]
+    assert len(list(ctx["upload_dir"].iterdir())) == 1
+
+    assert upload(b"MZ not a pdf").status_code == 400
+
+    untitled = client.post(
+        "/admin/resources",
+        data={"title": "   "},
+        files={"file": ("guide.pdf", b"%PDF-1.4 other bytes", "application/pdf")},
+        headers=admin_headers,
+    )
+    assert untitled.status_code == 400
+    assert len(list(ctx["upload_dir"].iterdir())) == 1
+
+    monkeypatch.setenv("MAX_UPLOAD_BYTES", "16")
+    assert upload(b"%PDF-1.4 " + b"x" * 64).status_code == 413
+    assert len(list(ctx["upload_dir"].iterdir())) == 1
+
+
+def test_oversized_upload_bodies_are_refused_while_receiving(tmp_path: Path, monkeypatch):
+    from backend import storage
+
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    monkeypatch.setenv("MAX_UPLOAD_BYTES", "1024")
+    monkeypatch.setattr(storage, "MULTIPART_OVERHEAD_BYTES", 1024)
+    boundary = "upload-limit"
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="title"\r\n\r\nGuide\r\n'
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="guide.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + b"%PDF-1.4 " + b"x" * 8192 + f"\r\n--{boundary}--\r\n".encode()
+    headers = {**admin_headers, "Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+    declared = client.post("/admin/resources", content=body, headers=headers)
+    assert declared.status_code == 413
+
+    # Without a Content-Length the cap is enforced on the bytes actually received.
+    received_chunks = []
+
+    def chunked():
+        for start in range(0, len(body), 512):
+            received_chunks.append(start)
+            yield body[start : start + 512]
+
+    streamed = client.post("/admin/resources", content=chunked(), headers=headers)
+    assert streamed.status_code == 413
+    assert not ctx["upload_dir"].exists() or not any(ctx["upload_dir"].iterdir())
+    assert client.get("/admin/resources", headers=admin_headers).json() == []
+
+
+def test_upload_download_supports_conditional_and_range_requests(tmp_path: Path, monkeypatch):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    content = b"%PDF-1.4 " + bytes(range(48, 122))
+
+    url = client.post(
+        "/admin/resources",
+        data={"title": "Guide"},
+        files={"file": ("guide.pdf", content, "application/pdf")},
+        headers=admin_headers,
+    ).json()["url"]
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == content
+    assert "immutable" in full.headers["cache-control"]
+    etag = full.headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": full.headers["last-modified"]}).status_code == 304
+
+    partial = client.get(url, headers={"Range": "bytes=0-3"})
+    assert partial.status_code == 206
+    assert partial.content == b"%PDF"
+
+    multi = client.get(url, headers={"Range": "bytes=0-3, 10-12"})
+    assert multi.status_code == 206
+    assert multi.headers["content-type"].startswith("multipart/byteranges")
+
+    assert client.get("/uploads/..%2Ftest.db").status_code == 404
+
+    monkeypatch.setenv("UPLOAD_SENDFILE_MODE", "x-accel-redirect")
+    offloaded = client.get(url)
+    assert offloaded.headers["x-accel-redirect"] == "/protected-uploads/" + url.rsplit("/", 1)[1]
+    assert offloaded.content == b""
+
+
+def test_authenticated_principal_is_cached_until_invalidated(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+
+    def meet_link_queries() -> int:
+        with _count_queries(ctx["engine"]) as statements:
+            assert client.get("/mentor/2/meet-link", headers=mentor_headers).status_code == 200
+        return len(statements)
+
+    cold = meet_link_queries()
+    warm = meet_link_queries()
+    assert warm == cold - 1
+
+    updated = client.put("/mentor/2/meet-link", json={"meet_link": "https://meet.example.com/x"}, headers=mentor_headers)
+    assert updated.status_code == 200
+    assert principal_cache.get(2) is None
+    assert meet_link_queries() == cold
+
+
+def test_login_fails_fast_when_hashing_queue_is_full(tmp_path: Path, monkeypatch):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+
+    monkeypatch.setattr(hashing_executor, "max_pending", 0)
+    busy = client.post("/auth/login", json={"name": "Admin", "role": "admin", "password": "admin123"})
+    assert busy.status_code == 503
+    assert busy.headers["retry-after"] == "1"
+
+    monkeypatch.undo()
+    before = hashing_executor.stats()["completed"]
+    assert client.post("/auth/login", json={"name": "Admin", "role": "admin", "password": "admin123"}).status_code == 200
+    stats = hashing_executor.stats()
+    assert stats["completed"] == before + 1
+    assert stats["queue_depth"] == 0
+
+
+def test_production_profile_handles_concurrent_writers(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    engine = ctx["engine"]
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+    db = ctx["session"]()
+    try:
+        todo = Todo(mentor_id=2, mentee_id=3, title="Shared", description="Toggled", due_date=date(2026, 3, 1))
+        db.add(todo)
+        db.commit()
+        todo_id = todo.id
+    finally:
+        db.close()
+
+    errors: list[Exception] = []
+    threads_count, writes_per_thread = 16, 20
+
+    def writer(index: int) -> None:
+        try:
+            for step in range(writes_per_thread):
+                db = ctx["session"]()
+                try:
+                    db.add(
+                        SessionRecord(
+                            mentor_id=2,
+                            mentee_id=3,
+                            date=date(2026, 1, 1),
+                            fluency_score=5,
+                            confidence_score=5,
+                            notes=f"thread {index} step {step}",
+                            next_steps="-",
+                        )
+                    )
+                    crud.toggle_todo_for_mentee(db, todo_id=todo_id, mentee_id=3)
+                finally:
+                    db.close()
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db = ctx["session"]()
+    try:
+        assert db.query(SessionRecord).count() == threads_count * writes_per_thread
+        assert db.get(Todo, todo_id).completed is False
+    finally:
+        db.close()
+    run_maintenance(engine)
+
+
+def test_bulk_user_import_reports_each_row(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    csv_body = (
+        "name,role,password\n"
+        "Alice,mentor,alice123\n"
+        "Mentee,mentee,mentee123\n"
+        "Bob,mentee,bob12345\n"
+        "Bob,mentee,bob12345\n"
+        "Eve,admin,eve12345\n"
+        "Short,mentee,abc\n"
+    )
+    imported = client.post(
+        "/admin/users/bulk",
+        files={"file": ("users.csv", csv_body.encode(), "text/csv")},
+        headers=admin_headers,
+    )
+    assert imported.status_code == 200
+    report = imported.json()
+    assert (report["created"], report["duplicates"], report["invalid"]) == (2, 2, 2)
+    assert [item["status"] for item in report["results"]] == [
+        "created",
+        "duplicate",
+        "created",
+        "duplicate",
+        "invalid",
+        "invalid",
+    ]
+    assert _auth_headers(client, "Bob", "mentee", "bob12345")
+
+    ndjson_body = b'{"name": "Carol", "role": "mentor", "password": "carol123"}\nnot json\n'
+    imported = client.post(
+        "/admin/users/bulk",
+        files={"file": ("users.ndjson", ndjson_body, "application/x-ndjson")},
+        headers=admin_headers,
+    )
+    assert [item["status"] for item in imported.json()["results"]] == ["created", "invalid"]
+
+
+def test_bulk_user_import_reports_undecodable_rows_instead_of_failing(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    csv_body = b"name,role,password\nDora,mentee,dora1234\nBad\xff\xfe,mentee,bad12345\nLate,mentee,late1234\n"
+    imported = client.post(
+        "/admin/users/bulk",
+        files={"file": ("users.csv", csv_body, "text/csv")},
+        headers=admin_headers,
+    )
+    assert imported.status_code == 200
+    report = imported.json()
+    assert (report["created"], report["invalid"]) == (1, 1)
+    assert "UTF-8" in report["results"][-1]["detail"]
+    assert _auth_headers(client, "Dora", "mentee", "dora1234")
+
+    oversized = b"name,role,password\n" + b"x" * (csv.field_size_limit() + 1) + b",mentee,big12345\n"
+    imported = client.post("/admin/users/bulk", files={"file": ("users.csv", oversized, "text/csv")}, headers=admin_headers)
+    assert imported.status_code == 200
+    assert [item["detail"][:13] for item in imported.json()["results"]] == ["Malformed CSV"]
+
+    ndjson_body = b'{"name": "Bad\xff", "role": "mentee", "password": "bad12345"}\n{"name": "Ivo", "role": "mentee", "password": "ivo12345"}\n'
+    imported = client.post(
+        "/admin/users/bulk",
+        files={"file": ("users.ndjson", ndjson_body, "application/x-ndjson")},
+        headers=admin_headers,
+    )
+    assert [item["status"] for item in imported.json()["results"]] == ["invalid", "created"]
+
+
+def test_bulk_map_mentor_upserts_in_one_request(tmp_path: Path, monkeypatch):
+    ctx = _build_test_context(tmp_path)
+    published = []
+    monkeypatch.setattr(crud.event_hub, "publish", lambda user_ids, key, event: published.append((set(user_ids), key, event)))
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    client.post("/admin/users", json={"name": "Tom", "role": "mentor", "password": "tom12345"}, headers=admin_headers)
+    client.post("/admin/users", json={"name": "Ana", "role": "mentee", "password": "ana12345"}, headers=admin_headers)
+    users = {
+        item["name"]: item["id"]
+        for path in ("/admin/mentors", "/admin/mentees")
+        for item in client.get(path, headers=admin_headers).json()
+    }
+
+    payload = {
+        "mappings": [
+            {"mentor_id": users["Tom"], "mentee_id": users["Mentee"]},
+            {"mentor_id": users["Mentor"], "mentee_id": users["Ana"]},
+        ]
+    }
+    first = client.post("/admin/map-mentor/bulk", json=payload, headers=admin_headers)
+    assert first.status_code == 200
+    assert first.json() == {"created": 1, "moved": 1, "unchanged": 0}
+    assert sorted(published, key=lambda item: item[1]) == sorted(
+        [
+            (
+                {users["Tom"], users["Mentee"], users["Mentor"]},
+                ("mapping", users["Mentee"]),
+                {
+                    "type": "mapping.updated",
+                    "mentor_id": users["Tom"],
+                    "mentee_id": users["Mentee"],
+                    "previous_mentor_id": users["Mentor"],
+                },
+            ),
+            (
+                {users["Mentor"], users["Ana"]},
+                ("mapping", users["Ana"]),
+                {
+                    "type": "mapping.updated",
+                    "mentor_id": users["Mentor"],
+                    "mentee_id": users["Ana"],
+                    "previous_mentor_id": None,
+                },
+            ),
+        ],
+        key=lambda item: item[1],
+    )
+
+    published.clear()
+    again = client.post("/admin/map-mentor/bulk", json=payload, headers=admin_headers)
+    assert again.json() == {"created": 0, "moved": 0, "unchanged": 2}
+    assert published == []
+
+    mappings = {item["mentee_name"]: item["mentor_name"] for item in client.get("/admin/mappings", headers=admin_headers).json()}
+    assert mappings == {"Mentee": "Tom", "Ana": "Mentor"}
+
+    bad = client.post(
+        "/admin/map-mentor/bulk",
+        json={"mappings": [{"mentor_id": users["Ana"], "mentee_id": users["Mentee"]}]},
+        headers=admin_headers,
+    )
+    assert bad.status_code == 404
+
+
+def test_upserts_answer_501_on_unsupported_databases():
+    mysql = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+
+    with pytest.raises(HTTPException) as raised:
+        crud._upsert_insert(mysql, crud.MentorMenteeMap)
+    assert raised.value.status_code == 501
+
+
+def test_bulk_todo_assignment_uses_constant_queries(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+    todo = {"title": "Homework", "description": "Record a 2 minute talk", "due_date": "2026-03-01"}
+
+    def assign_all() -> tuple[int, int]:
+        with _count_queries(ctx["engine"]) as statements:
+            response = client.post("/mentor/todos/bulk", json={**todo, "all_mentees": True}, headers=mentor_headers)
+        assert response.status_code == 200
+        return len(response.json()), len(statements)
+
+    assign_all()
+    assigned_small, queries_small = assign_all()
+    _seed_mapped_mentees(ctx, 40)
+    assigned_large, queries_large = assign_all()
+    assert (assigned_small, assigned_large) == (1, 41)
+    assert queries_large == queries_small
+
+    listed = client.post("/mentor/todos/bulk", json={**todo, "mentee_ids": [3]}, headers=mentor_headers)
+    assert [item["mentee_id"] for item in listed.json()] == [3]
+
+    foreign = client.post("/mentor/todos/bulk", json={**todo, "mentee_ids": [3, 1]}, headers=mentor_headers)
+    assert foreign.status_code == 400
+    assert client.post("/mentor/todos/bulk", json=todo, headers=mentor_headers).status_code == 422
+
+
+def test_session_analytics_are_maintained_incrementally(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    for day, fluency, confidence in (("2026-02-02", 4, 6), ("2026-02-04", 6, 6), ("2026-02-11", 9, 8)):
+        logged = client.post(
+            "/mentor/sessions",
+            json={
+                "mentee_id": 3,
+                "date": day,
+                "fluency_score": fluency,
+                "confidence_score": confidence,
+                "notes": "Practice",
+                "next_steps": "Repeat",
+            },
+            headers=mentor_headers,
+        )
+        assert logged.status_code == 200
+
+    weekly = client.get("/admin/analytics/mentees/3", headers=admin_headers).json()
+    assert weekly["session_count"] == 3
+    assert [bucket["session_count"] for bucket in weekly["buckets"]] == [2, 1]
+    assert weekly["buckets"][0]["average_fluency"] == 5.0
+    assert weekly["fluency_delta"] == 4.0
+    assert weekly["average_confidence"] == 6.67
+
+    monthly = client.get("/mentor/2/analytics", params={"period": "month"}, headers=mentor_headers).json()
+    assert [bucket["period_start"] for bucket in monthly["buckets"]] == ["2026-02-01"]
+    assert monthly["fluency_delta"] is None
+
+    db = ctx["session"]()
+    try:
+        assert crud.rebuild_session_analytics(db) == 6
+    finally:
+        db.close()
+    assert client.get("/admin/analytics/mentees/3", headers=admin_headers).json() == weekly
+    assert client.get("/mentor/2/mentees/1/analytics", headers=mentor_headers).status_code == 404
+
+
+def test_mentor_dashboard_aggregates_in_constant_queries(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+
+    db = ctx["session"]()
+    try:
+        db.add_all(
+            [
+                Todo(mentor_id=2, mentee_id=3, title="Old", description="-", due_date=date(2000, 1, 1)),
+                Todo(mentor_id=2, mentee_id=3, title="Future", description="-", due_date=date(2999, 1, 1)),
+                Todo(mentor_id=2, mentee_id=3, title="Done", description="-", due_date=date(2000, 1, 1), completed=True),
+            ]
+        )
+        db.commit()
+    finally:
+        db.close()
+    for day, fluency in (("2026-01-05", 4), ("2026-01-20", 7)):
+        client.post(
+            "/mentor/sessions",
+            json={"mentee_id": 3, "date": day, "fluency_score": fluency, "confidence_score": 5, "notes": "n", "next_steps": "s"},
+            headers=mentor_headers,
+        )
+
+    def dashboard() -> tuple[dict, int]:
+        with _count_queries(ctx["engine"]) as statements:
+            response = client.get("/mentor/2/dashboard", headers=mentor_headers)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    body, small_queries = dashboard()
+    mentee = body["mentees"][0]
+    assert (mentee["open_todos"], mentee["overdue_todos"]) == (2, 1)
+    assert (mentee["last_session_date"], mentee["latest_fluency_score"]) == ("2026-01-20", 7)
+
+    _seed_mapped_mentees(ctx, 30)
+    body, large_queries = dashboard()
+    assert len(body["mentees"]) == 31
+    assert large_queries == small_queries <= 2
+
+
+def test_read_mostly_listings_return_304_without_queries(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+
+    first = client.get("/admin/mentors", headers=admin_headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    with _count_queries(ctx["engine"]) as statements:
+        cached = client.get("/admin/mentors", headers={**admin_headers, "If-None-Match": etag})
+        repeated = client.get("/admin/mentors", headers=admin_headers)
+    assert cached.status_code == 304
+    assert repeated.json() == first.json()
+    assert statements == []
+
+    client.post("/admin/users", json={"name": "Tom", "role": "mentor", "password": "tom12345"}, headers=admin_headers)
+    changed = client.get("/admin/mentors", headers={**admin_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert [item["name"] for item in changed.json()] == ["Mentor", "Tom"]
+
+    paged = client.get("/admin/mentors", params={"limit": 1}, headers=admin_headers)
+    assert paged.headers["etag"] != changed.headers["etag"]
+    assert "x-next-cursor" in paged.headers
+
+
+def _metric_value(client: TestClient, sample: str) -> float:
+    scrape = client.get("/metrics", headers={"Authorization": f"Bearer {METRICS_TOKEN}"})
+    for line in scrape.text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_attribute_sql_work_to_routes(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    _seed_mapped_mentees(ctx, 3)
+    client.get("/admin/sessions", headers=admin_headers)
+
+    labels = '{method="GET",route="/admin/sessions"}'
+    before_count = _metric_value(client, f"http_request_sql_statements_count{labels}")
+    before_sum = _metric_value(client, f"http_request_sql_statements_sum{labels}")
+    before_ok = _metric_value(client, 'http_requests_total{method="GET",route="/admin/sessions",status="200"}')
+    with _count_queries(ctx["engine"]) as statements:
+        assert client.get("/admin/sessions", headers=admin_headers).status_code == 200
+
+    assert _metric_value(client, f"http_request_sql_statements_count{labels}") == before_count + 1
+    assert _metric_value(client, f"http_request_sql_statements_sum{labels}") == before_sum + len(statements)
+    assert _metric_value(client, 'http_requests_total{method="GET",route="/admin/sessions",status="200"}') == before_ok + 1
+    assert _metric_value(client, f"http_request_duration_seconds_count{labels}") >= 2
+    assert _metric_value(client, f'http_request_duration_seconds_bucket{labels[:-1]},le="+Inf"}}') >= 2
+
+    client.get("/no-such-page")
+    assert _metric_value(client, 'http_requests_total{method="GET",route="unmatched",status="404"}') >= 1
+
+    body = client.get("/metrics", headers=admin_headers)
+    assert body.status_code == 200
+    assert body.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in body.text
+    assert "db_pool_checkout_wait_seconds_count " in body.text
+    assert _metric_value(client, "password_hash_completed_total") >= 1
+    assert _metric_value(client, "http_requests_in_flight") == 1
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong-token"}).status_code == 401
+    assert client.get("/metrics", headers=_auth_headers(client, "Mentor", "mentor", "mentor123")).status_code == 403
+
+
+def test_slow_queries_are_fingerprinted_explained_and_logged(tmp_path: Path, monkeypatch):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    admin_headers = _auth_headers(client, "Admin", "admin", "admin123")
+    _seed_mapped_mentees(ctx, 3)
+
+    log_path = tmp_path / "slow.log"
+    log = slow_queries.slow_query_log
+    monkeypatch.setattr(log, "log_path", str(log_path))
+    monkeypatch.setattr(log, "_file_logger", None)
+    log.clear()
+    slow_queries.install(ctx["engine"], threshold_ms=0.000001)
+
+    for limit in (2, 3):
+        assert client.get("/admin/sessions", params={"limit": limit}, headers=admin_headers).status_code == 200
+    _auth_headers(client, "Mentee", "mentee", "mentee123")
+
+    top = client.get("/admin/slow-queries", params={"order_by": "count"}, headers=admin_headers).json()
+    listing = [entry for entry in top if entry["last_route"] == "GET /admin/sessions" and "session_records" in entry["statement"]]
+    assert listing
+    assert listing[0]["count"] == 2
+    assert listing[0]["p50_ms"] <= listing[0]["p95_ms"] <= listing[0]["max_ms"]
+    assert any(step.startswith(("SEARCH", "SCAN")) for step in listing[0]["plan"])
+
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    logged = [line for line in lines if line["route"] == "GET /admin/sessions"]
+    assert logged and all(line["plan"] for line in logged if line["fingerprint"] == listing[0]["fingerprint"])
+    assert '"Mentee"' not in log_path.read_text()
+    assert any(line["route"] == "POST /auth/login" for line in lines)
+    assert all(isinstance(value, str) and value.startswith("<") for line in logged for value in line["parameters"])
+
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+    assert client.get("/admin/slow-queries", headers=mentor_headers).status_code == 403
+
+
+def test_slow_query_fingerprints_ignore_literals_and_list_lengths():
+    first = slow_queries.normalize_statement("SELECT * FROM users WHERE id IN (?, ?, ?) AND name = 'a'")
+    second = slow_queries.normalize_statement("SELECT *\n FROM users WHERE id IN (?, ?) AND name = 'bob'")
+    assert first == second == "SELECT * FROM users WHERE id IN (?...) AND name = ?"
+    inserts = slow_queries.normalize_statement("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)")
+    assert inserts == "INSERT INTO t (a, b) VALUES (?...), ..."
+    assert slow_queries.redact_parameters(("secret", 5, None)) == ["<str:6>", "<int>", None]
+
+
+def test_websocket_pushes_todo_and_session_changes_to_both_sides(tmp_path: Path):
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    mentor_headers = _auth_headers(client, "Mentor", "mentor", "mentor123")
+    mentee_headers = _auth_headers(client, "Mentee", "mentee", "mentee123")
+    mentor_token = mentor_headers["Authorization"].split()[1]
+
+    with (
+        client.websocket_connect(f"/ws/events?token={mentor_token}") as mentor_socket,
+        client.websocket_connect("/ws/events", headers=mentee_headers) as mentee_socket,
+    ):
+        todo = client.post(
+            "/mentor/todos",
+            json={"mentee_id": 3, "title": "Read", "description": "Chapter 1", "due_date": "2026-02-28"},
+            headers=mentor_headers,
+        ).json()
+        for socket in (mentor_socket, mentee_socket):
+            events = socket.receive_json()["events"]
+            assert events == [{"type": "todo.created", "todo": {**todo, "due_date": "2026-02-28"}}]
+
+        client.patch(f"/mentee/todos/{todo['id']}/toggle", headers=mentee_headers)
+        for socket in (mentor_socket, mentee_socket):
+            [event] = socket.receive_json()["events"]
+            assert event["type"] == "todo.updated" and event["todo"]["completed"] is True
+
+        session = client.post(
+            "/mentor/sessions",
+            json={
+                "mentee_id": 3,
+                "date": "2026-02-20",
+                "fluency_score": 7,
+                "confidence_score": 6,
+                "notes": "Private notes",
+                "next_steps": "Practice",
+            },
+            headers=mentor_headers,
+        ).json()
+        [event] = mentee_socket.receive_json()["events"]
+        assert event["type"] == "session.created"
+        assert event["session"]["id"] == session["id"]
+        assert "notes" not in event["session"]
+
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect("/ws/events?token=not-a-token"):
+            pass
+    assert rejected.value.code == 1008
+
+
+def test_event_hub_coalesces_bursts_and_bounds_queues():
+    async def scenario():
+        hub = EventHub(max_pending=3)
+        idle = [hub.subscribe(user_id) for user_id in range(100, 5100)]
+        watcher = hub.subscribe(1)
+        assert hub.connection_count() == len(idle) + 1
+
+        for completed in (True, False, True):
+            hub.publish([1], ("todo", 7), {"type": "todo.updated", "completed": completed})
+        hub.publish([1, 2], ("todo", 8), {"type": "todo.created"})
+        await asyncio.sleep(0)
+        batch = await watcher.next_batch()
+        assert batch == [{"type": "todo.updated", "completed": True}, {"type": "todo.created"}]
+
+        for todo_id in range(10):
+            hub.publish([1], ("todo", todo_id), {"type": "todo.created", "id": todo_id})
+        await asyncio.sleep(0)
+        assert await watcher.next_batch() == [RESYNC_EVENT]
+
+        hub.publish([1], ("todo", 1), {"type": "todo.updated"})
+        await asyncio.sleep(0)
+        assert await watcher.next_batch() == [{"type": "todo.updated"}]
+        assert all(not subscription._pending for subscription in idle)
+
+        hub.unsubscribe(watcher)
+        for subscription in idle:
+            hub.unsubscribe(subscription)
+        assert hub.connection_count() == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,31 @@
+from backend.bench.app import PopulationSize
+from backend.bench import startup
+from backend.bench.load import WORKLOADS, percentile, run
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_load_benchmark_reports_every_scenario_without_errors():
+    report = run(PopulationSize(2, 2, 2, 2), WORKLOADS["mixed"], duration=1.0, concurrency=4)
+
+    assert report["total"]["requests"] > 0
+    assert report["total"]["errors"] == 0
+    assert len(report["endpoints"]) == len(WORKLOADS["mixed"])
+    for stats in report["endpoints"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert stats["rps"] > 0
+
+
+def test_startup_benchmark_boots_an_initialized_database():
+    report = startup.run(["warm-skip"], repeat=1)
+
+    stats = report["scenarios"]["warm-skip"]
+    assert set(stats) == {"import_ms", "ready_ms", "first_login_ms", "first_request_ms", "second_request_ms"}
+    assert 0 < stats["import_ms"]["median"] < stats["ready_ms"]["median"]
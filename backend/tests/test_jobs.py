@@ -0,0 +1,133 @@
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from backend import jobs, migrations
+from backend.database import build_engine
+from backend.jobs import JobWorkers, enqueue, job_handler, queue_stats
+from backend.models import Job
+
+calls: dict[str, list] = {}
+
+
+@job_handler("test.record")
+def _record(db, payload):
+    calls.setdefault(payload["bucket"], []).append(payload["value"])
+
+
+@job_handler("test.flaky")
+def _flaky(db, payload):
+    attempts = calls.setdefault(payload["bucket"], [])
+    attempts.append(len(attempts) + 1)
+    if len(attempts) < payload["succeed_on"]:
+        raise RuntimeError(f"attempt {len(attempts)} failed")
+
+
+@pytest.fixture
+def queue(tmp_path: Path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    migrations.upgrade(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def add(kind: str, payload: dict | None = None, **options) -> int:
+        db = session()
+        try:
+            job = enqueue(db, kind, payload, **options)
+            db.commit()
+            return job.id
+        finally:
+            db.close()
+
+    def job(job_id: int) -> Job:
+        db = session()
+        try:
+            return db.get(Job, job_id)
+        finally:
+            db.close()
+
+    calls.clear()
+    return {"engine": engine, "add": add, "job": job}
+
+
+def _make_due(engine, job_id: int) -> None:
+    # Stand-in for waiting out a backoff or a visibility timeout.
+    with engine.begin() as connection:
+        past = jobs.utcnow() - timedelta(seconds=1)
+        connection.execute(update(Job).where(Job.id == job_id).values(run_after=past, locked_until=past))
+
+
+def test_failed_attempts_are_retried_with_backoff_until_they_succeed_or_run_out(queue):
+    workers = JobWorkers(queue["engine"], concurrency=1, backoff_base=60)
+    recovers = queue["add"]("test.flaky", {"bucket": "recovers", "succeed_on": 2})
+    gives_up = queue["add"]("test.flaky", {"bucket": "gives-up", "succeed_on": 9}, max_attempts=2)
+    unknown = queue["add"]("test.unknown")
+
+    assert workers.drain() == 3
+    retrying = queue["job"](recovers)
+    assert (retrying.status, retrying.attempts) == ("queued", 1)
+    assert "attempt 1 failed" in retrying.last_error
+    assert timedelta(seconds=29) < retrying.run_after - jobs.utcnow() <= timedelta(seconds=60)
+    assert queue["job"](unknown).status == "failed"
+    assert workers.drain() == 0
+
+    _make_due(queue["engine"], recovers)
+    _make_due(queue["engine"], gives_up)
+    assert workers.drain() == 2
+    assert (queue["job"](recovers).status, queue["job"](recovers).attempts) == ("done", 2)
+    assert (queue["job"](gives_up).status, queue["job"](gives_up).attempts) == ("failed", 2)
+    assert calls == {"recovers": [1, 2], "gives-up": [1, 2]}
+
+
+def test_jobs_of_a_crashed_worker_are_claimed_again_after_the_visibility_timeout(queue):
+    workers = JobWorkers(queue["engine"], concurrency=1, visibility_timeout=300)
+    job_id = queue["add"]("test.record", {"bucket": "crash", "value": 1}, max_attempts=2)
+
+    lost = workers._claim()
+    assert lost.id == job_id
+    assert workers.drain() == 0
+
+    _make_due(queue["engine"], job_id)
+    assert workers.drain() == 1
+    assert (queue["job"](job_id).status, queue["job"](job_id).attempts) == ("done", 2)
+    # The crashed attempt cannot overwrite the outcome of the one that replaced it.
+    workers._finish(lost, "late failure", retry=True)
+    assert queue["job"](job_id).status == "done"
+
+    exhausted = queue["add"]("test.record", {"bucket": "crash", "value": 2}, max_attempts=1)
+    workers._claim()
+    _make_due(queue["engine"], exhausted)
+    workers.sweep()
+    assert queue["job"](exhausted).status == "failed"
+    assert calls == {"crash": [1]}
+
+
+def test_concurrent_workers_run_each_job_once_and_report_queue_depth(queue):
+    for value in range(60):
+        queue["add"]("test.record", {"bucket": "fanout", "value": value})
+    queue["add"]("test.record", {"bucket": "later", "value": 0}, delay_seconds=3600)
+    stats = queue_stats(queue["engine"])
+    assert (stats["queued"], stats["running"]) == (61, 0)
+
+    assert JobWorkers(queue["engine"], concurrency=8).drain() == 60
+    assert sorted(calls["fanout"]) == list(range(60))
+    assert queue_stats(queue["engine"])["queued"] == 1
+
+
+def test_started_workers_pick_up_jobs_as_soon_as_they_are_committed(queue):
+    done = threading.Event()
+
+    @job_handler("test.signal")
+    def _signal(db, payload):
+        done.set()
+
+    workers = JobWorkers(queue["engine"], concurrency=2, poll_interval=30)
+    workers.start()
+    try:
+        queue["add"]("test.signal")
+        assert done.wait(timeout=5)
+    finally:
+        workers.stop(timeout=5)
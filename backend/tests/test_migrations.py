@@ -0,0 +1,161 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker
+
+from backend import bootstrap, crud, migrations
+from backend.database import Base, build_engine
+from backend.models import Role, SessionScoreBucket, User
+from backend.pagination import encode_cursor
+from backend.principals import principal_cache
+
+# Any walk over a whole table or index: ``SCAN t``, ``SCAN t USING INDEX i`` and
+# ``SCAN t USING COVERING INDEX i``. FTS lookups (``SCAN fts VIRTUAL TABLE INDEX``)
+# and ``SCAN CONSTANT ROW`` are not table scans.
+_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$")
+_LIMIT = re.compile(r"\bLIMIT\b")
+_WHERE = re.compile(r"\bWHERE\b")
+
+
+def _reads_one_page(statement: str, details: list[str]) -> bool:
+    """An unfiltered listing walked in its ORDER BY order stops after LIMIT rows."""
+    return (
+        bool(_LIMIT.search(statement))
+        and not _WHERE.search(statement)
+        and not any(detail.startswith("USE TEMP B-TREE") for detail in details)
+    )
+
+
+def test_upgrade_is_idempotent_and_matches_models(tmp_path: Path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    applied = migrations.upgrade(engine)
+    assert [migration.version for migration in applied] == [m.version for m in migrations.MIGRATIONS]
+    assert migrations.upgrade(engine) == []
+    assert migrations.pending_migrations(engine) == []
+
+    reference = create_engine(f"sqlite:///{tmp_path / 'reference.db'}")
+    Base.metadata.create_all(reference)
+    migrated, expected = inspect(engine), inspect(reference)
+    for table in Base.metadata.tables:
+        assert {c["name"] for c in migrated.get_columns(table)} == {c["name"] for c in expected.get_columns(table)}
+        assert {i["name"] for i in migrated.get_indexes(table)} == {i["name"] for i in expected.get_indexes(table)}
+
+
+def test_upgrade_adopts_database_created_by_create_all(tmp_path: Path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(engine)
+    applied = migrations.upgrade(engine)
+    assert [migration.name for migration in applied] == [m.name for m in migrations.MIGRATIONS]
+
+
+def test_upgrade_backfills_score_buckets_for_existing_sessions(tmp_path: Path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'sessions.db'}")
+    migrations.upgrade(engine, target=6)
+    session = sessionmaker(bind=engine)
+    db = session()
+    try:
+        mentor = crud.create_user(db, "Mentor", Role.MENTOR, "mentor123")
+        mentee = crud.create_user(db, "Mentee", Role.MENTEE, "mentee123")
+        crud.map_mentor_to_mentee(db, mentor.id, mentee.id)
+        for day in (date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 4), date(2026, 4, 5)):
+            crud.create_session_record(db, mentor.id, mentee.id, day, 4, 3, "notes", "next")
+        expected = {
+            (scope, period): crud.get_score_analytics(db, scope, subject_id, period, 12)
+            for scope, subject_id in (("mentee", mentee.id), ("mentor", mentor.id))
+            for period in crud.ANALYTICS_PERIODS
+        }
+        # As on a database whose sessions predate the buckets.
+        db.query(SessionScoreBucket).delete()
+        db.commit()
+
+        migrations.upgrade(engine)
+        backfilled = {
+            (scope, period): crud.get_score_analytics(db, scope, subject_id, period, 12)
+            for scope, subject_id in (("mentee", mentee.id), ("mentor", mentor.id))
+            for period in crud.ANALYTICS_PERIODS
+        }
+    finally:
+        db.close()
+
+    assert backfilled == expected
+    assert expected[("mentee", "week")]["buckets"]
+
+
+def test_initialize_runs_once_when_processes_start_together(tmp_path: Path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert bootstrap.needs_initialization(engine)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: bootstrap.initialize(engine), range(4)))
+
+    assert results.count(True) == 1
+    assert not bootstrap.needs_initialization(engine)
+    assert bootstrap.initialize(engine) is False
+    with sessionmaker(bind=engine)() as db:
+        assert db.query(User).count() == len(bootstrap.DEFAULT_USERS)
+
+
+def test_crud_queries_do_not_scan_tables(tmp_path: Path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    migrations.upgrade(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    principal_cache.clear()
+
+    db = session()
+    mentor = crud.create_user(db, "Mentor", Role.MENTOR, "mentor123")
+    mentee = crud.create_user(db, "Mentee", Role.MENTEE, "mentee123")
+    crud.map_mentor_to_mentee(db, mentor.id, mentee.id)
+
+    statements: list[tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        day = date(2026, 1, 1)
+        crud._find_login_user(db, "Mentor", Role.MENTOR)
+        crud.get_user_by_id(db, mentor.id)
+        crud.get_users_by_role(db, Role.MENTEE, limit=10, cursor=encode_cursor(["A", 0]))
+        crud.map_mentor_to_mentee(db, mentor.id, mentee.id)
+        crud.list_mappings(db, limit=10, cursor=encode_cursor([0]))
+        crud.list_resources(db, limit=10, cursor=encode_cursor([day, 10]))
+        crud.get_mentor_meet_link(db, mentor.id)
+        crud.get_assigned_mentees(db, mentor.id, limit=10, cursor=encode_cursor(["A", 0]))
+        record = crud.create_session_record(db, mentor.id, mentee.id, day, 5, 5, "notes", "next")
+        crud.get_session_row(db, record.id)
+        crud.get_score_analytics(db, "mentee", mentee.id, "week", 12)
+        crud.is_mentee_assigned(db, mentor.id, mentee.id)
+        crud.list_session_records(db, limit=10, cursor=encode_cursor([day, record.id + 1]))
+        crud.search_session_records(db, "notes", mentor_id=mentor.id, limit=10, cursor=encode_cursor([-1.0, 0]))
+        todo = crud.create_todo(db, mentor.id, mentee.id, "Read", "Chapter 1", day)
+        crud.get_todos_for_mentee(db, mentee.id, limit=10, cursor=encode_cursor([day, 0]))
+        crud.toggle_todo_for_mentee(db, todo.id, mentee.id)
+        crud.get_mentor_for_mentee(db, mentee.id)
+        crud.get_mentor_dashboard(db, mentor.id, day)
+        # First pages, which have no cursor to seek from.
+        crud.get_users_by_role(db, Role.MENTEE, limit=10)
+        crud.list_mappings(db, limit=10)
+        crud.list_resources(db, limit=10)
+        crud.get_assigned_mentees(db, mentor.id, limit=10)
+        crud.list_session_records(db, limit=10)
+        crud.search_session_records(db, "notes", mentor_id=mentor.id, limit=10)
+        crud.get_todos_for_mentee(db, mentee.id, limit=10)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        db.close()
+
+    assert statements
+    scans = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            details = [detail for *_, detail in plan]
+            if _reads_one_page(statement, details):
+                continue
+            scans.extend((detail, statement) for detail in details if _FULL_SCAN.match(detail))
+    assert scans == []
@@ -0,0 +1,253 @@
+"""Per-route SQL query budgets.
+
+Every route in the auth, admin, mentor and mentee routers declares the number of
+statements one request may issue. Each route is exercised against a dataset of size 1
+and of size ``LARGE``; a route that goes over budget, or issues more statements on
+the larger dataset (an N+1 or per-row query), fails the build. Both caches are
+cleared before every measured request, so budgets describe the cold path.
+"""
+
+import itertools
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+from test_api import _auth_headers, _build_test_context, _seed_mapped_mentees
+
+from backend import crud
+from backend.http_cache import response_cache
+from backend.models import User
+from backend.principals import principal_cache
+from backend.routes import admin, auth, mentee, mentor
+
+LARGE = 25
+
+BUDGETS = {
+    "POST /auth/login": 1,
+    "POST /admin/users": 4,
+    "POST /admin/users/bulk": 3,
+    "GET /admin/mentors": 2,
+    "GET /admin/mentees": 2,
+    "POST /admin/map-mentor": 6,
+    "POST /admin/map-mentor/bulk": 4,
+    "GET /admin/mappings": 2,
+    "POST /admin/resources": 4,
+    "GET /admin/resources": 2,
+    "GET /admin/sessions": 2,
+    "GET /admin/sessions/search": 2,
+    "GET /admin/analytics/mentees/{mentee_id}": 4,
+    "GET /admin/analytics/mentors/{mentor_id}": 4,
+    "GET /admin/slow-queries": 1,
+    "GET /mentor/{mentor_id}/mentees": 3,
+    "GET /mentor/{mentor_id}/dashboard": 3,
+    "PUT /mentor/{mentor_id}/meet-link": 4,
+    "GET /mentor/{mentor_id}/meet-link": 2,
+    "POST /mentor/sessions": 8,
+    "POST /mentor/todos": 6,
+    "POST /mentor/todos/bulk": 3,
+    "GET /mentor/{mentor_id}/sessions/search": 3,
+    "GET /mentor/{mentor_id}/analytics": 3,
+    "GET /mentor/{mentor_id}/mentees/{mentee_id}/analytics": 4,
+    "GET /mentee/{mentee_id}/mentor": 3,
+    "GET /mentee/{mentee_id}/todos": 3,
+    "PATCH /mentee/todos/{todo_id}/toggle": 4,
+    "GET /mentee/resources": 2,
+}
+
+_unique = itertools.count()
+
+
+def _build_world(tmp_path: Path, size: int) -> dict:
+    ctx = _build_test_context(tmp_path)
+    client = ctx["client"]
+    _seed_mapped_mentees(ctx, size)
+    db = ctx["session"]()
+    try:
+        mentor_user = db.query(User).filter(User.name == "Mentor").one()
+        mentee_user = db.query(User).filter(User.name == "Mentee").one()
+        for index in range(size):
+            day = date(2026, 1, 5) + timedelta(weeks=index)
+            crud.create_session_record(db, mentor_user.id, mentee_user.id, day, 6, 7, "Notes", "Next")
+            crud.create_todo(db, mentor_user.id, mentee_user.id, f"Todo {index}", "Practice", day)
+            crud.create_resource(db, title=f"Guide {index}", url=f"/uploads/guide-{index}.pdf")
+        todo_id = crud.get_todos_for_mentee(db, mentee_user.id, limit=1, cursor=None).items[0].id
+        seeded_ids = [user.id for user in db.query(User).filter(User.name.like("Seed Mentee %"))]
+        crud.rebuild_session_analytics(db)
+        mentor_id, mentee_id = mentor_user.id, mentee_user.id
+    finally:
+        db.close()
+    return {
+        **ctx,
+        "size": size,
+        "admin": _auth_headers(client, "Admin", "admin", "admin123"),
+        "mentor": _auth_headers(client, "Mentor", "mentor", "mentor123"),
+        "mentee": _auth_headers(client, "Mentee", "mentee", "mentee123"),
+        "mentor_id": mentor_id,
+        "mentee_id": mentee_id,
+        "todo_id": todo_id,
+        "seeded_mentee_ids": seeded_ids,
+    }
+
+
+def _bulk_users_csv(world) -> bytes:
+    rows = [f"Bulk {next(_unique)},mentee,secret123" for _ in range(world["size"])]
+    return ("name,role,password\n" + "\n".join(rows) + "\n").encode()
+
+
+# Each case returns (method, url, request kwargs) for one representative request.
+CASES = {
+    "POST /auth/login": lambda w: (
+        "POST", "/auth/login", {"json": {"name": "Mentee", "role": "mentee", "password": "mentee123"}}
+    ),
+    "POST /admin/users": lambda w: (
+        "POST", "/admin/users",
+        {"headers": w["admin"], "json": {"name": f"New {next(_unique)}", "role": "mentee", "password": "secret123"}},
+    ),
+    "POST /admin/users/bulk": lambda w: (
+        "POST", "/admin/users/bulk",
+        {"headers": w["admin"], "files": {"file": ("users.csv", _bulk_users_csv(w), "text/csv")}},
+    ),
+    "GET /admin/mentors": lambda w: ("GET", "/admin/mentors", {"headers": w["admin"]}),
+    "GET /admin/mentees": lambda w: ("GET", "/admin/mentees", {"headers": w["admin"]}),
+    "POST /admin/map-mentor": lambda w: (
+        "POST", "/admin/map-mentor",
+        {"headers": w["admin"], "json": {"mentor_id": w["mentor_id"], "mentee_id": w["mentee_id"]}},
+    ),
+    "POST /admin/map-mentor/bulk": lambda w: (
+        "POST", "/admin/map-mentor/bulk",
+        {
+            "headers": w["admin"],
+            "json": {
+                "mappings": [
+                    {"mentor_id": w["mentor_id"], "mentee_id": mentee_id} for mentee_id in w["seeded_mentee_ids"]
+                ]
+            },
+        },
+    ),
+    "GET /admin/mappings": lambda w: ("GET", "/admin/mappings", {"headers": w["admin"]}),
+    "POST /admin/resources": lambda w: (
+        "POST", "/admin/resources",
+        {
+            "headers": w["admin"],
+            "data": {"title": "Budget guide"},
+            "files": {"file": ("guide.pdf", b"%PDF-1.4 budget", "application/pdf")},
+        },
+    ),
+    "GET /admin/resources": lambda w: ("GET", "/admin/resources", {"headers": w["admin"]}),
+    "GET /admin/sessions": lambda w: ("GET", "/admin/sessions", {"headers": w["admin"]}),
+    "GET /admin/sessions/search": lambda w: (
+        "GET", "/admin/sessions/search", {"headers": w["admin"], "params": {"q": "notes"}}
+    ),
+    "GET /admin/analytics/mentees/{mentee_id}": lambda w: (
+        "GET", f"/admin/analytics/mentees/{w['mentee_id']}", {"headers": w["admin"]}
+    ),
+    "GET /admin/analytics/mentors/{mentor_id}": lambda w: (
+        "GET", f"/admin/analytics/mentors/{w['mentor_id']}", {"headers": w["admin"]}
+    ),
+    "GET /admin/slow-queries": lambda w: ("GET", "/admin/slow-queries", {"headers": w["admin"]}),
+    "GET /mentor/{mentor_id}/mentees": lambda w: ("GET", f"/mentor/{w['mentor_id']}/mentees", {"headers": w["mentor"]}),
+    "GET /mentor/{mentor_id}/dashboard": lambda w: (
+        "GET", f"/mentor/{w['mentor_id']}/dashboard", {"headers": w["mentor"]}
+    ),
+    "PUT /mentor/{mentor_id}/meet-link": lambda w: (
+        "PUT", f"/mentor/{w['mentor_id']}/meet-link",
+        {"headers": w["mentor"], "json": {"meet_link": "https://meet.example.com/budget"}},
+    ),
+    "GET /mentor/{mentor_id}/meet-link": lambda w: (
+        "GET", f"/mentor/{w['mentor_id']}/meet-link", {"headers": w["mentor"]}
+    ),
+    "POST /mentor/sessions": lambda w: (
+        "POST", "/mentor/sessions",
+        {
+            "headers": w["mentor"],
+            "json": {
+                "mentee_id": w["mentee_id"],
+                "date": "2026-03-02",
+                "fluency_score": 7,
+                "confidence_score": 8,
+                "notes": "Budget",
+                "next_steps": "Budget",
+            },
+        },
+    ),
+    "POST /mentor/todos": lambda w: (
+        "POST", "/mentor/todos",
+        {
+            "headers": w["mentor"],
+            "json": {"mentee_id": w["mentee_id"], "title": "Read", "description": "Ch 2", "due_date": "2026-03-02"},
+        },
+    ),
+    "POST /mentor/todos/bulk": lambda w: (
+        "POST", "/mentor/todos/bulk",
+        {
+            "headers": w["mentor"],
+            "json": {"all_mentees": True, "title": "Read", "description": "Ch 3", "due_date": "2026-03-09"},
+        },
+    ),
+    "GET /mentor/{mentor_id}/sessions/search": lambda w: (
+        "GET", f"/mentor/{w['mentor_id']}/sessions/search", {"headers": w["mentor"], "params": {"q": "next"}}
+    ),
+    "GET /mentor/{mentor_id}/analytics": lambda w: (
+        "GET", f"/mentor/{w['mentor_id']}/analytics", {"headers": w["mentor"]}
+    ),
+    "GET /mentor/{mentor_id}/mentees/{mentee_id}/analytics": lambda w: (
+        "GET", f"/mentor/{w['mentor_id']}/mentees/{w['mentee_id']}/analytics", {"headers": w["mentor"]}
+    ),
+    "GET /mentee/{mentee_id}/mentor": lambda w: ("GET", f"/mentee/{w['mentee_id']}/mentor", {"headers": w["mentee"]}),
+    "GET /mentee/{mentee_id}/todos": lambda w: ("GET", f"/mentee/{w['mentee_id']}/todos", {"headers": w["mentee"]}),
+    "PATCH /mentee/todos/{todo_id}/toggle": lambda w: (
+        "PATCH", f"/mentee/todos/{w['todo_id']}/toggle", {"headers": w["mentee"]}
+    ),
+    "GET /mentee/resources": lambda w: ("GET", "/mentee/resources", {"headers": w["mentee"]}),
+}  # fmt: skip
+
+
+@pytest.fixture(scope="module")
+def worlds(tmp_path_factory) -> dict[int, dict]:
+    return {size: _build_world(tmp_path_factory.mktemp(f"budget-{size}"), size) for size in (1, LARGE)}
+
+
+@pytest.fixture
+def request_queries():
+    """Issue one request against a world and return ``(response, SQL statements)``."""
+
+    def issue(world: dict, method: str, url: str, **kwargs):
+        principal_cache.clear()
+        response_cache.clear()
+        statements: list[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(world["engine"], "before_cursor_execute", before_cursor_execute)
+        try:
+            response = world["client"].request(method, url, **kwargs)
+        finally:
+            event.remove(world["engine"], "before_cursor_execute", before_cursor_execute)
+        return response, statements
+
+    return issue
+
+
+def test_every_route_declares_a_query_budget():
+    routes = {
+        f"{method} {route.path}"
+        for module in (auth, admin, mentor, mentee)
+        for route in module.router.routes
+        for method in route.methods
+    }
+    assert routes == set(BUDGETS) == set(CASES)
+
+
+@pytest.mark.parametrize("route", sorted(BUDGETS))
+def test_route_stays_within_query_budget(route, worlds, request_queries):
+    counts = {}
+    for size, world in worlds.items():
+        method, url, kwargs = CASES[route](world)
+        response, statements = request_queries(world, method, url, **kwargs)
+        assert response.status_code < 400, (size, response.text)
+        counts[size] = len(statements)
+
+    assert counts[1] <= BUDGETS[route], f"{route} issued {counts[1]} statements, budget is {BUDGETS[route]}"
+    assert counts[LARGE] <= counts[1], f"{route} grows with the dataset: {counts}"
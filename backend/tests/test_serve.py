@@ -0,0 +1,108 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+
+from backend.bench.load import _free_port, wait_until_ready
+from backend.events import EventHub
+from backend.serve import worker_budgets
+from backend.shared_counters import SharedCounters
+from backend.slow_queries import SlowQueryLog
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_worker_budgets_split_server_totals_between_workers():
+    budgets = worker_budgets(4, {"DB_POOL_SIZE": "10", "DB_MAX_OVERFLOW": "0", "PASSWORD_HASH_WORKERS": "2"})
+
+    assert budgets["DB_POOL_SIZE"] == "2"
+    assert budgets["DB_MAX_OVERFLOW"] == "0"
+    assert budgets["PASSWORD_HASH_WORKERS"] == "1"
+
+
+def _bump(counters: SharedCounters) -> None:
+    counters.bump("resources")
+
+
+def test_shared_counters_are_visible_across_fork():
+    counters = SharedCounters()
+    child = multiprocessing.get_context("fork").Process(target=_bump, args=(counters,))
+    child.start()
+    child.join()
+
+    assert child.exitcode == 0
+    assert counters.get("resources") == 1
+    assert counters.get("mappings") == 0
+
+
+def _log_slow_query(log: SlowQueryLog, worker: str) -> None:
+    log.set_worker(worker)
+    log.record("child", "SELECT ?", 0.5, "SELECT 1", (), None, [])
+
+
+def test_each_worker_writes_its_own_slow_query_log(tmp_path: Path):
+    log = SlowQueryLog(10, 60, str(tmp_path / "slow.log"), 1024 * 1024, 1)
+    log.record("parent", "SELECT ?", 0.5, "SELECT 1", (), None, [])
+    # The child inherits the parent's open handler and must not write through it.
+    child = multiprocessing.get_context("fork").Process(target=_log_slow_query, args=(log, "0"))
+    child.start()
+    child.join()
+
+    assert child.exitcode == 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["slow-0.log", "slow.log"]
+    assert json.loads((tmp_path / "slow.log").read_text())["fingerprint"] == "parent"
+    assert json.loads((tmp_path / "slow-0.log").read_text())["fingerprint"] == "child"
+
+
+def test_connected_hubs_deliver_each_others_events():
+    context = multiprocessing.get_context("fork")
+    inboxes = [context.Queue(10), context.Queue(10)]
+    publisher, receiver = EventHub(max_pending=16), EventHub(max_pending=16)
+    publisher.connect_peers(inboxes[0], [inboxes[1]])
+    receiver.connect_peers(inboxes[1], [inboxes[0]])
+
+    async def scenario():
+        subscription = receiver.subscribe(7)
+        publisher.publish([7], ("todo", 1), {"type": "todo.updated", "id": 1})
+        return await asyncio.wait_for(subscription.next_batch(), timeout=5)
+
+    assert asyncio.run(scenario()) == [{"type": "todo.updated", "id": 1}]
+
+
+def test_serve_shares_cache_versions_across_workers_and_drains_on_sigterm(tmp_path: Path):
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'serve.db'}",
+        UPLOAD_DIR=str(tmp_path / "uploads"),
+        SLOW_QUERY_LOG_PATH="",
+        PASSWORD_HASH_WORKERS="2",
+    )
+    command = [sys.executable, "-m", "backend.serve", "--workers", "2", "--port", str(port), "--log-level", "warning"]
+    process = subprocess.Popen(command, env=env, cwd=ROOT)
+    try:
+        wait_until_ready(process, base_url)
+        login = httpx.post(f"{base_url}/auth/login", json={"name": "Admin", "role": "admin", "password": "admin123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        # Fresh connections are spread over both workers; they must agree on ETags.
+        before = {httpx.get(f"{base_url}/admin/mentors", headers=headers).headers["etag"] for _ in range(10)}
+        created = httpx.post(
+            f"{base_url}/admin/users", json={"name": "Grace", "role": "mentor", "password": "mentor456"}, headers=headers
+        )
+        assert created.status_code == 200
+        listings = [httpx.get(f"{base_url}/admin/mentors", headers=headers) for _ in range(10)]
+
+        assert len(before) == 1
+        assert {response.headers["etag"] for response in listings}.isdisjoint(before)
+        assert all("Grace" in {user["name"] for user in response.json()} for response in listings)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
@@ -0,0 +1,44 @@
+"""Process pools for CPU-bound work, started on first use.
+
+Workers are spawned rather than forked, so each one imports the submitted
+function's module from scratch. Those modules (``passwords``, ``pdf_text``) import
+nothing from the application and defer their heavy dependencies to the first call.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class LazyProcessPool:
+    """A ``ProcessPoolExecutor`` with ``workers`` processes, created on first use.
+
+    ``workers=0`` runs the work on a single background thread instead, which keeps
+    tests and tiny deployments free of child processes.
+    """
+
+    def __init__(self, workers: int, thread_name_prefix: str) -> None:
+        self.workers = workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.workers > 0:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.thread_name_prefix)
+        return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -120,7 +120,7 @@ function handleUnauthorized() {
   }
 }
 
-async function apiRequest<T>(path: string, init?: RequestInit): Promise<T> {
+async function apiFetch(path: string, init?: RequestInit): Promise<Response> {
   const token = getStoredToken();
   const headers = new Headers(init?.headers || {});
 
@@ -151,13 +151,34 @@ async function apiRequest<T>(path: string, init?: RequestInit): Promise<T> {
     throw new Error(errorMessage);
   }
 
+  return response;
+}
+
+async function apiRequest<T>(path: string, init?: RequestInit): Promise<T> {
+  const response = await apiFetch(path, init);
   if (response.status === 204) {
     return undefined as T;
   }
-
   return response.json() as Promise<T>;
 }
 
+// List endpoints serve one page at a time; follow X-Next-Cursor to collect every item.
+const LIST_PAGE_SIZE = 200;
+
+async function apiList<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ limit: String(LIST_PAGE_SIZE) });
+    if (cursor) params.set("cursor", cursor);
+    const separator = path.includes("?") ? "&" : "?";
+    const response = await apiFetch(`${path}${separator}${params}`);
+    items.push(...((await response.json()) as T[]));
+    cursor = response.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
+
 function currentUserOrThrow(): User {
   const user = getStoredUser();
   if (!user) throw new Error("User session not found");
@@ -266,39 +287,39 @@ export async function getMentorForMentee(menteeId: string): Promise<{ mentorName
 }
 
 export async function getTodos(menteeId: string): Promise<Todo[]> {
-  const todos = await apiRequest<ApiTodo[]>(`/mentee/${Number(menteeId)}/todos`);
+  const todos = await apiList<ApiTodo>(`/mentee/${Number(menteeId)}/todos`);
   return todos.map(toTodo);
 }
 
 export async function getResources(): Promise<Resource[]> {
   const user = currentUserOrThrow();
   const path = user.role === "Admin" ? "/admin/resources" : "/mentee/resources";
-  const resources = await apiRequest<ApiResource[]>(path);
+  const resources = await apiList<ApiResource>(path);
   return resources.map(toResource);
 }
 
 export async function getSessionRecords(): Promise<SessionRecord[]> {
-  const sessions = await apiRequest<ApiSession[]>("/admin/sessions");
+  const sessions = await apiList<ApiSession>("/admin/sessions");
   return sessions.map(toSession);
 }
 
 export async function getMappings(): Promise<MentorMenteeMapping[]> {
-  const mappings = await apiRequest<ApiMapping[]>("/admin/mappings");
+  const mappings = await apiList<ApiMapping>("/admin/mappings");
   return mappings.map(toMapping);
 }
 
 export async function getMentors(): Promise<User[]> {
-  const users = await apiRequest<ApiUser[]>("/admin/mentors");
+  const users = await apiList<ApiUser>("/admin/mentors");
   return users.map(toUser);
 }
 
 export async function getMentees(): Promise<User[]> {
-  const users = await apiRequest<ApiUser[]>("/admin/mentees");
+  const users = await apiList<ApiUser>("/admin/mentees");
   return users.map(toUser);
 }
 
 export async function getAssignedMentees(mentorId: string): Promise<{ id: string; name: string }[]> {
-  const mentees = await apiRequest<ApiUser[]>(`/mentor/${Number(mentorId)}/mentees`);
+  const mentees = await apiList<ApiUser>(`/mentor/${Number(mentorId)}/mentees`);
   return mentees.map((m) => ({ id: String(m.id), name: m.name }));
 }
 
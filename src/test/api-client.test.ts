@@ -89,4 +89,33 @@ describe("API client role routes", () => {
       expect.objectContaining({}),
     );
   });
+
+  it("follows X-Next-Cursor until every page is loaded", async () => {
+    localStorage.setItem("mentor_connect_auth_token", "admin-token");
+    localStorage.setItem(
+      "mentor_connect_auth_user",
+      JSON.stringify({ id: "1", name: "Admin", role: "Admin" }),
+    );
+
+    const fetchMock = vi
+      .spyOn(globalThis, "fetch")
+      .mockResolvedValueOnce(
+        new Response(JSON.stringify([{ id: 2, name: "Mentor", role: "mentor" }]), {
+          status: 200,
+          headers: { "Content-Type": "application/json", "X-Next-Cursor": "next-page" },
+        }),
+      )
+      .mockResolvedValueOnce(
+        new Response(JSON.stringify([{ id: 5, name: "Second", role: "mentor" }]), {
+          status: 200,
+          headers: { "Content-Type": "application/json" },
+        }),
+      );
+
+    const mentors = await getMentors();
+
+    expect(mentors.map((mentor) => mentor.name)).toEqual(["Mentor", "Second"]);
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(fetchMock.mock.calls[1][0]).toContain("cursor=next-page");
+  });
 });